@@ -0,0 +1,204 @@
+"""
+Compares EXPLAIN ANALYZE timings of the hot queries of the course platform without and with secondary indexes.
+
+Tables are created in the scratch schema `index_bench` of the database from the course platform config,
+seeded with generate_series and dropped at the end, so the data of the app is not touched.
+First the queries run against the tables with primary keys only, then the indexes declared
+in the tables metadata (the ones created by the migrations) are built and the queries run again.
+
+Usage: COURSE_PLATFORM_CONFIG_PATH=configs/course_platform.toml PYTHONPATH=src \
+    python scripts/bench_secondary_indexes.py [--users N] [--courses N] [--submissions N] ...
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+from typing import Any
+
+from sqlalchemy import text, Index
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection
+
+from learn_anything.course_platform.adapters.bootstrap.tg_bot_di import DEFAULT_COURSE_PLATFORM_CONFIG_PATH
+from learn_anything.course_platform.adapters.persistence.config import load_db_config
+from learn_anything.course_platform.adapters.persistence.tables import users_table, courses_table, \
+    registrations_for_courses_table, tasks_table, code_task_tests_table, poll_task_options_table, submissions_table
+
+SCHEMA = 'index_bench'
+REPEAT = 5
+
+TABLES = [
+    users_table,
+    courses_table,
+    registrations_for_courses_table,
+    tasks_table,
+    code_task_tests_table,
+    poll_task_options_table,
+    submissions_table,
+]
+
+# sizes are formatted in, generate_series and the arithmetic need them typed
+SEED = [
+    '''
+    INSERT INTO users (id, fullname, username, role)
+    SELECT i, 'user ' || i, 'user' || i, 'STUDENT'
+    FROM generate_series(1, {users}) i
+    ''',
+    # every hundredth user is an author
+    '''
+    INSERT INTO courses (id, title, description, is_published, creator_id, total_registered, created_at, updated_at)
+    SELECT i, 'course ' || i, md5(i::text), i % 10 <> 0, 1 + i % greatest({users} / 100, 1),
+           (random() * 1000)::int, now() - random() * interval '730 days', now()
+    FROM generate_series(1, {courses}) i
+    ''',
+    '''
+    INSERT INTO tasks (id, title, body, type, course_id, index_in_course, created_at, updated_at, code_duration_timeout)
+    SELECT (c - 1) * {tasks_per_course} + t, 'task ' || t, md5(t::text),
+           (CASE t % 3 WHEN 0 THEN 'CODE' WHEN 1 THEN 'THEORY' ELSE 'POLL' END)::tasktype,
+           c, t - 1, now(), now(), 5
+    FROM generate_series(1, {courses}) c, generate_series(1, {tasks_per_course}) t
+    ''',
+    '''
+    INSERT INTO code_task_tests (task_id, index_in_task, code)
+    SELECT id, n, 'assert solution(' || n || ') == ' || n
+    FROM tasks, generate_series(0, 2) n
+    WHERE type = 'CODE'
+    ''',
+    '''
+    INSERT INTO poll_task_options (content, task_id, is_correct)
+    SELECT 'option ' || n, id, n = 0
+    FROM tasks, generate_series(0, 3) n
+    WHERE type = 'POLL'
+    ''',
+    '''
+    INSERT INTO registrations_for_courses (user_id, course_id, registered_at)
+    SELECT 1 + (random() * ({users} - 1))::bigint, 1 + (random() * ({courses} - 1))::bigint, now() - i * interval '1 second'
+    FROM generate_series(1, {registrations}) i
+    ''',
+    # a few tasks get most of the submissions, like the first tasks of popular courses do
+    '''
+    INSERT INTO submissions (user_id, task_id, code, is_correct, created_at)
+    SELECT 1 + (random() * ({users} - 1))::bigint, 1 + (power(random(), 3) * ({courses} * {tasks_per_course} - 1))::bigint,
+           'print(42)', random() < 0.3, now() - i * interval '1 second'
+    FROM generate_series(1, {submissions}) i
+    ''',
+]
+
+QUERIES = {
+    'task submissions page': '''
+        SELECT * FROM submissions WHERE task_id = :task_id ORDER BY created_at DESC, user_id DESC LIMIT 11
+    ''',
+    'task submissions total': 'SELECT count(*) FROM submissions WHERE task_id = :task_id',
+    'task correct submissions': 'SELECT count(*) FROM submissions WHERE task_id = :task_id AND is_correct',
+    'user attempts at task': 'SELECT count(*) FROM submissions WHERE user_id = :user_id AND task_id = :task_id',
+    'course tasks page': 'SELECT * FROM tasks WHERE course_id = :course_id ORDER BY index_in_course, id LIMIT 11',
+    'tests of tasks page': '''
+        SELECT task_id, code FROM code_task_tests WHERE task_id = ANY(:task_ids) ORDER BY task_id, index_in_task
+    ''',
+    'poll task options': 'SELECT * FROM poll_task_options WHERE task_id = :poll_task_id',
+    'courses of author': '''
+        SELECT * FROM courses WHERE creator_id = :creator_id ORDER BY created_at DESC, id DESC LIMIT 11
+    ''',
+    'catalog by date': 'SELECT * FROM courses WHERE is_published ORDER BY created_at DESC, id DESC LIMIT 11',
+    'course registrations': 'SELECT count(*) FROM registrations_for_courses WHERE course_id = :course_id',
+}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--courses', type=int, default=20_000)
+    parser.add_argument('--tasks-per-course', type=int, default=20)
+    parser.add_argument('--registrations', type=int, default=500_000)
+    parser.add_argument('--submissions', type=int, default=3_000_000)
+    return parser.parse_args()
+
+
+async def _explain(conn: AsyncConnection, query: str, params: dict[str, Any]) -> tuple[float, str]:
+    """Median execution time in ms and the plan nodes of the last run"""
+    timings, plan = [], {}
+    for _ in range(REPEAT):
+        res = await conn.execute(text(f'EXPLAIN (ANALYZE, FORMAT JSON) {query}'), params)
+        raw = res.scalar_one()
+        explained = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+        timings.append(explained['Execution Time'])
+        plan = explained['Plan']
+    return statistics.median(timings), _describe_plan(plan)
+
+
+def _describe_plan(plan: dict[str, Any]) -> str:
+    nodes = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if 'Scan' in node['Node Type']:
+            nodes.append(f"{node['Node Type']} {node.get('Index Name') or node.get('Relation Name', '')}".strip())
+        stack.extend(reversed(node.get('Plans', [])))
+    return ', '.join(nodes)
+
+
+async def _run_queries(conn: AsyncConnection, params: dict[str, Any]) -> dict[str, tuple[float, str]]:
+    return {name: await _explain(conn, query, params) for name, query in QUERIES.items()}
+
+
+async def main() -> None:
+    args = _parse_args()
+    db_cfg = load_db_config(os.getenv('COURSE_PLATFORM_CONFIG_PATH') or DEFAULT_COURSE_PLATFORM_CONFIG_PATH)
+    engine = create_async_engine(
+        db_cfg.db_url,
+        # VACUUM can not run inside a transaction
+        isolation_level='AUTOCOMMIT',
+        # public is kept for the extensions, like pg_trgm for the trigram index
+        connect_args={'server_settings': {'search_path': f'{SCHEMA}, public'}},
+    )
+    indexes: list[Index] = [index for table in TABLES for index in table.indexes]
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+            await conn.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+            await conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            await conn.run_sync(lambda sync_conn: TABLES[0].metadata.create_all(sync_conn, tables=TABLES))
+            for index in indexes:
+                await conn.run_sync(lambda sync_conn, i=index: i.drop(sync_conn))  # type: ignore[misc]
+
+            seed_params = {
+                'users': args.users,
+                'courses': args.courses,
+                'tasks_per_course': args.tasks_per_course,
+                'registrations': args.registrations,
+                'submissions': args.submissions,
+            }
+            for stmt in SEED:
+                await conn.execute(text(stmt.format(**seed_params)))
+            await conn.execute(text('VACUUM ANALYZE'))
+
+            # the hottest task and the first course with its tasks, the same values in both runs
+            params: dict[str, Any] = {
+                'task_id': 1,
+                'user_id': (await conn.execute(text('SELECT user_id FROM submissions WHERE task_id = 1 LIMIT 1'))).scalar(),
+                'course_id': 1,
+                'task_ids': list(range(1, args.tasks_per_course + 1)),
+                'poll_task_id': 2,
+                'creator_id': 1,
+            }
+            before = await _run_queries(conn, params)
+
+            for index in indexes:
+                await conn.run_sync(lambda sync_conn, i=index: i.create(sync_conn))  # type: ignore[misc]
+            await conn.execute(text('VACUUM ANALYZE'))
+            after = await _run_queries(conn, params)
+
+            await conn.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+    finally:
+        await engine.dispose()
+
+    print(f'{"":<28}{"before":>12}{"after":>12}   plan after')
+    for name in QUERIES:
+        before_ms, _ = before[name]
+        after_ms, after_plan = after[name]
+        print(f'{name:<28}{before_ms:>10.2f}ms{after_ms:>10.2f}ms   {after_plan}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
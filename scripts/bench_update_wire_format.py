@@ -0,0 +1,68 @@
+"""
+Compares the size and decoding cost of telegram updates in the old and the current wire format.
+
+Old: update.model_dump() with all the empty fields, validated without the bot,
+so Dispatcher.feed_update dumps and validates it once more to mount the bot.
+Current: Bot API format without empty fields, validated once with the bot in context.
+
+Usage: PYTHONPATH=src python scripts/bench_update_wire_format.py
+"""
+import timeit
+
+import msgpack
+from aiogram import Bot
+from aiogram.types import Update
+
+from learn_anything.course_platform.adapters.rmq.tg_updates import pack_update, unpack_update, update_to_dict
+
+NUMBER = 5000
+
+UPDATE = {
+    'update_id': 128920819,
+    'message': {
+        'message_id': 7721,
+        'date': 1734435446,
+        'chat': {'id': 818525681, 'type': 'private', 'username': 'user', 'first_name': 'Name', 'last_name': 'Surname'},
+        'from': {
+            'id': 818525681,
+            'is_bot': False,
+            'first_name': 'Name',
+            'last_name': 'Surname',
+            'username': 'user',
+            'language_code': 'en',
+            'is_premium': True,
+        },
+        'text': '/start',
+        'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}],
+    },
+}
+
+
+def main() -> None:
+    bot = Bot(token='42:BENCHMARK')
+    update = Update.model_validate(UPDATE)
+
+    old_body = msgpack.packb(update.model_dump())
+    new_body = pack_update(update_to_dict(update))
+
+    def old_decode() -> Update:
+        old_update = Update.model_validate(msgpack.unpackb(old_body))
+        # what Dispatcher.feed_update does with an update which is not mounted to the bot
+        return Update.model_validate(old_update.model_dump(), context={'bot': bot})
+
+    def new_decode() -> Update:
+        return unpack_update(new_body, bot=bot)
+
+    old_encode_us = timeit.timeit(lambda: msgpack.packb(update.model_dump()), number=NUMBER) / NUMBER * 1e6
+    new_encode_us = timeit.timeit(lambda: pack_update(update_to_dict(update)), number=NUMBER) / NUMBER * 1e6
+    old_decode_us = timeit.timeit(old_decode, number=NUMBER) / NUMBER * 1e6
+    new_decode_us = timeit.timeit(new_decode, number=NUMBER) / NUMBER * 1e6
+
+    print(f'{"":<10}{"old":>12}{"new":>12}')
+    print(f'{"bytes":<10}{len(old_body):>12}{len(new_body):>12}')
+    print(f'{"encode":<10}{old_encode_us:>10.1f}us{new_encode_us:>10.1f}us')
+    print(f'{"decode":<10}{old_decode_us:>10.1f}us{new_decode_us:>10.1f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 import os
+from typing import AsyncGenerator
 
+import redis.asyncio as aioredis
 from aio_pika import Connection
 from aio_pika.abc import AbstractChannel
 from aio_pika.pool import Pool
@@ -16,8 +18,9 @@ from dishka import (
     provide,
 )
 
+from learn_anything.api_gateway.adapters.redis.ide_results import IdeResultListener
 from learn_anything.api_gateway.adapters.rmq.config import load_rmq_config, RMQConfig
-from learn_anything.api_gateway.adapters.rmq.providers import get_connection_pool, get_channel
+from learn_anything.api_gateway.adapters.rmq.providers import get_connection_pool, get_channel, get_update_publisher
 from learn_anything.api_gateway.presentation.tg_bot.config import load_bot_config, BotConfig
 from learn_anything.api_gateway.presentation.web.config import load_web_config, WebConfig
 
@@ -28,8 +31,13 @@ from learn_anything.course_platform.adapters.persistence.providers import (
     get_async_sessionmaker,
     get_async_session,
 )
+from learn_anything.course_platform.adapters.persistence.mappers.task import TaskMapper
 from learn_anything.course_platform.adapters.persistence.tables.map import map_tables
-from learn_anything.course_platform.adapters.redis.config import load_redis_config, RedisConfig
+from learn_anything.course_platform.adapters.redis.config import load_redis_config, RedisConfig, \
+    load_rate_limit_config, RateLimitConfig, load_task_cache_config, TaskCacheConfig
+from learn_anything.course_platform.adapters.redis.providers import get_redis_connection_pool, get_redis_client, \
+    get_submission_rate_limiter, get_task_cache
+from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
 
 
 DEFAULT_API_GATEWAY_CONFIG_PATH = 'configs/api_gateway.toml'
@@ -38,6 +46,16 @@ DEFAULT_API_GATEWAY_CONFIG_PATH = 'configs/api_gateway.toml'
 def infrastructure_provider() -> Provider:
     provider = Provider()
 
+    async def get_ide_result_listener(
+            redis_client: aioredis.Redis,  # type: ignore[type-arg]
+    ) -> AsyncGenerator[IdeResultListener, None]:
+        listener = IdeResultListener(redis_client=redis_client)
+        await listener.start()
+        yield listener
+        await listener.close()
+
+    provider.provide(get_ide_result_listener, scope=Scope.APP)
+
     return provider
 
 
@@ -62,6 +80,10 @@ def db_configs_provider(cfg_path: str) -> Provider:
     try:
         provider.provide(lambda: load_db_config(cp_cfg_path), scope=Scope.APP, provides=DatabaseConfig)
         provider.provide(lambda: load_redis_config(cp_cfg_path), scope=Scope.APP, provides=RedisConfig)
+        # quotas of submissions are shared with the course_platform
+        provider.provide(lambda: load_rate_limit_config(cp_cfg_path), scope=Scope.APP, provides=RateLimitConfig)
+        # tasks are cached together with the course_platform, so its changes invalidate them here too
+        provider.provide(lambda: load_task_cache_config(cp_cfg_path), scope=Scope.APP, provides=TaskCacheConfig)
     except Exception:
         pass  # IDE queries will fail gracefully if DB not configured
 
@@ -73,6 +95,7 @@ def db_provider() -> Provider:
     provider.provide(get_engine, scope=Scope.APP)
     provider.provide(get_async_sessionmaker, scope=Scope.APP)
     provider.provide(get_async_session, scope=Scope.REQUEST)
+    provider.provide(TaskMapper, scope=Scope.REQUEST, provides=TaskGateway)
     return provider
 
 
@@ -110,11 +133,23 @@ class TgProvider(Provider):
         return dp
 
 
+def redis_provider() -> Provider:
+    provider = Provider()
+
+    provider.provide(get_redis_connection_pool, scope=Scope.APP)
+    provider.provide(get_redis_client, scope=Scope.APP)
+    provider.provide(get_submission_rate_limiter, scope=Scope.APP)
+    provider.provide(get_task_cache, scope=Scope.APP)
+
+    return provider
+
+
 def rmq_provider() -> Provider:
     provider = Provider()
 
     provider.provide(get_connection_pool, provides=Pool[Connection], scope=Scope.APP)
     provider.provide(get_channel, provides=AbstractChannel, scope=Scope.REQUEST)
+    provider.provide(get_update_publisher, scope=Scope.APP)
 
     return provider
 
@@ -130,6 +165,7 @@ def setup_providers(cfg_path: str) -> list[Provider]:
         configs_provider(cfg_path),
         db_configs_provider(cfg_path),
         db_provider(),
+        redis_provider(),
         rmq_provider(),
         TgProvider(),
     ]
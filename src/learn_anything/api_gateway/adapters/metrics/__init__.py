@@ -2,3 +2,7 @@ from prometheus_client import Counter
 
 REQUESTS_TOTAL = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'path'])
 TOTAL_MESSAGES_PRODUCED = Counter('broker_messages_produced_total', 'Total messages produced to RabbitMQ')
+IDE_SUBMISSIONS_DEDUPLICATED = Counter(
+    'ide_submissions_deduplicated_total',
+    'IDE submissions collapsed onto an earlier identical one instead of being graded again',
+)
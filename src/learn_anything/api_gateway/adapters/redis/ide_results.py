@@ -0,0 +1,75 @@
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from learn_anything.api_gateway.adapters.logger import logger
+from learn_anything.course_platform.adapters.rmq.ide_submissions import (
+    IDE_RESULT_CHANNEL_PREFIX,
+    ide_result_key,
+)
+
+
+class IdeResultListener:
+    """
+    Waits for IDE submission results pushed by the consumer.
+    The whole process shares one pub/sub connection, results are dispatched to the waiters by submission id
+    """
+    _reconnect_delay = 1
+
+    def __init__(self, redis_client: aioredis.Redis) -> None:  # type: ignore[type-arg]
+        self._redis = redis_client
+        self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        self._waiters: defaultdict[str, set[asyncio.Future[str]]] = defaultdict(set)
+        self._listen_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        await self._pubsub.psubscribe(f'{IDE_RESULT_CHANNEL_PREFIX}*')
+        self._listen_task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listen_task:
+            self._listen_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listen_task
+        await self._pubsub.aclose()
+
+    async def wait(self, submission_id: str, timeout: float) -> str | None:
+        """Returns the raw result of the submission, or None if it was not ready within the timeout"""
+        result: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._waiters[submission_id].add(result)
+        try:
+            # result could have been written before we started waiting for it
+            raw_result = await self._redis.get(ide_result_key(submission_id))
+            if raw_result is not None:
+                return raw_result  # type: ignore[no-any-return]
+
+            return await asyncio.wait_for(result, timeout=timeout)
+        except TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters[submission_id]
+            waiters.discard(result)
+            if not waiters:
+                del self._waiters[submission_id]
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        self._dispatch(
+                            submission_id=message['channel'].removeprefix(IDE_RESULT_CHANNEL_PREFIX),
+                            raw_result=message['data'],
+                        )
+            except RedisError as e:
+                # pubsub resubscribes to the pattern when it reconnects
+                logger.warning('IDE results subscription failed, reconnecting: %s', e)
+                await asyncio.sleep(self._reconnect_delay)
+
+    def _dispatch(self, submission_id: str, raw_result: str) -> None:
+        for result in self._waiters.get(submission_id, ()):
+            if not result.done():
+                result.set_result(raw_result)
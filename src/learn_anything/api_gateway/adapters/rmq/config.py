@@ -10,6 +10,10 @@ class RMQConfig:
     user: str
     password: str
     pool_size: int = 10
+    # must be the same as in the course_platform config
+    tg_updates_shards: int = 8
+    # updates published without a confirm from the broker yet
+    max_unconfirmed_messages: int = 1000
 
     @property
     def uri(self) -> str:
@@ -8,6 +8,7 @@ from aio_pika.pool import Pool
 
 from learn_anything.api_gateway.adapters.rmq.config import RMQConfig
 from learn_anything.api_gateway.adapters.logger import logger
+from learn_anything.api_gateway.adapters.rmq.update_publisher import UpdatePublisher
 
 
 async def get_channel(connection_pool: Pool[Connection]) -> AsyncGenerator[AbstractChannel, None]:
@@ -15,6 +16,22 @@ async def get_channel(connection_pool: Pool[Connection]) -> AsyncGenerator[Abstr
         yield await connection.channel()
 
 
+async def get_update_publisher(
+        connection_pool: Pool[Connection],
+        rmq_cfg: RMQConfig,
+) -> AsyncGenerator[UpdatePublisher, None]:
+    async with connection_pool.acquire() as connection:
+        channel = await connection.channel(publisher_confirms=True)
+        publisher = UpdatePublisher(
+            channel=channel,
+            shards_number=rmq_cfg.tg_updates_shards,
+            max_unconfirmed=rmq_cfg.max_unconfirmed_messages,
+        )
+        await publisher.declare()
+        yield publisher
+        await channel.close()
+
+
 async def get_connection_pool(rmq_cfg: RMQConfig) -> Pool[Connection]:
     return Pool(partial(_get_connection, rmq_cfg), max_size=rmq_cfg.pool_size)
 
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractExchange
+
+from learn_anything.api_gateway.adapters.logger import logger
+from learn_anything.api_gateway.adapters.metrics import TOTAL_MESSAGES_PRODUCED
+from learn_anything.course_platform.adapters.rmq.tg_updates import declare_tg_updates_topology, tg_updates_shard, \
+    tg_updates_shard_name, pack_update
+
+
+class UpdatePublisher:
+    """
+    Publishes telegram updates through one long-lived channel with publisher confirms.
+    Topology is declared once on start, concurrent publishes share the channel,
+    so their confirms are pipelined instead of waiting for each other
+    """
+
+    def __init__(self, channel: AbstractChannel, shards_number: int, max_unconfirmed: int) -> None:
+        self._channel = channel
+        self._shards_number = shards_number
+        self._exchange: AbstractExchange | None = None
+        # limits the number of messages waiting for a confirm, so the broker slowing down slows down the webhook
+        self._unconfirmed = asyncio.Semaphore(max_unconfirmed)
+
+    async def declare(self) -> None:
+        self._exchange, _ = await declare_tg_updates_topology(self._channel, shards_number=self._shards_number)
+
+    async def publish(self, update: dict[str, Any], correlation_id: str | None) -> None:
+        """Returns when the broker has confirmed the update"""
+        shard = tg_updates_shard(update, shards_number=self._shards_number)
+
+        logger.info('Sending update to a queue shard %s..', shard)
+        async with self._unconfirmed:
+            await self._exchange.publish(  # type: ignore[union-attr]
+                message=aio_pika.Message(
+                    body=pack_update(update),
+                    correlation_id=correlation_id,
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                ),
+                routing_key=tg_updates_shard_name(shard),
+            )
+        TOTAL_MESSAGES_PRODUCED.inc()
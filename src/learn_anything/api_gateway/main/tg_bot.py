@@ -57,6 +57,7 @@ async def lifespan(
             logger.info("Polling stopped")
 
     await bot.delete_webhook()
+    await container.close()
     logger.info('Ending lifespan')
 
 
@@ -1,15 +1,13 @@
 import uuid
-from typing import Awaitable, Any, Callable
+from typing import Awaitable, Any, Callable, cast
 
-import aio_pika
-import msgpack
-from aio_pika.abc import AbstractChannel, ExchangeType
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject
+from aiogram.types import TelegramObject, Update
 from dishka import AsyncContainer
 
-from learn_anything.api_gateway.adapters.logger import logger, correlation_id_ctx
-from learn_anything.api_gateway.adapters.metrics import TOTAL_MESSAGES_PRODUCED
+from learn_anything.api_gateway.adapters.logger import correlation_id_ctx
+from learn_anything.api_gateway.adapters.rmq.update_publisher import UpdatePublisher
+from learn_anything.course_platform.adapters.rmq.tg_updates import update_to_dict
 
 
 class SendToQueueMiddleware(BaseMiddleware):
@@ -22,26 +20,9 @@ class SendToQueueMiddleware(BaseMiddleware):
             event: TelegramObject,
             data: dict[str, Any],
     ) -> Any:
-        async with self._container(context={TelegramObject: event}) as request_container:
-            channel = await request_container.get(AbstractChannel)
-            queue_name = 'tg_updates'
+        publisher = await self._container.get(UpdatePublisher)
 
-            exchange = await channel.declare_exchange("tg_updates", ExchangeType.TOPIC, durable=True)
-            queue = await channel.declare_queue(name=queue_name, durable=True)
-            await queue.bind(
-                exchange,
-                queue_name,
-            )
+        correlation_id = str(uuid.uuid4())
+        correlation_id_ctx.set(correlation_id)
 
-            correlation_id = str(uuid.uuid4())
-            correlation_id_ctx.set(correlation_id)
-
-            logger.info('Sending update to a queue..')
-            await exchange.publish(
-                message=aio_pika.Message(
-                    body=msgpack.packb(event.model_dump()),
-                    correlation_id=correlation_id
-                ),
-                routing_key=queue_name,
-            )
-            TOTAL_MESSAGES_PRODUCED.inc()
+        await publisher.publish(update_to_dict(cast(Update, event)), correlation_id=correlation_id)
@@ -6,32 +6,37 @@ Endpoints:
   GET  /ide/task/{task_id}        — return task data as JSON
   POST /ide/submit                — accept code, verify Telegram initData, enqueue to RMQ
   GET  /ide/result/{submission_id} — polling: return result from Redis
+  GET  /ide/result/{submission_id}/events — server-sent events: push result as soon as it is ready
 """
 import hashlib
 import hmac
-from typing import Any
+from typing import Any, AsyncGenerator
 import json
 import logging
+import math
 import os
+import time
 from urllib.parse import parse_qsl, unquote
 
 import redis.asyncio as aioredis
 from aio_pika.abc import AbstractChannel
 from dishka.integrations.fastapi import FromDishka, inject
-from fastapi import APIRouter, HTTPException, Path, Request
-from fastapi.responses import HTMLResponse, ORJSONResponse
+from fastapi import APIRouter, Header, HTTPException, Path, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from learn_anything.course_platform.adapters.persistence.tables import code_task_tests_table
-from learn_anything.course_platform.adapters.persistence.tables.task import tasks_table
-from learn_anything.course_platform.adapters.redis.config import RedisConfig
+from learn_anything.api_gateway.adapters.metrics import IDE_SUBMISSIONS_DEDUPLICATED
+from learn_anything.api_gateway.adapters.redis.ide_results import IdeResultListener
 from learn_anything.course_platform.adapters.rmq.ide_submissions import (
-    IDE_RESULT_TTL,
+    claim_ide_submission,
+    ide_result_key,
+    ide_submission_dedup_key,
     publish_ide_submission,
 )
-from learn_anything.course_platform.domain.entities.task.models import CodeTask, CodeTaskTest
+from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
+from learn_anything.course_platform.application.ports.rate_limiter import SubmissionRateLimiter
+from learn_anything.course_platform.domain.entities.user.models import UserID
+from learn_anything.course_platform.domain.entities.task.models import TaskID
 
 logger = logging.getLogger(__name__)
 
@@ -113,27 +118,20 @@ class TaskResponse(BaseModel):
 @inject
 async def get_task(
     task_id: int = Path(..., ge=1),
-    session: FromDishka[AsyncSession] = ...,  # type: ignore[assignment]
+    task_gateway: FromDishka[TaskGateway] = ...,  # type: ignore[assignment]
 ) -> Any:
     """Return task metadata for the IDE."""
-    stmt = select(CodeTask).where(tasks_table.c.id == task_id)
-    result = await session.execute(stmt)
-    task: CodeTask | None = result.scalar_one_or_none()
-
+    task = await task_gateway.get_code_task_with_id(TaskID(task_id))
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    tests_stmt = select(CodeTaskTest).where(code_task_tests_table.c.task_id == task_id)
-    tests_result = await session.execute(tests_stmt)
-    tests = list(tests_result.scalars().all())
-
     return ORJSONResponse({
         "id": task_id,
         "title": task.title,
         "body": task.body,
         "prepared_code": task.prepared_code,
         "code_duration_timeout": task.code_duration_timeout or 10,
-        "tests_count": len(tests),
+        "tests_count": len(task.tests),
     })
 
 
@@ -153,12 +151,19 @@ class SubmitResponse(BaseModel):
 @inject
 async def submit_code(
     body: SubmitRequest,
-    session: FromDishka[AsyncSession] = ...,  # type: ignore[assignment]
+    task_gateway: FromDishka[TaskGateway] = ...,  # type: ignore[assignment]
     channel: FromDishka[AbstractChannel] = ...,  # type: ignore[assignment]
+    rate_limiter: FromDishka[SubmissionRateLimiter] = ...,  # type: ignore[assignment]
+    redis_client: FromDishka[aioredis.Redis] = ...,  # type: ignore[assignment, type-arg]
+    idempotency_key: str | None = Header(None, max_length=128),
 ) -> Any:
     """
     Accept code submission, optionally verify Telegram initData,
     enqueue to RMQ, return submission_id for polling.
+    Responds with 429 if the user or the course has run out of submissions quota.
+
+    Retries with the same Idempotency-Key header, or without it but with the same code for the same task,
+    made within a short window get the submission_id of the first request instead of being graded again.
     """
     # Determine user_id
     user_id: int = 0
@@ -176,25 +181,49 @@ async def submit_code(
         logger.warning("BOT_TOKEN not set — skipping initData verification")
 
     # Load task to get prepared_code, tests, timeout
-    stmt = select(CodeTask).where(tasks_table.c.id == body.task_id)
-    result = await session.execute(stmt)
-    task: CodeTask | None = result.scalar_one_or_none()
+    task = await task_gateway.get_code_task_with_id(TaskID(body.task_id))
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    tests_stmt = select(CodeTaskTest).where(code_task_tests_table.c.task_id == body.task_id)
-    tests_result = await session.execute(tests_stmt)
-    tests = [{"code": t.code} for t in tests_result.scalars().all()]
-
-    submission_id = await publish_ide_submission(
-        channel=channel,
-        task_id=body.task_id,
+    dedup_key = ide_submission_dedup_key(
         user_id=user_id,
+        task_id=body.task_id,
         code=body.code,
-        prepared_code=task.prepared_code,
-        tests=tests,
-        code_duration_timeout=task.code_duration_timeout or 10,
+        idempotency_key=idempotency_key,
     )
+    # retries of an accepted submission are answered without spending the quota
+    existing_submission_id = await redis_client.get(dedup_key)
+    if existing_submission_id is not None:
+        IDE_SUBMISSIONS_DEDUPLICATED.inc()
+        return ORJSONResponse({"submission_id": existing_submission_id})
+
+    # the key is claimed only after the quota check, otherwise a retry made meanwhile
+    # could get the id of a rejected submission which is never graded
+    retry_after = await rate_limiter.acquire(user_id=UserID(user_id), course_id=task.course_id)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Слишком много решений, попробуйте снова через {math.ceil(retry_after)} сек.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    submission_id, is_new = await claim_ide_submission(redis_client, dedup_key)
+    if not is_new:
+        IDE_SUBMISSIONS_DEDUPLICATED.inc()
+        return ORJSONResponse({"submission_id": submission_id})
+
+    try:
+        # the consumer grades against this snapshot of the task and does not load it again
+        await publish_ide_submission(
+            channel=channel,
+            task=task,
+            user_id=user_id,
+            code=body.code,
+            submission_id=submission_id,
+        )
+    except Exception:
+        await redis_client.delete(dedup_key)
+        raise
 
     return ORJSONResponse({"submission_id": submission_id})
 
@@ -205,18 +234,51 @@ async def submit_code(
 @inject
 async def get_result(
     submission_id: str = Path(..., min_length=1),
-    redis_cfg: FromDishka[RedisConfig] = ...,  # type: ignore[assignment]
+    redis_client: FromDishka[aioredis.Redis] = ...,  # type: ignore[assignment, type-arg]
 ) -> Any:
     """Poll for IDE submission result. Returns 202 while pending, 200 when ready."""
-    redis_client = aioredis.from_url(redis_cfg.dsn, decode_responses=True)
-    try:
-        key = f"ide_result:{submission_id}"
-        raw = await redis_client.get(key)
-    finally:
-        await redis_client.aclose()
+    raw = await redis_client.get(ide_result_key(submission_id))
 
     if raw is None:
         return ORJSONResponse({"status": "pending"}, status_code=202)
 
     result = json.loads(raw)
     return ORJSONResponse(result, status_code=200)
+
+
+# ── Result push endpoint ───────────────────────────────────────────────────────
+
+RESULT_EVENTS_TIMEOUT = 120
+# proxies drop connections which are silent for too long
+RESULT_EVENTS_KEEPALIVE_INTERVAL = 15
+
+
+@router.get("/result/{submission_id}/events")
+@inject
+async def get_result_events(
+    submission_id: str = Path(..., min_length=1),
+    result_listener: FromDishka[IdeResultListener] = ...,  # type: ignore[assignment]
+) -> StreamingResponse:
+    """
+    Stream IDE submission result as server-sent events.
+    Sends a single 'result' event once the result is ready, or 'timeout' event if it is not ready in time.
+    """
+    async def events() -> AsyncGenerator[str, None]:
+        deadline = time.monotonic() + RESULT_EVENTS_TIMEOUT
+        while (remaining := deadline - time.monotonic()) > 0:
+            raw = await result_listener.wait(
+                submission_id,
+                timeout=min(RESULT_EVENTS_KEEPALIVE_INTERVAL, remaining),
+            )
+            if raw is not None:
+                yield f"event: result\ndata: {raw}\n\n"
+                return
+            yield ": keepalive\n\n"
+
+        yield "event: timeout\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,6 +3,7 @@ import os
 from functools import partial
 from typing import AsyncGenerator
 
+import redis.asyncio as aioredis
 from aio_pika import Connection
 from aio_pika.abc import AbstractChannel
 from aio_pika.pool import Pool
@@ -25,14 +26,24 @@ from learn_anything.course_platform.adapters.auth.tg_identity_provider import Tg
 from learn_anything.course_platform.adapters.json_serializers import DTOJSONEncoder, dto_obj_hook
 from learn_anything.course_platform.adapters.persistence.commiter import SACommiter
 from learn_anything.course_platform.adapters.persistence.config import load_db_config, DatabaseConfig
+from learn_anything.course_platform.adapters.persistence.course_search import PostgresCourseSearch
 from learn_anything.course_platform.adapters.persistence.mappers.course import CourseMapper, RegistrationForCourseMapper
 from learn_anything.course_platform.adapters.persistence.mappers.submission import SubmissionMapper
 from learn_anything.course_platform.adapters.persistence.mappers.task import TaskMapper
 from learn_anything.course_platform.adapters.persistence.mappers.user import UserMapper, AuthLinkMapper
 from learn_anything.course_platform.adapters.persistence.providers import get_async_sessionmaker, get_engine, \
     get_async_session
+from learn_anything.course_platform.adapters.playground.config import load_playground_config, PlaygroundConfig, \
+    PlaygroundBackend
+from learn_anything.course_platform.adapters.playground.nsjail_playground import NsjailPlaygroundFactory
+from learn_anything.course_platform.adapters.playground.scheduler import PlaygroundScheduler, \
+    ScheduledPlaygroundFactory
 from learn_anything.course_platform.adapters.playground.unix_playground import UnixPlaygroundFactory, VirtualMachinePool
-from learn_anything.course_platform.adapters.redis.config import load_redis_config, RedisConfig
+from learn_anything.course_platform.adapters.redis.config import load_redis_config, RedisConfig, \
+    load_rate_limit_config, RateLimitConfig, load_task_cache_config, TaskCacheConfig
+from learn_anything.course_platform.adapters.redis.grading_cache import RedisGradingCache
+from learn_anything.course_platform.adapters.redis.providers import get_redis_connection_pool, get_redis_client, \
+    get_submission_rate_limiter, get_task_cache
 from learn_anything.course_platform.adapters.rmq.config import load_rmq_config, RMQConfig
 from learn_anything.course_platform.adapters.rmq.providers import get_channel, get_connection_pool
 from learn_anything.course_platform.adapters.s3.config import load_s3_config, S3Config
@@ -75,10 +86,12 @@ from learn_anything.course_platform.application.ports.committer import Commiter
 from learn_anything.course_platform.application.ports.data.auth_link_gateway import AuthLinkGateway
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway, \
     RegistrationForCourseGateway
+from learn_anything.course_platform.application.ports.data.course_search import CourseSearch
 from learn_anything.course_platform.application.ports.data.file_manager import FileManager
 from learn_anything.course_platform.application.ports.data.submission_gateway import SubmissionGateway
 from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
 from learn_anything.course_platform.application.ports.data.user_gateway import UserGateway
+from learn_anything.course_platform.application.ports.grading_cache import GradingCache
 from learn_anything.course_platform.application.ports.playground import PlaygroundFactory
 from learn_anything.course_platform.presentation.tg_bot.config import load_bot_config, BotConfig
 from learn_anything.course_platform.presentation.web.config import load_web_config, WebConfig
@@ -94,6 +107,7 @@ def gateways_provider() -> Provider:
     provider.provide(AuthLinkMapper, scope=Scope.REQUEST, provides=AuthLinkGateway)
     provider.provide(CourseMapper, scope=Scope.REQUEST, provides=CourseGateway)
     provider.provide(RegistrationForCourseMapper, scope=Scope.REQUEST, provides=RegistrationForCourseGateway)
+    provider.provide(PostgresCourseSearch, scope=Scope.REQUEST, provides=CourseSearch)
     provider.provide(TaskMapper, scope=Scope.REQUEST, provides=TaskGateway)
     provider.provide(SubmissionMapper, scope=Scope.REQUEST, provides=SubmissionGateway)
 
@@ -108,14 +122,33 @@ def infrastructure_provider() -> Provider:
     provider.provide(TgB64TokenProcessor, scope=Scope.REQUEST, provides=TokenProcessor)
     provider.provide(S3FileManager, scope=Scope.REQUEST, provides=FileManager)
     provider.provide(TelegramAuthManager, scope=Scope.REQUEST, provides=AuthManager)
-    async def get_vm_pool() -> AsyncGenerator[VirtualMachinePool, None]:
-        pool = VirtualMachinePool(size=3)
-        await pool.initialize()
-        yield pool
-        await pool.close()
 
-    provider.provide(get_vm_pool, scope=Scope.APP)
-    provider.provide(UnixPlaygroundFactory, scope=Scope.REQUEST, provides=PlaygroundFactory)
+    async def get_playground_factory(playground_cfg: PlaygroundConfig) -> AsyncGenerator[PlaygroundFactory, None]:
+        scheduler = PlaygroundScheduler(capacity=playground_cfg.capacity, weights=playground_cfg.lane_weights)
+
+        if playground_cfg.backend == PlaygroundBackend.NSJAIL:
+            yield ScheduledPlaygroundFactory(NsjailPlaygroundFactory(config=playground_cfg), scheduler)
+            return
+
+        vm_pool = VirtualMachinePool(
+            min_size=playground_cfg.pool_min_size,
+            max_size=playground_cfg.pool_max_size,
+            vm_max_uses=playground_cfg.vm_max_uses,
+            vm_idle_timeout=playground_cfg.vm_idle_timeout,
+        )
+        await vm_pool.initialize()
+        yield ScheduledPlaygroundFactory(UnixPlaygroundFactory(vm_pool=vm_pool), scheduler)
+        await vm_pool.close()
+
+    provider.provide(get_playground_factory, scope=Scope.APP)
+
+    def get_grading_cache(
+            redis_client: aioredis.Redis,  # type: ignore[type-arg]
+            playground_cfg: PlaygroundConfig,
+    ) -> GradingCache:
+        return RedisGradingCache(redis_client=redis_client, ttl=playground_cfg.grading_cache_ttl)
+
+    provider.provide(get_grading_cache, scope=Scope.APP)
 
     return provider
 
@@ -167,8 +200,11 @@ def configs_provider() -> Provider:
     provider.provide(lambda: load_bot_config(cfg_path), scope=Scope.APP, provides=BotConfig)
     provider.provide(lambda: load_s3_config(cfg_path), scope=Scope.APP, provides=S3Config)
     provider.provide(lambda: load_redis_config(cfg_path), scope=Scope.APP, provides=RedisConfig)
+    provider.provide(lambda: load_rate_limit_config(cfg_path), scope=Scope.APP, provides=RateLimitConfig)
+    provider.provide(lambda: load_task_cache_config(cfg_path), scope=Scope.APP, provides=TaskCacheConfig)
     provider.provide(lambda: load_rmq_config(cfg_path), scope=Scope.APP, provides=RMQConfig)
     provider.provide(lambda: load_web_config(cfg_path), scope=Scope.APP, provides=WebConfig)
+    provider.provide(lambda: load_playground_config(cfg_path), scope=Scope.APP, provides=PlaygroundConfig)
 
     return provider
 
@@ -211,9 +247,9 @@ class TgProvider(Provider):
         return Bot(token=bot_cfg.token)
 
     @provide(scope=Scope.APP)
-    async def get_state_storage(self, redis_cfg: RedisConfig) -> RedisStorage:
-        return RedisStorage.from_url(
-            url=redis_cfg.dsn,
+    async def get_state_storage(self, redis_client: aioredis.Redis) -> RedisStorage:  # type: ignore[type-arg]
+        return RedisStorage(
+            redis=redis_client,
             json_dumps=partial(json.dumps, cls=DTOJSONEncoder),
             json_loads=partial(json.loads, object_hook=dto_obj_hook),
         )
@@ -240,6 +276,17 @@ def db_provider() -> Provider:
     return provider
 
 
+def redis_provider() -> Provider:
+    provider = Provider()
+
+    provider.provide(get_redis_connection_pool, scope=Scope.APP)
+    provider.provide(get_redis_client, scope=Scope.APP)
+    provider.provide(get_submission_rate_limiter, scope=Scope.APP)
+    provider.provide(get_task_cache, scope=Scope.APP)
+
+    return provider
+
+
 def rmq_provider() -> Provider:
     provider = Provider()
 
@@ -254,6 +301,7 @@ def setup_providers() -> list[Provider]:
         gateways_provider(),
         infrastructure_provider(),
         db_provider(),
+        redis_provider(),
         rmq_provider(),
         configs_provider(),
         interactors_provider(),
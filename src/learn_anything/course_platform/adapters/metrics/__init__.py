@@ -1,6 +1,58 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Histogram, Gauge
 
 
 INTEGRATION_METHOD_DURATION = Histogram('integration_method_duration_seconds', 'Time spent in integration methods')
 TOTAL_MESSAGES_CONSUMED = Counter('rabbitmq_messages_consumed_total', 'Total messages consumed from RabbitMQ')
 REQUESTS_TOTAL = Counter('rabbitmq_requests_total', 'Total requests')
+
+VM_POOL_SIZE = Gauge('playground_vm_pool_size', 'Total VMs owned by the playground pool, including booting ones')
+VM_POOL_IDLE = Gauge('playground_vm_pool_idle', 'VMs waiting in the playground pool for a submission')
+VM_POOL_BOOTING = Gauge('playground_vm_pool_booting', 'VMs being booted by the playground pool')
+VM_POOL_WAITERS = Gauge('playground_vm_pool_waiters', 'Submissions waiting for a VM from the playground pool')
+VM_BOOT_DURATION = Histogram(
+    'playground_vm_boot_duration_seconds',
+    'Time spent booting a playground VM',
+    buckets=(1, 2, 4, 6, 8, 10, 15, 20, 30, 60),
+)
+
+PLAYGROUND_WAIT_DURATION = Histogram(
+    'playground_wait_duration_seconds',
+    'Time submissions spent waiting for a free playground slot',
+    ['lane'],
+    buckets=(0.01, 0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+PLAYGROUND_WAITERS = Gauge('playground_waiters', 'Submissions waiting for a free playground slot', ['lane'])
+
+SUBMISSIONS_RATE_LIMITED = Counter(
+    'submissions_rate_limited_total',
+    'Code submissions rejected because the user or the course ran out of their quota',
+)
+
+GRADING_CACHE_REQUESTS = Counter(
+    'grading_cache_requests_total',
+    'Lookups of code submissions in the grading cache',
+    ['result'],
+)
+
+TASK_CACHE_REQUESTS = Counter(
+    'task_cache_requests_total',
+    'Lookups of code and poll tasks in the task cache, by where they were found',
+    ['result'],
+)
+
+CONSUMER_IN_FLIGHT = Gauge('rabbitmq_consumer_in_flight_messages', 'Messages being processed by consumer workers', ['queue'])
+CONSUMER_QUEUED = Gauge(
+    'rabbitmq_consumer_queued_messages',
+    'Messages received from RabbitMQ and waiting for a free consumer worker',
+    ['queue'],
+)
+
+TG_UPDATES_FAILURES = Counter(
+    'tg_updates_failures_total',
+    'Telegram updates which failed to be processed, by what was done with them',
+    ['outcome'],
+)
+
+REDIS_POOL_MAX_CONNECTIONS = Gauge('redis_pool_max_connections', 'Size of the shared redis connection pool')
+REDIS_POOL_CONNECTIONS_IN_USE = Gauge('redis_pool_connections_in_use', 'Redis connections currently checked out')
+REDIS_POOL_CONNECTIONS_IDLE = Gauge('redis_pool_connections_idle', 'Open redis connections waiting in the pool')
@@ -0,0 +1,48 @@
+"""course registrations counter
+
+Revision ID: 3f9c2d1e8a47
+Revises: b639b08e3589
+Create Date: 2026-10-18 10:12:41.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d1e8a47'
+down_revision: Union[str, None] = 'b639b08e3589'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'courses',
+        sa.Column('total_registered', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    # backfill, later the counter is maintained by the app and can be fixed with `learn-anything counters reconcile`
+    op.execute(
+        '''
+        UPDATE courses
+        SET total_registered = registrations.total
+        FROM (
+            SELECT course_id, count(*) AS total
+            FROM registrations_for_courses
+            GROUP BY course_id
+        ) AS registrations
+        WHERE courses.id = registrations.course_id
+        '''
+    )
+    op.create_index(
+        'ix_courses_published_total_registered',
+        'courses',
+        [sa.text('total_registered DESC'), 'id'],
+        postgresql_where=sa.text('is_published'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_courses_published_total_registered', table_name='courses')
+    op.drop_column('courses', 'total_registered')
@@ -0,0 +1,52 @@
+"""secondary indexes
+
+Revision ID: 8b41e6d0c2f5
+Revises: 3f9c2d1e8a47
+Create Date: 2026-10-18 14:03:27.541902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b41e6d0c2f5'
+down_revision: Union[str, None] = '3f9c2d1e8a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (user_id, task_id) lookups are served by the primary key of submissions, it starts with these columns
+INDEXES = (
+    # submissions of a task, newest first, and the counts by task
+    ('ix_submissions_task_id_created_at', 'submissions', ['task_id', 'created_at', 'user_id'], None),
+    ('ix_submissions_task_id_correct', 'submissions', ['task_id'], 'is_correct'),
+    ('ix_tasks_course_id_index_in_course', 'tasks', ['course_id', 'index_in_course', 'id'], None),
+    ('ix_code_task_tests_task_id_index_in_task', 'code_task_tests', ['task_id', 'index_in_task'], None),
+    ('ix_poll_task_options_task_id', 'poll_task_options', ['task_id'], None),
+    ('ix_courses_creator_id_created_at', 'courses', ['creator_id', 'created_at', 'id'], None),
+    # catalog sorted by date
+    ('ix_courses_published_created_at', 'courses', ['created_at', 'id'], 'is_published'),
+    ('ix_registrations_for_courses_course_id', 'registrations_for_courses', ['course_id'], None),
+)
+
+
+def upgrade() -> None:
+    # tables are not locked for writes while the indexes are built,
+    # an index left invalid by a failed build has to be dropped before the upgrade is run again
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""course search
+
+Revision ID: c7e2a9f4d1b3
+Revises: 8b41e6d0c2f5
+Create Date: 2026-10-18 16:41:09.217463
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9f4d1b3'
+down_revision: Union[str, None] = '8b41e6d0c2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the same expression as courses_search_document, otherwise the index is not used by the search
+COURSES_SEARCH_DOCUMENT = '''
+    setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A')
+    || setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B')
+'''
+
+
+def upgrade() -> None:
+    # creating the extension needs the CREATE privilege on the database
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_courses_search_document',
+            'courses',
+            [sa.text(f'({COURSES_SEARCH_DOCUMENT})')],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_fullname_trgm',
+            'users',
+            ['fullname'],
+            postgresql_using='gin',
+            postgresql_ops={'fullname': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_fullname_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_courses_search_document', table_name='courses', postgresql_concurrently=True, if_exists=True)
+    # pg_trgm is left installed, other database objects may use it
@@ -0,0 +1,83 @@
+import re
+from typing import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from learn_anything.course_platform.adapters.persistence.mappers.course import select_courses, courses_sort_key
+from learn_anything.course_platform.adapters.persistence.mappers.pagination import SortKey, paginate, page_items
+from learn_anything.course_platform.adapters.persistence.tables.course import courses_table, \
+    courses_search_document, COURSES_SEARCH_CONFIG
+from learn_anything.course_platform.adapters.persistence.tables.user import users_table
+from learn_anything.course_platform.application.input_data import Pagination
+from learn_anything.course_platform.application.ports.data.course_gateway import GetManyCoursesFilters
+from learn_anything.course_platform.application.ports.data.course_search import CourseSearch
+from learn_anything.course_platform.domain.entities.course.models import Course
+
+_WORD = re.compile(r'\w+')
+
+
+def _prefix_tsquery(text: str) -> str | None:
+    """Every word of the text as a prefix, so the courses are found while the user is still typing"""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+class PostgresCourseSearch(CourseSearch):
+    """
+    Full-text search over title and description with russian stemming (GIN index on courses_search_document)
+    and fuzzy search by the name of the author with pg_trgm (GIN trigram index on users.fullname)
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def search(
+            self,
+            pagination: Pagination,
+            filters: GetManyCoursesFilters,
+    ) -> tuple[Sequence[Course], int | None, str | None]:
+        stmt = select_courses(filters)
+        rank: sa.ColumnElement[float] | None = None
+
+        if filters.author_name:
+            author_name = sa.literal(filters.author_name, sa.Text)
+            # true if the name is similar to a part of the author's name, can be answered by the index
+            stmt = (
+                stmt.
+                join(users_table, users_table.c.id == courses_table.c.creator_id).
+                where(author_name.op('<%')(users_table.c.fullname))
+            )
+            rank = func.word_similarity(author_name, users_table.c.fullname, type_=sa.Float)
+
+        tsquery = _prefix_tsquery(filters.title) if filters.title else None
+        if tsquery:
+            query = func.to_tsquery(COURSES_SEARCH_CONFIG, tsquery, type_=TSQUERY)
+            stmt = stmt.where(courses_search_document.op('@@')(query))
+            # the text matters more than the author when both are searched
+            rank = func.ts_rank_cd(courses_search_document, query, type_=sa.Float)
+
+        total = None
+        if pagination.with_total:
+            total_res = await self._session.execute(
+                select(func.count()).select_from(stmt.subquery())
+            )
+            total = total_res.scalar_one()
+
+        sort_key: SortKey
+        if rank is not None:
+            rank = rank.label('rank')
+            stmt = stmt.add_columns(rank)
+            sort_key = [(rank, True), (courses_table.c.id, False)]
+        else:
+            sort_key = courses_sort_key(filters.sort_by)
+
+        res = await self._session.execute(paginate(stmt, pagination, sort_key))
+
+        rows, next_cursor = page_items(res.all(), pagination, sort_key)
+        courses = [Course(**{column: getattr(row, column) for column in courses_table.c.keys()}) for row in rows]
+        return courses, total, next_cursor
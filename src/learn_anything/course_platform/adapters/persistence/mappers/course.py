@@ -1,15 +1,14 @@
-from typing import Sequence, cast
+from typing import Sequence, cast, Any
 
-from sqlalchemy import and_
-from sqlalchemy import select, func, desc, delete
+from sqlalchemy import and_, or_
+from sqlalchemy import select, func, delete, update, Select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Bundle
 
+from learn_anything.course_platform.adapters.persistence.mappers.pagination import SortKey, paginate, page_items
 from learn_anything.course_platform.adapters.persistence.tables.course import courses_table, \
     registrations_for_courses_table, \
     course_share_rules_table
-from learn_anything.course_platform.adapters.persistence.tables.user import users_table
 from learn_anything.course_platform.application.input_data import Pagination
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway, \
     RegistrationForCourseGateway, \
@@ -19,127 +18,69 @@ from learn_anything.course_platform.domain.entities.course.models import Course,
 from learn_anything.course_platform.domain.entities.user.models import UserID
 
 
-class CourseMapper(CourseGateway):
-    def __init__(self, session: AsyncSession) -> None:
-        self._session = session
+def select_courses(filters: GetManyCoursesFilters) -> Select[Any]:
+    """Courses the filters are about: published ones, or the ones the actor has created or is registered for"""
+    stmt = select(courses_table)
 
-    async def with_id(self, course_id: CourseID) -> Course:
-        course_total_registrations = (
-            select(
-                courses_table.c.id,
-                func.count(registrations_for_courses_table.c.user_id).label("total_registered")
-            ).
-            outerjoin(target=registrations_for_courses_table).
-            group_by(courses_table.c.id).
-            having(courses_table.c.id == course_id).
-            cte('course_total_registrations')
-        )
+    # exclude published courses for everyone, but include for creator
+    if not filters.with_creator_id:
+        stmt = stmt.where(courses_table.c.is_published)
+    else:
+        stmt = stmt.where(courses_table.c.creator_id == filters.with_creator_id)
 
+    if filters.with_registered_actor_id:
         stmt = (
-            select(  # type: ignore[var-annotated]
-                Bundle("course", *courses_table.c),
-                Bundle("course_total_registrations", course_total_registrations.c.total_registered),
+            stmt.
+            join(
+                target=registrations_for_courses_table,
             ).
-            add_cte(course_total_registrations).
-            select_from(courses_table).
-            join(course_total_registrations, onclause=courses_table.c.id == course_total_registrations.c.id)
+            where(
+                registrations_for_courses_table.c.user_id == filters.with_registered_actor_id
+            )
         )
+    return stmt
+
+
+def courses_sort_key(sort_by: SortBy) -> SortKey:
+    if sort_by == SortBy.DATE:
+        return [(courses_table.c.created_at, True), (courses_table.c.id, True)]
+    if sort_by == SortBy.POPULARITY:
+        return [(courses_table.c.total_registered, True), (courses_table.c.id, False)]
+    return [(courses_table.c.id, False)]
+
+
+class CourseMapper(CourseGateway):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
 
+    async def with_id(self, course_id: CourseID) -> Course:
+        stmt = select(courses_table).where(courses_table.c.id == course_id)
         res = await self._session.execute(stmt)
 
         row = res.fetchone()
-        return Course(
-            **row.course._mapping,  # noqa
-            total_registered=row.course_total_registrations.total_registered,
-        )
+        return Course(**row._mapping)  # type: ignore[union-attr]
 
     async def all(
             self,
             pagination: Pagination,
             filters: GetManyCoursesFilters,
-    ) -> tuple[Sequence[Course], int]:
-        course_total_registrations = (
-            select(
-                courses_table.c.id,
-                func.count(registrations_for_courses_table.c.user_id).label("total_registered")
-            ).
-            outerjoin(target=registrations_for_courses_table).
-            group_by(courses_table.c.id).
-            cte('course_total_registrations')
-        )
-
-        get_courses_stmt = (
-            select(  # type: ignore[var-annotated]
-                Bundle("course", *courses_table.c),
-                Bundle("course_total_registrations", course_total_registrations.c.total_registered),
-            ).
-            add_cte(course_total_registrations).
-            select_from(courses_table).
-            join(course_total_registrations, onclause=courses_table.c.id == course_total_registrations.c.id)
-        )
-
-        if filters.author_name:
-            get_courses_stmt = (
-                get_courses_stmt.
-                join(users_table).
-                where(users_table.c.fullname.like(f'%{filters.author_name}%'))
+    ) -> tuple[Sequence[Course], int | None, str | None]:
+        # text filters are served by the course search
+        get_courses_stmt = select_courses(filters)
+        sort_key = courses_sort_key(filters.sort_by)
+
+        total = None
+        if pagination.with_total:
+            total_res = await self._session.execute(
+                select(func.count()).select_from(get_courses_stmt.subquery())
             )
+            total = total_res.scalar_one()
 
-        if filters.title:
-            get_courses_stmt = (
-                get_courses_stmt.
-                where(
-                    func.concat(
-                        func.lower(courses_table.c.title),
-                        func.lower(courses_table.c.description),
-                    ).like(f'%{filters.title.lower()}%')
-                )
-            )
-
-        # exclude published courses for everyone, but include for creator
-        if not filters.with_creator_id:
-            get_courses_stmt = get_courses_stmt.where(courses_table.c.is_published)
-        else:
-            get_courses_stmt = get_courses_stmt.where(courses_table.c.creator_id == filters.with_creator_id)
-
-        if filters.with_registered_actor_id:
-            get_courses_stmt = (
-                get_courses_stmt.
-                join(
-                    target=registrations_for_courses_table,
-                ).
-                where(
-                    registrations_for_courses_table.c.user_id == filters.with_registered_actor_id
-                )
-            )
+        res = await self._session.execute(paginate(get_courses_stmt, pagination, sort_key))
 
-        if filters.sort_by == SortBy.DATE:
-            get_courses_stmt = get_courses_stmt.order_by(desc(courses_table.c.created_at))
-
-        elif filters.sort_by == SortBy.POPULARITY:
-            get_courses_stmt = get_courses_stmt.order_by(desc(course_total_registrations.c.total_registered))
-
-        total_res = await self._session.execute(
-            select(func.count()).select_from(get_courses_stmt.subquery())
-        )
-
-        get_courses_stmt = (
-            get_courses_stmt.
-            offset(pagination.offset).
-            limit(pagination.limit)
-        )
-
-        res = await self._session.execute(get_courses_stmt)
-
-        courses = []
-        for row in res:
-            courses.append(Course(
-                **row.course._mapping,  # noqa
-                total_registered=row.course_total_registrations.total_registered,
-            ))
-
-        total = total_res.scalar_one()
-        return courses, total
+        rows, next_cursor = page_items(res.all(), pagination, sort_key)
+        courses = [Course(**row._mapping) for row in rows]
+        return courses, total, next_cursor
 
     async def save(self, course: Course) -> CourseID:
         stmt = (
@@ -187,6 +128,43 @@ class CourseMapper(CourseGateway):
         res = await self._session.execute(stmt)
         return cast(CourseID, res.scalar_one())
 
+    async def update_total_registered(self, course_id: CourseID, delta: int) -> bool:
+        # counter is changed in the db, so concurrent registrations do not overwrite each other
+        stmt = (
+            update(courses_table).
+            where(courses_table.c.id == course_id).
+            values(
+                total_registered=courses_table.c.total_registered + delta,
+                # registrations are not changes of the course itself
+                updated_at=courses_table.c.updated_at,
+            ).
+            returning(courses_table.c.id)
+        )
+        if delta > 0:
+            # checked against the locked row, the value read before the update may be stale already
+            stmt = stmt.where(or_(
+                courses_table.c.registrations_limit.is_(None),
+                courses_table.c.total_registered + delta <= courses_table.c.registrations_limit,
+            ))
+
+        res = await self._session.execute(stmt)
+        return res.scalar_one_or_none() is not None
+
+    async def reconcile_total_registered(self) -> int:
+        """Recounts registrations of the courses whose counter has drifted, returns the number of fixed courses"""
+        actual_total_registered = (
+            select(func.count()).
+            where(registrations_for_courses_table.c.course_id == courses_table.c.id).
+            scalar_subquery()
+        )
+        stmt = (
+            update(courses_table).
+            where(courses_table.c.total_registered != actual_total_registered).
+            values(total_registered=actual_total_registered, updated_at=courses_table.c.updated_at)
+        )
+        res = await self._session.execute(stmt)
+        return res.rowcount  # type: ignore[attr-defined, no-any-return]
+
     async def delete(self, course_id: CourseID) -> None:
         stmt = (
             delete(courses_table).
@@ -220,6 +198,15 @@ class RegistrationForCourseMapper(RegistrationForCourseGateway):
 
         return res.scalar_one_or_none()
 
+    async def read_many(self, user_id: UserID, course_ids: Sequence[CourseID]) -> Sequence[RegistrationForCourse]:
+        stmt = select(RegistrationForCourse).where(and_(
+            registrations_for_courses_table.c.course_id.in_(course_ids),
+            registrations_for_courses_table.c.user_id == user_id,
+        ))
+        res = await self._session.execute(stmt)
+
+        return res.scalars().all()
+
     async def save(self, registration: RegistrationForCourse) -> None:
         stmt = (
             insert(registrations_for_courses_table).
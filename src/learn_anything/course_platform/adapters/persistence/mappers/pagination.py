@@ -0,0 +1,95 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import Select, ColumnElement, and_, or_, tuple_, desc
+
+from learn_anything.course_platform.application.errors import InvalidPaginationCursorError
+from learn_anything.course_platform.application.input_data import Pagination
+
+_S = TypeVar('_S', bound=Select[Any])
+_T = TypeVar('_T')
+
+# sort column and whether it is sorted descending, the last one must make the order unique
+SortKey = Sequence[tuple[ColumnElement[Any], bool]]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_key: SortKey) -> list[Any]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise InvalidPaginationCursorError
+
+    if not isinstance(raw, list) or len(raw) != len(sort_key):
+        raise InvalidPaginationCursorError
+
+    values = []
+    for value, (column, _) in zip(raw, sort_key):
+        python_type = column.type.python_type
+        try:
+            values.append(datetime.fromisoformat(value) if python_type is datetime else python_type(value))
+        except (TypeError, ValueError):
+            raise InvalidPaginationCursorError
+    return values
+
+
+def after(sort_key: SortKey, values: Sequence[Any]) -> ColumnElement[bool]:
+    """Condition for the rows which go after the row with the given values of the sort key"""
+    columns = [column for column, _ in sort_key]
+    directions = {descending for _, descending in sort_key}
+    if len(directions) == 1:
+        # row comparison can be answered by a single range scan of the index on the sort key
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    return or_(*(
+        and_(
+            *(column == value for column, value in zip(columns[:i], values[:i])),
+            columns[i] < values[i] if sort_key[i][1] else columns[i] > values[i],
+        )
+        for i in range(len(columns))
+    ))
+
+
+def paginate(stmt: _S, pagination: Pagination, sort_key: SortKey) -> _S:
+    """
+    Orders the statement by the sort key and selects the page after the cursor, or at the offset without it.
+    One extra row is fetched to know whether there is a next page, pass the result to page_items()
+    """
+    stmt = stmt.order_by(*(desc(column) if descending else column for column, descending in sort_key))
+
+    if pagination.cursor:
+        stmt = stmt.where(after(sort_key, decode_cursor(pagination.cursor, sort_key)))
+    elif pagination.offset:
+        stmt = stmt.offset(pagination.offset)
+
+    if pagination.limit is not None:
+        stmt = stmt.limit(pagination.limit + 1)
+    return stmt
+
+
+def page_items(items: Sequence[_T], pagination: Pagination, sort_key: SortKey) -> tuple[Sequence[_T], str | None]:
+    """
+    Cuts off the extra item fetched by paginate() and returns the items of the page with the cursor of the next one.
+    Items are rows or entities having the sort key columns as attributes
+    """
+    if not pagination.limit or len(items) <= pagination.limit:
+        return items[:pagination.limit], None
+
+    items = items[:pagination.limit]
+    return items, encode_cursor([getattr(items[-1], _attribute_name(column)) for column, _ in sort_key])
+
+
+def _attribute_name(column: ColumnElement[Any]) -> str:
+    if column.key is None:
+        raise ValueError(f'Sort key column {column} must be a table column or labeled')
+    return column.key
@@ -1,9 +1,10 @@
 from typing import Sequence
 
-from sqlalchemy import select, func, and_, insert, desc
+from sqlalchemy import select, func, and_, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Bundle
 
+from learn_anything.course_platform.adapters.persistence.mappers.pagination import paginate, page_items
 from learn_anything.course_platform.adapters.persistence.tables import poll_task_options_table
 from learn_anything.course_platform.adapters.persistence.tables.submission import submissions_table
 from learn_anything.course_platform.application.input_data import Pagination
@@ -12,6 +13,10 @@ from learn_anything.course_platform.domain.entities.submission.models import Cod
 from learn_anything.course_platform.domain.entities.task.models import TaskID, PollTaskOption
 from learn_anything.course_platform.domain.entities.user.models import UserID
 
+# submissions of a task are told apart by their user and time, the same as the primary key
+_CODE_SUBMISSIONS_SORT_KEY = [(submissions_table.c.created_at, True), (submissions_table.c.user_id, True)]
+_POLL_SUBMISSIONS_SORT_KEY = [(submissions_table.c.created_at, False), (submissions_table.c.user_id, False)]
+
 
 class SubmissionMapper(SubmissionGateway):
     def __init__(self, session: AsyncSession):
@@ -31,13 +36,12 @@ class SubmissionMapper(SubmissionGateway):
             task_id: TaskID,
             filters: GetManySubmissionsFilters,
             pagination: Pagination
-    ) -> tuple[Sequence[CodeSubmission], int]:
+    ) -> tuple[Sequence[CodeSubmission], int | None, str | None]:
         stmt = (
             select(CodeSubmission).
             where(
                 submissions_table.c.task_id == task_id
-            ).
-            order_by(desc(submissions_table.c.created_at))
+            )
         )
 
         if filters.with_actor_id:
@@ -45,28 +49,26 @@ class SubmissionMapper(SubmissionGateway):
                 submissions_table.c.user_id == filters.with_actor_id,
             )
 
-        total_res = await self._session.execute(
-            select(func.count()).select_from(stmt.subquery())
-        )
-
-        if pagination:
-            stmt = (
-                stmt.
-                offset(pagination.offset).
-                limit(pagination.limit)
+        total = None
+        if pagination.with_total:
+            total_res = await self._session.execute(
+                select(func.count()).select_from(stmt.subquery())
             )
+            total = total_res.scalar_one()
+
+        stmt = paginate(stmt, pagination, _CODE_SUBMISSIONS_SORT_KEY)
 
         result = await self._session.execute(stmt)
 
-        total = total_res.scalar_one()
-        return result.scalars().all(), total
+        submissions, next_cursor = page_items(result.scalars().all(), pagination, _CODE_SUBMISSIONS_SORT_KEY)
+        return submissions, total, next_cursor
 
     async def many_with_poll_task_id(
             self,
             task_id: TaskID,
             filters: GetManySubmissionsFilters,
             pagination: Pagination
-    ) -> tuple[Sequence[PollSubmission], int]:
+    ) -> tuple[Sequence[PollSubmission], int | None, str | None]:
         stmt = (
             select(  # type: ignore[var-annotated]
                 Bundle("submission", *submissions_table.c),
@@ -81,8 +83,7 @@ class SubmissionMapper(SubmissionGateway):
             ).
             where(
                 submissions_table.c.task_id == task_id
-            ).
-            order_by(submissions_table.c.created_at)
+            )
         )
 
         if filters.with_actor_id:
@@ -90,16 +91,14 @@ class SubmissionMapper(SubmissionGateway):
                 submissions_table.c.user_id == filters.with_actor_id,
             )
 
-        total_res = await self._session.execute(
-            select(func.count()).select_from(stmt.subquery())
-        )
-
-        if pagination:
-            stmt = (
-                stmt.
-                offset(pagination.offset).
-                limit(pagination.limit)
+        total = None
+        if pagination.with_total:
+            total_res = await self._session.execute(
+                select(func.count()).select_from(stmt.subquery())
             )
+            total = total_res.scalar_one()
+
+        stmt = paginate(stmt, pagination, _POLL_SUBMISSIONS_SORT_KEY)
 
         res = await self._session.execute(stmt)
 
@@ -120,8 +119,8 @@ class SubmissionMapper(SubmissionGateway):
                 ),
             ))
 
-        total = total_res.scalar_one()
-        return submissions, total
+        page, next_cursor = page_items(submissions, pagination, _POLL_SUBMISSIONS_SORT_KEY)
+        return page, total, next_cursor
 
     async def total_with_task_id(self, task_id: TaskID) -> int:
         stmt = (
@@ -1,21 +1,37 @@
 from collections.abc import Sequence
-from typing import cast
+from typing import cast, Any, TypeVar
 
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, event, true
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from learn_anything.course_platform.adapters.persistence.mappers.pagination import paginate, page_items
 from learn_anything.course_platform.adapters.persistence.tables import code_task_tests_table
+from learn_anything.course_platform.adapters.persistence.tables.submission import submissions_table
 from learn_anything.course_platform.adapters.persistence.tables.task import tasks_table, poll_task_options_table
+from learn_anything.course_platform.adapters.redis.task_cache import TaskCache
 from learn_anything.course_platform.application.input_data import Pagination
-from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway, GetTasksFilters
+from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway, GetTasksFilters, \
+    TaskWithSubmissionsStats, TaskSubmissionsStats
 from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.task.enums import TaskType
 from learn_anything.course_platform.domain.entities.task.models import Task, TaskID, CodeTask, PollTask, PollTaskOption, CodeTaskTest
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+
+_T = TypeVar('_T')
+
+_CHANGED_TASKS_KEY = 'changed_task_ids'
+
+_TASKS_SORT_KEY = [(tasks_table.c.index_in_course, False), (tasks_table.c.id, False)]
 
 
 class TaskMapper(TaskGateway):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, task_cache: TaskCache) -> None:
         self._session: AsyncSession = session
+        self._task_cache = task_cache
+        _track_changed_tasks(session, task_cache)
 
     async def with_id(self, task_id: TaskID) -> Task | None:
         stmt = select(Task).where(tasks_table.c.id == task_id)
@@ -24,6 +40,10 @@ class TaskMapper(TaskGateway):
         return result.scalar_one_or_none()
 
     async def get_code_task_with_id(self, task_id: TaskID) -> CodeTask | None:
+        cached_task, version = await self._task_cache.get(task_id)
+        if isinstance(cached_task, CodeTask):
+            return await self._attach_code_task(cached_task)
+
         stmt = select(CodeTask).where(tasks_table.c.id == task_id)
         result = await self._session.execute(stmt)
 
@@ -35,50 +55,174 @@ class TaskMapper(TaskGateway):
         get_tests_result = await self._session.execute(get_tests_stmt)
 
         task.tests = list(get_tests_result.scalars().all())
+        if task.type == TaskType.CODE:
+            await self._task_cache.set(task, version)
         return task
 
-    async def get_poll_task_with_id(self, task_id: TaskID) -> PollTask:
-        select_poll_task_stmt = (
-            select(PollTask, PollTaskOption).
-            join(
-                target=poll_task_options_table,
-                onclause=tasks_table.c.id == poll_task_options_table.c.task_id
-            ).
-            where(tasks_table.c.id == task_id)
-        )
+    async def get_poll_task_with_id(self, task_id: TaskID) -> PollTask | None:
+        cached_task, version = await self._task_cache.get(task_id)
+        if isinstance(cached_task, PollTask):
+            return await self._attach_poll_task(cached_task)
 
+        select_poll_task_stmt = select(PollTask).where(tasks_table.c.id == task_id)
         poll_task_res = await self._session.execute(select_poll_task_stmt)
-        poll_task = cast(PollTask, poll_task_res.scalar_one())
 
+        poll_task: PollTask | None = poll_task_res.scalar_one_or_none()
+        if poll_task is None:
+            return None
+
+        select_options_stmt = (
+            select(PollTaskOption).
+            where(poll_task_options_table.c.task_id == task_id).
+            order_by(poll_task_options_table.c.id)
+        )
+        options_res = await self._session.execute(select_options_stmt)
+
+        poll_task.options = list(options_res.scalars().all())
+        if poll_task.type == TaskType.POLL:
+            await self._task_cache.set(poll_task, version)
         return poll_task
 
+    async def _attach_code_task(self, task: CodeTask) -> CodeTask:
+        # the interactors change the tasks they got and rely on the session to flush the changes,
+        # so a cached task is attached to the session as if it was loaded from the db
+        tests = []
+        for idx, test in enumerate(task.tests):
+            test.task_id = task.id  # type: ignore[attr-defined]
+            test.index_in_task = idx  # type: ignore[attr-defined]
+            tests.append(await self._attach(test))
+
+        attached_task = await self._attach(task)
+        attached_task.tests = tests
+        return attached_task
+
+    async def _attach_poll_task(self, task: PollTask) -> PollTask:
+        options = []
+        for option in task.options:
+            option.task_id = task.id  # type: ignore[attr-defined]
+            options.append(await self._attach(option))
+
+        attached_task = await self._attach(task)
+        attached_task.options = options
+        return attached_task
+
+    async def _attach(self, obj: _T) -> _T:
+        make_transient_to_detached(obj)
+        return await self._session.merge(obj, load=False)
+
     async def with_course(
             self,
             course_id: CourseID,
             pagination: Pagination,
             filters: GetTasksFilters | None
-    ) -> tuple[Sequence[Task], int]:
+    ) -> tuple[Sequence[Task], int | None, str | None]:
         stmt = (
             select(
                 Task
             ).
-            where(tasks_table.c.course_id == course_id).
-            order_by(tasks_table.c.index_in_course)
+            where(tasks_table.c.course_id == course_id)
         )
 
-        total_res = await self._session.execute(
-            select(func.count()).select_from(stmt.subquery())
-        )
+        total = await self.total_with_course(course_id) if pagination.with_total else None
+
+        result = await self._session.scalars(paginate(stmt, pagination, _TASKS_SORT_KEY))
+
+        tasks, next_cursor = page_items(result.all(), pagination, _TASKS_SORT_KEY)
+        return tasks, total, next_cursor
+
+    async def with_course_and_submissions_stats(
+            self,
+            course_id: CourseID,
+            actor_id: UserID,
+            pagination: Pagination,
+            filters: GetTasksFilters | None
+    ) -> tuple[Sequence[TaskWithSubmissionsStats], int | None, str | None]:
+        page = paginate(
+            select(tasks_table).where(tasks_table.c.course_id == course_id),
+            pagination,
+            _TASKS_SORT_KEY,
+        ).subquery()
+
+        actor_submissions = submissions_table.c.user_id == actor_id
+        stats = (
+            select(
+                func.count().label('total_submissions'),
+                func.count().filter(submissions_table.c.is_correct).label('total_correct_submissions'),
+                func.count().filter(actor_submissions).label('total_actor_submissions'),
+                func.coalesce(
+                    func.bool_or(submissions_table.c.is_correct).filter(actor_submissions),
+                    False,
+                ).label('solved_by_actor'),
+            ).
+            where(submissions_table.c.task_id == page.c.id)
+        ).lateral()
 
         stmt = (
-            stmt.
-            offset(pagination.offset).
-            limit(pagination.limit)
+            select(page, stats).
+            join_from(page, stats, true()).
+            order_by(page.c.index_in_course, page.c.id)
         )
 
-        result = await self._session.scalars(stmt)
+        total = await self.total_with_course(course_id) if pagination.with_total else None
+
+        rows, next_cursor = page_items((await self._session.execute(stmt)).all(), pagination, _TASKS_SORT_KEY)
+        if not rows:
+            return [], total, next_cursor
+
+        code_task_ids = [row.id for row in rows if row.type == TaskType.CODE]
+        tests: dict[TaskID, list[CodeTaskTest]] = {task_id: [] for task_id in code_task_ids}
+        if code_task_ids:
+            get_tests_stmt = (
+                select(code_task_tests_table.c.task_id, code_task_tests_table.c.code).
+                where(code_task_tests_table.c.task_id.in_(code_task_ids)).
+                order_by(code_task_tests_table.c.task_id, code_task_tests_table.c.index_in_task)
+            )
+            for test_row in await self._session.execute(get_tests_stmt):
+                tests[test_row.task_id].append(CodeTaskTest(code=test_row.code))
+
+        tasks = []
+        for row in rows:
+            task: Task
+            if row.type == TaskType.CODE:
+                task = CodeTask(
+                    id=row.id,
+                    type=row.type,
+                    topic=row.topic,
+                    title=row.title,
+                    body=row.body,
+                    course_id=row.course_id,
+                    index_in_course=row.index_in_course,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                    attempts_limit=row.attempts_limit,
+                    prepared_code=row.prepared_code,
+                    code_duration_timeout=row.code_duration_timeout,
+                    tests=tests[row.id],
+                )
+            else:
+                task = Task(
+                    id=row.id,
+                    type=row.type,
+                    topic=row.topic,
+                    title=row.title,
+                    body=row.body,
+                    course_id=row.course_id,
+                    index_in_course=row.index_in_course,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                )
+
+            tasks.append(TaskWithSubmissionsStats(
+                task=task,
+                submissions_stats=TaskSubmissionsStats(
+                    total_submissions=row.total_submissions,
+                    total_correct_submissions=row.total_correct_submissions,
+                    total_actor_submissions=row.total_actor_submissions,
+                    solved_by_actor=row.solved_by_actor,
+                ),
+            ))
 
-        return result.all(), total_res.scalar_one()
+        return tasks, total, next_cursor
 
     async def total_with_course(self, course_id: CourseID) -> int:
         stmt = (
@@ -131,7 +275,10 @@ class TaskMapper(TaskGateway):
             )
 
         res = await self._session.execute(stmt)
-        return cast(TaskID, res.scalar_one())
+        task_id = cast(TaskID, res.scalar_one())
+
+        _changed_tasks(self._session).add(task_id)
+        return task_id
 
     async def save_code_task(self, task: CodeTask) -> TaskID:
         upsert_code_task_stmt = (
@@ -153,6 +300,7 @@ class TaskMapper(TaskGateway):
             for idx, test in enumerate(task.tests):
                 if test.code is None:
                     await self._session.delete(test)
+                    _changed_tasks(self._session).add(task.id)
                     return task.id
 
             upsert_code_task_stmt = (
@@ -208,6 +356,8 @@ class TaskMapper(TaskGateway):
         )
 
         await self._session.execute(insert_code_task_tests_stmt)
+
+        _changed_tasks(self._session).add(task_id)
         return task_id
 
     async def save_poll_task(self, task: PollTask) -> TaskID:
@@ -261,7 +411,9 @@ class TaskMapper(TaskGateway):
         res, _ = await self._session.execute(task_upsert_stmt)
         await self._session.execute(insert_options_stmt)
 
-        return cast(TaskID, res.scalar_one())
+        task_id = cast(TaskID, res.scalar_one())
+        _changed_tasks(self._session).add(task_id)
+        return task_id
 
     async def delete(self, task_id: TaskID) -> None:
         stmt = (
@@ -271,3 +423,41 @@ class TaskMapper(TaskGateway):
             )
         )
         await self._session.execute(stmt)
+
+        _changed_tasks(self._session).add(task_id)
+
+
+def _changed_tasks(session: AsyncSession) -> set[TaskID]:
+    return session.info[_CHANGED_TASKS_KEY]  # type: ignore[no-any-return]
+
+
+def _track_changed_tasks(session: AsyncSession, task_cache: TaskCache) -> None:
+    """
+    Collects ids of the tasks changed in the session and drops them from the task cache once the changes are committed.
+    Besides the explicit saves, tasks and their tests and options changed through the session itself are collected
+    """
+    sync_session = session.sync_session
+    if _CHANGED_TASKS_KEY in sync_session.info:
+        return
+    sync_session.info[_CHANGED_TASKS_KEY] = set()
+
+    def collect_flushed(flushed_session: Session, _: Any) -> None:
+        changed = flushed_session.info[_CHANGED_TASKS_KEY]
+        for obj in (*flushed_session.dirty, *flushed_session.deleted):
+            if isinstance(obj, Task):
+                changed.add(obj.id)
+            elif isinstance(obj, CodeTaskTest | PollTaskOption):
+                changed.add(obj.task_id)  # type: ignore[union-attr]
+
+    def invalidate_committed(committed_session: Session) -> None:
+        changed = committed_session.info[_CHANGED_TASKS_KEY]
+        if changed:
+            task_cache.invalidate_soon(set(changed))
+            changed.clear()
+
+    def forget_rolled_back(rolled_back_session: Session) -> None:
+        rolled_back_session.info[_CHANGED_TASKS_KEY].clear()
+
+    event.listen(sync_session, 'after_flush', collect_flushed)
+    event.listen(sync_session, 'after_commit', invalidate_committed)
+    event.listen(sync_session, 'after_rollback', forget_rolled_back)
@@ -1,5 +1,5 @@
 import uuid
-from typing import cast
+from typing import cast, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
@@ -43,6 +43,12 @@ class UserMapper(UserGateway):
 
         return result.scalar_one_or_none()
 
+    async def with_ids(self, user_ids: Sequence[UserID]) -> Sequence[User]:
+        stmt = select(User).where(users_table.c.id.in_(user_ids))
+        result = await self._session.execute(stmt)
+
+        return result.scalars().all()
+
     async def with_username(self, username: str) -> User | None:
         stmt = select(User).where(users_table.c.username == username)
         result = await self._session.execute(stmt)
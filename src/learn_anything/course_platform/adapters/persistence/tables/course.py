@@ -1,4 +1,5 @@
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR, REGCONFIG
 
 from learn_anything.course_platform.domain.entities.course.models import Course, RegistrationForCourse, CourseShareRule
 from learn_anything.course_platform.adapters.persistence.tables.base import mapper_registry
@@ -37,6 +38,14 @@ courses_table = sa.Table(
         sa.ForeignKey("users.id", ondelete='SET NULL'),
         nullable=True,
     ),
+    # maintained along with registrations_for_courses, see CourseMapper.update_total_registered
+    sa.Column(
+        "total_registered",
+        sa.BigInteger,
+        nullable=False,
+        default=0,
+        server_default='0',
+    ),
     sa.Column(
         "created_at",
         sa.DateTime,
@@ -53,6 +62,44 @@ courses_table = sa.Table(
     ),
 )
 
+# catalog sorted by popularity
+sa.Index(
+    'ix_courses_published_total_registered',
+    courses_table.c.total_registered.desc(),
+    courses_table.c.id,
+    postgresql_where=courses_table.c.is_published,
+)
+# catalog sorted by date
+sa.Index(
+    'ix_courses_published_created_at',
+    courses_table.c.created_at,
+    courses_table.c.id,
+    postgresql_where=courses_table.c.is_published,
+)
+sa.Index(
+    'ix_courses_creator_id_created_at',
+    courses_table.c.creator_id,
+    courses_table.c.created_at,
+    courses_table.c.id,
+)
+
+# text search over title and description, queries have to use the same expression for the index to be used.
+# Constants are rendered inline, so the expression is the same in every query
+COURSES_SEARCH_CONFIG = sa.literal_column("'russian'::regconfig", type_=REGCONFIG)
+courses_search_document = sa.func.setweight(
+    sa.func.to_tsvector(COURSES_SEARCH_CONFIG, sa.func.coalesce(courses_table.c.title, sa.literal_column("''"))),
+    sa.literal_column("'A'"),
+    type_=TSVECTOR,
+).op('||', return_type=TSVECTOR)(
+    sa.func.setweight(
+        sa.func.to_tsvector(COURSES_SEARCH_CONFIG, sa.func.coalesce(courses_table.c.description, sa.literal_column("''"))),
+        sa.literal_column("'B'"),
+        type_=TSVECTOR,
+    )
+)
+# the table is not found in the operator expression, so the index is attached to it explicitly
+courses_table.append_constraint(sa.Index('ix_courses_search_document', courses_search_document, postgresql_using='gin'))
+
 course_share_rules_table = sa.Table(
     'course_share_rules',
     mapper_registry.metadata,
@@ -98,6 +145,8 @@ registrations_for_courses_table = sa.Table(
     ),
 )
 
+sa.Index('ix_registrations_for_courses_course_id', registrations_for_courses_table.c.course_id)
+
 
 def map_courses_table() -> None:
     mapper_registry.map_imperatively(
@@ -39,6 +39,19 @@ submissions_table = sa.Table(
     ),
 )
 
+# (user_id, task_id) lookups are served by the primary key
+sa.Index(
+    'ix_submissions_task_id_created_at',
+    submissions_table.c.task_id,
+    submissions_table.c.created_at,
+    submissions_table.c.user_id,
+)
+sa.Index(
+    'ix_submissions_task_id_correct',
+    submissions_table.c.task_id,
+    postgresql_where=submissions_table.c.is_correct,
+)
+
 
 def map_submissions_table() -> None:
     mapper_registry.map_imperatively(
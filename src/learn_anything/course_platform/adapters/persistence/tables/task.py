@@ -67,6 +67,8 @@ tasks_table = sa.Table(
     )
 )
 
+sa.Index('ix_tasks_course_id_index_in_course', tasks_table.c.course_id, tasks_table.c.index_in_course, tasks_table.c.id)
+
 code_task_tests_table = sa.Table(
     "code_task_tests",
     mapper_registry.metadata,
@@ -88,6 +90,12 @@ code_task_tests_table = sa.Table(
     ),
 )
 
+sa.Index(
+    'ix_code_task_tests_task_id_index_in_task',
+    code_task_tests_table.c.task_id,
+    code_task_tests_table.c.index_in_task,
+)
+
 poll_task_options_table = sa.Table(
     "poll_task_options",
     mapper_registry.metadata,
@@ -112,6 +120,8 @@ poll_task_options_table = sa.Table(
     )
 )
 
+sa.Index('ix_poll_task_options_task_id', poll_task_options_table.c.task_id)
+
 text_input_task_correct_answers_table = sa.Table(
     "text_input_task_correct_answers",
     mapper_registry.metadata,
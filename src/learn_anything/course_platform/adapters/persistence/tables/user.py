@@ -40,6 +40,14 @@ users_table = sa.Table(
     ),
 )
 
+# fuzzy search of courses by the name of their author, needs pg_trgm
+sa.Index(
+    'ix_users_fullname_trgm',
+    users_table.c.fullname,
+    postgresql_using='gin',
+    postgresql_ops={'fullname': 'gin_trgm_ops'},
+)
+
 auth_links_table = sa.Table(
     "auth_links",
     mapper_registry.metadata,
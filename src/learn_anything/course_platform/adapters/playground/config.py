@@ -0,0 +1,76 @@
+import os
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+import toml
+
+from learn_anything.course_platform.application.ports.playground import PlaygroundLane
+
+
+class PlaygroundBackend(StrEnum):
+    # every submission runs in a qemu vm from the pool, the strongest isolation
+    VM = 'vm'
+    # submissions run on the host itself in nsjail, much cheaper but relies on the host kernel for isolation
+    NSJAIL = 'nsjail'
+
+
+@dataclass
+class PlaygroundConfig:
+    backend: PlaygroundBackend = PlaygroundBackend.VM
+    # results of identical submissions for the same task version are reused for this number of seconds
+    grading_cache_ttl: int = 24 * 60 * 60
+
+    # when the playground is busy, lanes get free slots in proportion to their weights
+    authoring_lane_weight: int = 4
+    interactive_lane_weight: int = 2
+    grading_lane_weight: int = 1
+
+    pool_min_size: int = 3
+    # pool boots extra vms up to this size when submissions are waiting for a free one
+    pool_max_size: int = 6
+    # extra vms idle for longer than this (in seconds) are shut down
+    vm_idle_timeout: int = 300
+    # vm is rebooted from scratch after this number of submissions,
+    # between them it is only reset to a clean state (1 means reboot after every use)
+    vm_max_uses: int = 20
+
+    nsjail_path: str = '/usr/bin/nsjail'
+    sandbox_python_path: str = '/usr/bin/python3'
+    # the only host dirs visible in the sandbox (read-only), the interpreter and its libraries must be inside them
+    sandbox_readonly_mounts: list[str] = field(default_factory=lambda: ['/usr', '/lib', '/lib64', '/bin'])
+    # ids the sandbox user is mapped to outside of it, must not be able to read anything of the app (nobody by default)
+    sandbox_outside_uid: int = 65534
+    sandbox_outside_gid: int = 65534
+    # max number of submissions checked at the same time, 0 means the number of cpus
+    sandbox_max_concurrency: int = 0
+    sandbox_memory_limit_mb: int = 256
+    # cpu time available to the sandbox per second of real time, 1000 is one full core
+    sandbox_cpu_ms_per_sec: int = 1000
+    sandbox_pids_limit: int = 64
+    sandbox_max_file_size_mb: int = 16
+
+    def __post_init__(self) -> None:
+        self.backend = PlaygroundBackend(self.backend)
+
+    @property
+    def lane_weights(self) -> dict[PlaygroundLane, int]:
+        return {
+            PlaygroundLane.AUTHORING: self.authoring_lane_weight,
+            PlaygroundLane.INTERACTIVE: self.interactive_lane_weight,
+            PlaygroundLane.GRADING: self.grading_lane_weight,
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Max number of submissions the playground runs at the same time"""
+        if self.backend == PlaygroundBackend.NSJAIL:
+            return self.sandbox_max_concurrency or os.cpu_count() or 1
+        return self.pool_max_size
+
+
+def load_playground_config(config_path: str) -> PlaygroundConfig:
+    with open(config_path, "r") as config_file:
+        data = toml.load(config_file).get('playground', {})
+
+    config = PlaygroundConfig(**data)
+    return config
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Self, Any, Sequence
+
+from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.playground.config import PlaygroundConfig
+from learn_anything.course_platform.application.ports.playground import Playground, StdOut, StdErr, \
+    CodeIsInvalidError, CodeWithTestsResult, PlaygroundFactory, PlaygroundLane
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+_SANDBOX_HARNESS_SOURCE = (Path(__file__).parent / 'sandbox_harness.py').read_text()
+
+# syscalls which user code never needs, but which are commonly used to escape a namespace sandbox
+_BLOCKED_SYSCALLS = (
+    'ptrace', 'process_vm_readv', 'process_vm_writev', 'mount', 'umount2', 'pivot_root', 'chroot',
+    'unshare', 'setns', 'bpf', 'perf_event_open', 'userfaultfd', 'keyctl', 'add_key', 'request_key',
+    'kexec_load', 'init_module', 'finit_module', 'delete_module', 'reboot', 'swapon', 'swapoff',
+    'syslog', 'acct', 'quotactl', 'open_by_handle_at',
+)
+_SECCOMP_POLICY = f'ERRNO(1) {{ {", ".join(_BLOCKED_SYSCALLS)} }} DEFAULT ALLOW'
+
+# python and user code expect them, everything else of /dev stays hidden
+_DEVICES = ('/dev/null', '/dev/zero', '/dev/urandom')
+
+
+class NsjailPlayground(Playground):
+    """
+    Runs the code right on the consumer host with nsjail: in separate namespaces (no network, own pid tree,
+    only the interpreter dirs of the host mounted read-only), under an unprivileged uid,
+    cgroup cpu/memory/pids limits and a seccomp policy.
+    Much cheaper than a vm, but the isolation is only as good as the host kernel, so use it for trusted courses
+    """
+    _sandbox_dir = '/sandbox'
+    _sandbox_uid = 99999
+
+    def __init__(
+            self,
+            identifier: str | None,
+            code_duration_timeout: int,
+            config: PlaygroundConfig,
+            semaphore: asyncio.Semaphore,
+    ) -> None:
+        self._id = identifier
+        self._code_duration_timeout = code_duration_timeout
+        self._cfg = config
+        self._semaphore = semaphore
+        self._workdir: Path | None = None
+
+    async def __aenter__(self) -> Self:
+        await self._semaphore.acquire()
+        try:
+            self._workdir = Path(tempfile.mkdtemp(prefix=f'playground-{self._id or ""}-'))
+            # sandbox user must be able to write into its home directory
+            self._workdir.chmod(0o777)
+        except Exception:
+            # __aexit__ is not called when entering fails, so the slot is given back here
+            if self._workdir:
+                shutil.rmtree(self._workdir, ignore_errors=True)
+            self._semaphore.release()
+            raise
+        logger.info('Created sandbox dir %s for playground %s', self._workdir, self._id)
+        return self
+
+    async def execute_code(self, code: str, raise_exc_on_err: bool = False) -> tuple[StdOut, StdErr]:
+        (self._workdir / 'main.py').write_text(code)  # type: ignore[operator]
+
+        out, err = b'', b''
+        try:
+            logger.info('Running code in nsjail..')
+            out, err, timed_out = await self._run(['main.py'], timeout=self._code_duration_timeout)
+        except Exception as e:
+            logger.error('Error during code execution: %s', str(e))
+            return StdOut(out.decode()), StdErr(err.decode())
+
+        if timed_out:
+            out_data = StdOut(out.decode() + '\n' + err.decode())
+            err_data = StdErr(f'TimeoutError: your code timed out after {self._code_duration_timeout} seconds')
+        else:
+            out_data, err_data = StdOut(out.decode().strip()), StdErr(err.decode().strip())
+            logger.info('Data: stdout - %s, stderr - %s', out_data, err_data)
+
+        if err_data and raise_exc_on_err:
+            raise CodeIsInvalidError(code=code, out=out_data, err=err_data)
+
+        return out_data, err_data
+
+    async def execute_tests(self, code: str, tests: Sequence[str]) -> CodeWithTestsResult:
+        payload = json.dumps({'code': code, 'tests': list(tests), 'timeout': self._code_duration_timeout})
+        script = f'{_SANDBOX_HARNESS_SOURCE}\nmain({payload!r})\n'
+        (self._workdir / 'harness.py').write_text(script)  # type: ignore[operator]
+
+        logger.info('Running %s tests in nsjail..', len(tests))
+        # every run has its own timeout inside the harness, this one only protects from a stuck harness
+        raw_result, harness_err, _ = await self._run(
+            ['harness.py'],
+            timeout=self._code_duration_timeout * (len(tests) + 1) + 5,
+        )
+        try:
+            result = json.loads(raw_result)
+        except ValueError:
+            logger.error('Tests harness failed in playground %s: %s', self._id, harness_err)
+            raise RuntimeError(f'Tests harness failed: {harness_err.decode()}')
+
+        return CodeWithTestsResult(
+            out=StdOut(result['submission']['out']),
+            err=StdErr(result['submission']['err']),
+            tests=[(StdOut(test['out']), StdErr(test['err'])) for test in result['tests']],
+        )
+
+    async def _run(self, args: list[str], timeout: float) -> tuple[bytes, bytes, bool]:
+        """Run the python with the given args in the jail, returns stdout, stderr and whether it timed out"""
+        process = await asyncio.create_subprocess_exec(
+            *self._nsjail_command(args, timeout),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        # streams are read in separate tasks, so the output written before the timeout is not lost
+        out_task = asyncio.create_task(process.stdout.read())  # type: ignore[union-attr]
+        err_task = asyncio.create_task(process.stderr.read())  # type: ignore[union-attr]
+        _, pending = await asyncio.wait((out_task, err_task), timeout=timeout)
+
+        timed_out = bool(pending)
+        if timed_out:
+            # killing nsjail kills the whole pid namespace of the jailed process
+            process.kill()
+
+        out, err = await out_task, await err_task
+        await process.wait()
+        return out, err, timed_out
+
+    def _nsjail_command(self, args: list[str], timeout: float) -> list[str]:
+        cfg = self._cfg
+        return [
+            cfg.nsjail_path,
+            '--mode', 'o',
+            '--really_quiet',
+            # no --chroot, the root is an empty tmpfs with only the mounts below
+            *(arg for path in self._readonly_mounts() for arg in ('--bindmount_ro', path)),
+            *(arg for device in _DEVICES for arg in ('--bindmount', device)),
+            '--bindmount', f'{self._workdir}:{self._sandbox_dir}',
+            '--tmpfsmount', '/tmp',
+            '--cwd', self._sandbox_dir,
+            '--hostname', 'sandbox',
+            '--user', f'{self._sandbox_uid}:{cfg.sandbox_outside_uid}',
+            '--group', f'{self._sandbox_uid}:{cfg.sandbox_outside_gid}',
+            '--env', f'HOME={self._sandbox_dir}',
+            '--env', 'LANG=C.UTF-8',
+            '--env', 'PYTHONDONTWRITEBYTECODE=1',
+            # hard stop in case the process outlives our own timeout
+            '--time_limit', str(int(timeout) + 1),
+            '--rlimit_fsize', str(cfg.sandbox_max_file_size_mb),
+            '--use_cgroupv2',
+            '--cgroup_mem_max', str(cfg.sandbox_memory_limit_mb * 1024 * 1024),
+            '--cgroup_pids_max', str(cfg.sandbox_pids_limit),
+            '--cgroup_cpu_ms_per_sec', str(cfg.sandbox_cpu_ms_per_sec),
+            '--seccomp_string', _SECCOMP_POLICY,
+            '--',
+            cfg.sandbox_python_path,
+            *args,
+        ]
+
+    def _readonly_mounts(self) -> list[str]:
+        # /lib64 and the like are missing on some distros, nsjail fails on a mount of a missing path
+        return [path for path in self._cfg.sandbox_readonly_mounts if os.path.exists(path)]
+
+    async def __aexit__(self, exc_type: type[Exception], exc_val: Any, exc_tb: str) -> None:
+        if self._workdir:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+        self._semaphore.release()
+
+        if exc_type:
+            logger.error('An error of type %s with val %s occurred: %s', exc_type, exc_val, exc_tb)
+
+
+class NsjailPlaygroundFactory(PlaygroundFactory):
+    def __init__(self, config: PlaygroundConfig) -> None:
+        self._cfg = config
+        self._semaphore = asyncio.Semaphore(config.capacity)
+
+    def create(
+            self,
+            code_duration_timeout: int,
+            identifier: str | None = None,
+            lane: PlaygroundLane = PlaygroundLane.GRADING,
+            user_id: UserID | None = None,
+            course_id: CourseID | None = None,
+    ) -> NsjailPlayground:
+        # submissions are put in order by the PlaygroundScheduler in front of the factory
+        return NsjailPlayground(
+            identifier=identifier,
+            code_duration_timeout=code_duration_timeout,
+            config=self._cfg,
+            semaphore=self._semaphore,
+        )
@@ -0,0 +1,122 @@
+"""
+Test runner which is executed inside the sandbox by the python interpreter found there.
+
+It runs the submission and then every test in a forked child process, so each of them starts
+from a clean interpreter state and has its own timeout, but the interpreter itself starts only once.
+The playground appends a `main(<payload>)` call to this source and pipes it to `python3 -`,
+so the module must not import anything from the project and must stay compatible with the sandbox's python.
+"""
+import json
+import linecache
+import os
+import select
+import signal
+import sys
+import time
+import traceback
+from typing import Any
+
+_READ_CHUNK_SIZE = 65536
+
+
+def _exec_in_child(sources: list[tuple[str, str]], extra_globals: dict[str, Any]) -> None:
+    namespace: dict[str, Any] = {'__name__': '__main__', '__builtins__': __builtins__}
+    try:
+        for index, (filename, source) in enumerate(sources):
+            linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+            if index == len(sources) - 1:
+                namespace.update(extra_globals)
+            exec(compile(source, filename, 'exec'), namespace)
+    except SystemExit as e:
+        if e.code is not None and not isinstance(e.code, int):
+            print(e.code, file=sys.stderr)
+    except BaseException as e:
+        # skip the frame of this function, user is interested only in his code
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next if e.__traceback__ else None)
+
+
+def _run(sources: list[tuple[str, str]], extra_globals: dict[str, Any], timeout: float) -> dict[str, Any]:
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        for fd in (devnull, out_r, out_w, err_r, err_w):
+            os.close(fd)
+        try:
+            _exec_in_child(sources, extra_globals)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(0)
+
+    os.close(out_w)
+    os.close(err_w)
+
+    chunks: dict[int, list[bytes]] = {out_r: [], err_r: []}
+    open_fds = [out_r, err_r]
+    timed_out = False
+    deadline = time.monotonic() + timeout
+    while open_fds:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+
+        ready, _, _ = select.select(open_fds, [], [], remaining)
+        for fd in ready:
+            data = os.read(fd, _READ_CHUNK_SIZE)
+            if data:
+                chunks[fd].append(data)
+            else:
+                open_fds.remove(fd)
+
+    if timed_out:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    os.waitpid(pid, 0)
+    os.close(out_r)
+    os.close(err_r)
+
+    out = b''.join(chunks[out_r]).decode(errors='replace').strip()
+    err = b''.join(chunks[err_r]).decode(errors='replace').strip()
+    if timed_out:
+        return {
+            'out': out + '\n' + err,
+            'err': f'TimeoutError: your code timed out after {timeout:g} seconds',
+        }
+    return {'out': out, 'err': err}
+
+
+def main(payload: str) -> None:
+    data = json.loads(payload)
+    code: str = data['code']
+    timeout: float = data['timeout']
+
+    submission = _run([('main.py', code)], {}, timeout)
+
+    tests_results = []
+    if not submission['err']:
+        for index, test in enumerate(data['tests']):
+            # 'stdout' and 'stderr' variables contain an output of the user's code
+            result = _run(
+                [('main.py', code), (f'test_{index}.py', test)],
+                {'stdout': submission['out'], 'stderr': submission['err']},
+                timeout,
+            )
+            tests_results.append(result)
+            if result['err']:
+                break
+
+    sys.stdout.write(json.dumps({'submission': submission, 'tests': tests_results}))
+    sys.stdout.flush()
@@ -0,0 +1,171 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Mapping, Self, Sequence
+
+from learn_anything.course_platform.adapters.metrics import PLAYGROUND_WAIT_DURATION, PLAYGROUND_WAITERS
+from learn_anything.course_platform.application.ports.playground import Playground, PlaygroundFactory, \
+    PlaygroundLane, StdOut, StdErr, CodeWithTestsResult
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+# waiters of a lane: course -> user -> their submissions, in order of arrival
+_LaneWaiters = OrderedDict[CourseID | None, OrderedDict[UserID | None, deque[asyncio.Future[None]]]]
+
+
+class PlaygroundScheduler:
+    """
+    Hands out the playground slots when all of them are busy.
+    Lanes share the slots by their weights (smooth weighted round-robin), so authors and IDE users
+    are not stuck behind a flood of bot submissions. Inside a lane courses take turns,
+    and inside a course users take turns, so one user or one course can not take the whole lane
+    """
+
+    def __init__(self, capacity: int, weights: Mapping[PlaygroundLane, int]) -> None:
+        self._free = capacity
+        self._weights = {lane: max(weights.get(lane, 1), 1) for lane in PlaygroundLane}
+        self._current_weights = {lane: 0 for lane in PlaygroundLane}
+        self._waiters: dict[PlaygroundLane, _LaneWaiters] = {lane: OrderedDict() for lane in PlaygroundLane}
+        self._waiters_number = {lane: 0 for lane in PlaygroundLane}
+
+    async def acquire(self, lane: PlaygroundLane, user_id: UserID | None, course_id: CourseID | None) -> None:
+        start = time.monotonic()
+        if self._free and not any(self._waiters_number.values()):
+            self._free -= 1
+            PLAYGROUND_WAIT_DURATION.labels(lane=lane).observe(0)
+            return
+
+        slot: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        user_waiters = self._waiters[lane].setdefault(course_id, OrderedDict()).setdefault(user_id, deque())
+        user_waiters.append(slot)
+        self._waiters_number[lane] += 1
+        self._update_metrics()
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # slot was handed over right before the cancellation, pass it on
+                self.release()
+            else:
+                self._forget(lane, user_id, course_id, slot)
+            raise
+
+        PLAYGROUND_WAIT_DURATION.labels(lane=lane).observe(time.monotonic() - start)
+
+    def release(self) -> None:
+        lane = self._next_lane()
+        if lane is None:
+            self._free += 1
+            return
+
+        self._pop_next(lane).set_result(None)
+        self._update_metrics()
+
+    def _next_lane(self) -> PlaygroundLane | None:
+        waiting = [lane for lane in PlaygroundLane if self._waiters_number[lane]]
+        if not waiting:
+            return None
+
+        for lane in waiting:
+            self._current_weights[lane] += self._weights[lane]
+        chosen = max(waiting, key=lambda lane: self._current_weights[lane])
+        self._current_weights[chosen] -= sum(self._weights[lane] for lane in waiting)
+        return chosen
+
+    def _pop_next(self, lane: PlaygroundLane) -> asyncio.Future[None]:
+        courses = self._waiters[lane]
+        course_id, users = next(iter(courses.items()))
+        user_id, user_waiters = next(iter(users.items()))
+
+        slot = user_waiters.popleft()
+        self._waiters_number[lane] -= 1
+
+        # the user and the course go to the end of the line, or leave it if they have nothing more to run
+        users.pop(user_id)
+        if user_waiters:
+            users[user_id] = user_waiters
+        courses.pop(course_id)
+        if users:
+            courses[course_id] = users
+        return slot
+
+    def _forget(
+            self,
+            lane: PlaygroundLane,
+            user_id: UserID | None,
+            course_id: CourseID | None,
+            slot: asyncio.Future[None],
+    ) -> None:
+        users = self._waiters[lane][course_id]
+        users[user_id].remove(slot)
+        self._waiters_number[lane] -= 1
+        if not users[user_id]:
+            del users[user_id]
+        if not users:
+            del self._waiters[lane][course_id]
+        self._update_metrics()
+
+    def _update_metrics(self) -> None:
+        for lane, waiters_number in self._waiters_number.items():
+            PLAYGROUND_WAITERS.labels(lane=lane).set(waiters_number)
+
+
+class ScheduledPlayground(Playground):
+    def __init__(
+            self,
+            playground: Playground,
+            scheduler: PlaygroundScheduler,
+            lane: PlaygroundLane,
+            user_id: UserID | None,
+            course_id: CourseID | None,
+    ) -> None:
+        self._playground = playground
+        self._scheduler = scheduler
+        self._lane = lane
+        self._user_id = user_id
+        self._course_id = course_id
+
+    async def __aenter__(self) -> Self:
+        await self._scheduler.acquire(self._lane, user_id=self._user_id, course_id=self._course_id)
+        try:
+            await self._playground.__aenter__()
+        except BaseException:
+            self._scheduler.release()
+            raise
+        return self
+
+    async def execute_code(self, code: str, raise_exc_on_err: bool = False) -> tuple[StdOut, StdErr]:
+        return await self._playground.execute_code(code=code, raise_exc_on_err=raise_exc_on_err)
+
+    async def execute_tests(self, code: str, tests: Sequence[str]) -> CodeWithTestsResult:
+        return await self._playground.execute_tests(code=code, tests=tests)
+
+    async def __aexit__(self, exc_type: type[Exception], exc_val: Any, exc_tb: str) -> None:
+        try:
+            await self._playground.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._scheduler.release()
+
+
+class ScheduledPlaygroundFactory(PlaygroundFactory):
+    """Lets the submissions into the playground of the wrapped factory in the order chosen by the scheduler"""
+
+    def __init__(self, factory: PlaygroundFactory, scheduler: PlaygroundScheduler) -> None:
+        self._factory = factory
+        self._scheduler = scheduler
+
+    def create(
+            self,
+            code_duration_timeout: int,
+            identifier: str | None = None,
+            lane: PlaygroundLane = PlaygroundLane.GRADING,
+            user_id: UserID | None = None,
+            course_id: CourseID | None = None,
+    ) -> ScheduledPlayground:
+        return ScheduledPlayground(
+            playground=self._factory.create(code_duration_timeout=code_duration_timeout, identifier=identifier),
+            scheduler=self._scheduler,
+            lane=lane,
+            user_id=user_id,
+            course_id=course_id,
+        )
@@ -1,28 +1,34 @@
 import asyncio
+import json
 import os
+import socket
 import subprocess
 import time
 import uuid
 from concurrent.futures.process import ProcessPoolExecutor
-from concurrent.futures.thread import ThreadPoolExecutor
-from functools import partial
+from contextlib import suppress
 from pathlib import Path
 from signal import Signals
-from typing import Self, Any, Optional
+from typing import Self, Any, Optional, Coroutine, Sequence
 
 import paramiko
 from paramiko.common import cMSG_CHANNEL_REQUEST
 
 from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.metrics import VM_POOL_SIZE, VM_POOL_IDLE, VM_POOL_BOOTING, \
+    VM_POOL_WAITERS, VM_BOOT_DURATION
 from learn_anything.course_platform.application.ports.playground import PlaygroundFactory, Playground, StdErr, StdOut, \
-    CodeIsInvalidError
+    CodeIsInvalidError, CodeWithTestsResult, PlaygroundLane
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+_SANDBOX_HARNESS_SOURCE = (Path(__file__).parent / 'sandbox_harness.py').read_text()
+_CHANNEL_READ_CHUNK_SIZE = 65536
 
 
 class UnixPlayground(Playground):
     _playground_base_path: Path = Path('/tmp') / 'playground'
-    _playground_host = '127.0.0.1'
-    _playground_user = 'sandbox'
-    _playground_password = 'sandbox'
+    _signal_grace_period = 1
 
     def __init__(
             self,
@@ -34,102 +40,131 @@ class UnixPlayground(Playground):
         self._code_duration_timeout = code_duration_timeout
         self._vm_pool = vm_pool
         self._vm: VirtualMachineFacade | None = None
-        self._ssh_client = paramiko.SSHClient()
 
     async def __aenter__(self) -> Self:
         await self._create_playground()
         return self
 
     async def _create_playground(self) -> None:
-        loop = asyncio.get_running_loop()
-        
+        # pool hands out vms with an already established ssh connection
         self._vm = await self._vm_pool.acquire()
-
-        self._ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-        with ThreadPoolExecutor(max_workers=4) as th_pool:
-            await loop.run_in_executor(
-                th_pool,
-                partial(
-                    self._ssh_client.connect,
-                    hostname=self._playground_host,
-                    port=self._vm.exposed_ssh_port,
-                    username=self._playground_user,
-                    password=self._playground_password,
-                    banner_timeout=200,
-                )
-            )
-        logger.info('Successfully connected to vm %s via ssh', self._id)
+        logger.info('Acquired vm %s for playground %s', self._vm.id, self._id)
 
     async def execute_code(self, code: str, raise_exc_on_err: bool = False) -> tuple[StdOut, StdErr]:
-        loop = asyncio.get_running_loop()
-
-        with ThreadPoolExecutor() as th_pool:
-            out, err = await loop.run_in_executor(
-                th_pool,
-                self._execute_code,
-                code
-            )
-            if err and raise_exc_on_err:
-                raise CodeIsInvalidError(code=code, out=out, err=err)
-
-        return out, err
-
-    def _execute_code(self, code: str) -> tuple[StdOut, StdErr]:
         out, err = b'', b''
         try:
             logger.info('Sending command..')
-
-            double_quote = "\""
-            escaped_double_quote = '\\' + double_quote
-
-            stdin, stdout, stderr = self._ssh_client.exec_command(
-                f'echo -e "{code.replace(double_quote, escaped_double_quote)}" > main.py && python3 main.py',
-            )
-
-            start = time.time()
-            while time.time() - start < self._code_duration_timeout + 1:
-                if stdin.channel.exit_status_ready():
-                    out_data = stdout.read().decode().strip()
-                    err_data = stderr.read().decode().strip()
-
-                    logger.warning('Data: stdout - %s, stderr - %s', out_data, err_data)
-                    return (
-                        StdOut(out_data),
-                        StdErr(err_data)
-                    )
-                time.sleep(0.5)
-
-            message = paramiko.Message()
-            message.add_byte(cMSG_CHANNEL_REQUEST)
-            message.add_int(stdin.channel.remote_chanid)
-            message.add_string("signal")
-            message.add_boolean(False)
-            message.add_string(Signals.SIGINT.name[3:])
-            stdin.channel.transport._send_user_message(message)  # type: ignore[union-attr]
-
-            logger.info('Sent SIGINT to stdin channel')
-
-            out = stdout.read()
-            err = stderr.read()
-            raise TimeoutError
-        except TimeoutError:
-            return (
-                StdOut(out.decode() + '\n' + err.decode()),
-                StdErr(f'TimeoutError: your code timed out after {self._code_duration_timeout} seconds')
+            out, err, timed_out = await self._run_command(
+                command='cat > main.py && python3 main.py',
+                stdin_data=code,
+                timeout=self._code_duration_timeout,
             )
         except Exception as e:
             logger.error('Error during code execution: %s', str(e))
-
-        return (
-            StdOut(out.decode()),
-            StdErr(err.decode())
+            return StdOut(out.decode()), StdErr(err.decode())
+
+        if timed_out:
+            out_data = StdOut(out.decode() + '\n' + err.decode())
+            err_data = StdErr(f'TimeoutError: your code timed out after {self._code_duration_timeout} seconds')
+        else:
+            out_data, err_data = StdOut(out.decode().strip()), StdErr(err.decode().strip())
+            logger.info('Data: stdout - %s, stderr - %s', out_data, err_data)
+
+        if err_data and raise_exc_on_err:
+            raise CodeIsInvalidError(code=code, out=out_data, err=err_data)
+
+        return out_data, err_data
+
+    async def execute_tests(self, code: str, tests: Sequence[str]) -> CodeWithTestsResult:
+        payload = json.dumps({'code': code, 'tests': list(tests), 'timeout': self._code_duration_timeout})
+        script = f'{_SANDBOX_HARNESS_SOURCE}\nmain({payload!r})\n'
+
+        logger.info('Sending %s tests to the harness..', len(tests))
+        # every run has its own timeout inside the harness, this one only protects from a stuck vm
+        raw_result, harness_err, timed_out = await self._run_command(
+            command='python3 -',
+            stdin_data=script,
+            timeout=self._code_duration_timeout * (len(tests) + 1) + 5,
+        )
+        try:
+            result = json.loads(raw_result)
+        except ValueError:
+            logger.error('Tests harness failed on vm %s: %s', self._vm.id, harness_err)  # type: ignore[union-attr]
+            raise RuntimeError(f'Tests harness failed: {harness_err.decode()}')
+
+        return CodeWithTestsResult(
+            out=StdOut(result['submission']['out']),
+            err=StdErr(result['submission']['err']),
+            tests=[(StdOut(test['out']), StdErr(test['err'])) for test in result['tests']],
         )
 
-    async def __aexit__(self, exc_type: type[Exception], exc_val: Any, exc_tb: str) -> None:
-        with ThreadPoolExecutor(max_workers=3) as th_pool:
-            th_pool.submit(self._ssh_client.close)
+    async def _run_command(self, command: str, stdin_data: str, timeout: float) -> tuple[bytes, bytes, bool]:
+        """Run the command on the vm, returns its stdout, stderr and whether it was interrupted by timeout"""
+        loop = asyncio.get_running_loop()
+        channel = await loop.run_in_executor(None, self._open_channel, command, stdin_data)
 
+        out_chunks: list[bytes] = []
+        err_chunks: list[bytes] = []
+        timed_out = False
+
+        # paramiko signals through this fd whenever channel gets new data or eof,
+        # so the loop is woken up right when the remote process writes something or exits
+        data_arrived = asyncio.Event()
+        loop.add_reader(channel.fileno(), data_arrived.set)
+        try:
+            deadline = loop.time() + timeout
+            while not self._drain_channel(channel, out_chunks, err_chunks):
+                data_arrived.clear()
+                try:
+                    await asyncio.wait_for(data_arrived.wait(), timeout=deadline - loop.time())
+                except TimeoutError:
+                    timed_out = True
+                    break
+
+            if timed_out:
+                self._send_signal(channel, Signals.SIGINT)
+                logger.info('Sent SIGINT to the channel')
+
+                # give the process a moment to flush its output and exit
+                grace_deadline = loop.time() + self._signal_grace_period
+                while not self._drain_channel(channel, out_chunks, err_chunks) and loop.time() < grace_deadline:
+                    data_arrived.clear()
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(data_arrived.wait(), timeout=grace_deadline - loop.time())
+        finally:
+            loop.remove_reader(channel.fileno())
+            channel.close()
+
+        return b''.join(out_chunks), b''.join(err_chunks), timed_out
+
+    def _open_channel(self, command: str, stdin_data: str) -> paramiko.Channel:
+        channel = self._vm.ssh_client.get_transport().open_session()  # type: ignore[union-attr]
+        channel.exec_command(command)
+        channel.sendall(stdin_data.encode())
+        channel.shutdown_write()
+        channel.setblocking(False)
+        return channel
+
+    @staticmethod
+    def _drain_channel(channel: paramiko.Channel, out_chunks: list[bytes], err_chunks: list[bytes]) -> bool:
+        """Read everything available in the channel, returns True when remote side has closed its output"""
+        while channel.recv_ready():
+            out_chunks.append(channel.recv(_CHANNEL_READ_CHUNK_SIZE))
+        while channel.recv_stderr_ready():
+            err_chunks.append(channel.recv_stderr(_CHANNEL_READ_CHUNK_SIZE))
+        return channel.eof_received or channel.closed
+
+    @staticmethod
+    def _send_signal(channel: paramiko.Channel, signal: Signals) -> None:
+        message = paramiko.Message()
+        message.add_byte(cMSG_CHANNEL_REQUEST)
+        message.add_int(channel.remote_chanid)
+        message.add_string("signal")
+        message.add_boolean(False)
+        message.add_string(signal.name[3:])
+        channel.transport._send_user_message(message)  # type: ignore[union-attr]
+
+    async def __aexit__(self, exc_type: type[Exception], exc_val: Any, exc_tb: str) -> None:
         if self._vm:
             await self._vm_pool.release(self._vm)
 
@@ -143,11 +178,38 @@ class VirtualMachineFacade:
     create_vm_script_path = os.path.join('/etc', 'learn_anything', 'scripts', 'create_qemu_vm.sh')
     get_free_port_script_path = os.path.join('/etc', 'learn_anything', 'scripts', 'get_available_port.sh')
 
+    ssh_host = '127.0.0.1'
+    ssh_user = 'sandbox'
+    ssh_password = 'sandbox'
+    ssh_connect_timeout = 200
+    ssh_keepalive_interval = 15
+    reset_timeout = 10
+
+    # kills every sandbox process except the current ssh session, wipes everything the user code
+    # could have left in writable places and restores the default home contents
+    _reset_command = (
+        'ps -u "$(id -u)" -o sid=,pid= '
+        '| awk -v s="$(ps -o sid= -p $$ | tr -d \' \')" -v p="$PPID" \'$1 != s && $2 != p {print $2}\' '
+        '| xargs -r kill -KILL; '
+        'find "$HOME" -mindepth 1 -delete; '
+        'find /tmp /var/tmp /dev/shm -mindepth 1 -user "$(id -u)" -delete 2>/dev/null; '
+        'cp -a /etc/skel/. "$HOME"/ 2>/dev/null; '
+        'echo ok'
+    )
+
     def __init__(self, id_: Optional[str] = None, disk_image_path: Optional[str] = None, port: Optional[int] = None):
         self._id = id_ or str(uuid.uuid4())
         self._vm_pid: int | None = None
         self._disk_image_path = disk_image_path
         self._port = port
+        self._uses = 0
+        self._ssh_client: paramiko.SSHClient | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the facade is sent between processes, ssh connection is established in the pool's one
+        state = self.__dict__.copy()
+        state['_ssh_client'] = None
+        return state
 
     def create(self) -> Self:
         if self._disk_image_path is None:
@@ -182,12 +244,85 @@ class VirtualMachineFacade:
         self._vm_pid = create_vm_ps.pid
         return self
 
+    @property
+    def id(self) -> str:
+        return self._id
+
     @property
     def exposed_ssh_port(self) -> int:
         if not self._port:
             return -1
         return self._port
 
+    @property
+    def uses(self) -> int:
+        return self._uses
+
+    def mark_used(self) -> None:
+        self._uses += 1
+
+    @property
+    def ssh_client(self) -> paramiko.SSHClient | None:
+        return self._ssh_client
+
+    @property
+    def ssh_is_alive(self) -> bool:
+        if self._ssh_client is None:
+            return False
+
+        transport = self._ssh_client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def connect(self) -> None:
+        """(Re)establish the long-lived ssh connection, waiting for the vm's sshd to come up"""
+        self.disconnect()
+
+        deadline = time.monotonic() + self.ssh_connect_timeout
+        while True:
+            ssh_client = paramiko.SSHClient()
+            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            try:
+                ssh_client.connect(
+                    hostname=self.ssh_host,
+                    port=self.exposed_ssh_port,
+                    username=self.ssh_user,
+                    password=self.ssh_password,
+                    banner_timeout=self.ssh_connect_timeout,
+                )
+                break
+            except (paramiko.SSHException, OSError):
+                ssh_client.close()
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+        ssh_client.get_transport().set_keepalive(self.ssh_keepalive_interval)  # type: ignore[union-attr]
+        self._ssh_client = ssh_client
+        logger.info('Successfully connected to vm %s via ssh', self._id)
+
+    def disconnect(self) -> None:
+        if self._ssh_client is not None:
+            self._ssh_client.close()
+            self._ssh_client = None
+
+    def reset(self) -> bool:
+        """Bring vm back to a clean state without rebooting it. Returns False if vm is not healthy"""
+        try:
+            if not self.ssh_is_alive:
+                self.connect()
+
+            _, stdout, _ = self._ssh_client.exec_command(  # type: ignore[union-attr]
+                self._reset_command,
+                timeout=self.reset_timeout,
+            )
+            out = stdout.read().decode().strip()
+            exit_code = stdout.channel.recv_exit_status()
+        except Exception as e:
+            logger.error('Error during reset of vm %s: %s', self._id, str(e))
+            return False
+
+        return exit_code == 0 and out == 'ok'
+
     def _init_disk_image(self) -> str:
         if not os.path.exists(self.base_disk_image_path):
             logger.error('Base disk image not found at %s', self.base_disk_image_path)
@@ -218,6 +353,7 @@ class VirtualMachineFacade:
         return image_path
 
     def delete(self) -> None:
+        # runs in a child process where the facade has no ssh connection, disconnect() it before
         if not self._vm_pid:
             raise Exception('There is nothing to delete')
 
@@ -240,49 +376,220 @@ class VirtualMachineFacade:
         return int(out.decode().strip())
 
 
+def _port_is_free(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(('127.0.0.1', port))
+        except OSError:
+            return False
+    return True
+
+
 class VirtualMachinePool:
-    def __init__(self, size: int = 3):
-        self._size = size
-        self._queue: asyncio.Queue[VirtualMachineFacade] = asyncio.Queue(maxsize=size)
+    _base_port = 16998
+    _idle_check_interval = 10
+
+    def __init__(
+            self,
+            min_size: int = 3,
+            max_size: int = 3,
+            vm_max_uses: int = 1,
+            vm_idle_timeout: int = 300,
+    ):
+        self._min_size = min_size
+        self._max_size = max(min_size, max_size)
+        self._vm_max_uses = vm_max_uses
+        self._vm_idle_timeout = vm_idle_timeout
+        self._queue: asyncio.Queue[VirtualMachineFacade] = asyncio.Queue()
         self._loop = asyncio.get_running_loop()
-        self._lock = asyncio.Lock()
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        self._shrink_task: asyncio.Task[None] | None = None
+
+        # all vms owned by the pool, including booting and recycling ones
+        self._size = 0
+        self._booting = 0
+        self._recycling = 0
+        self._waiters = 0
+        self._reserved_ports: set[int] = set()
+        self._idle_since: dict[str, float] = {}
 
     async def initialize(self) -> None:
-        logger.info(f"Initializing VM pool with {self._size} VMs...")
-        tasks = [self._create_and_put() for _ in range(self._size)]
-        await asyncio.gather(*tasks)
+        logger.info(f"Initializing VM pool with {self._min_size} VMs (up to {self._max_size})...")
+        await asyncio.gather(*[self._grow() for _ in range(self._min_size)])
+        self._shrink_task = asyncio.create_task(self._shrink_idle())
         logger.info("VM pool initialized.")
 
+    async def acquire(self) -> VirtualMachineFacade:
+        while True:
+            vm = await self._get()
+            if vm.ssh_is_alive:
+                return vm
+
+            try:
+                await self._loop.run_in_executor(None, vm.connect)
+                return vm
+            except Exception as e:
+                logger.warning('Lost ssh connection to VM %s and failed to reconnect: %s', vm.id, e)
+                self._spawn(self._recreate_vm(vm))
+
+    async def _get(self) -> VirtualMachineFacade:
+        # every waiter which is not going to be served by a booting or recycling vm boots a new one
+        if (
+                self._queue.empty()
+                and self._size < self._max_size
+                and self._waiters >= self._booting + self._recycling
+        ):
+            self._grow()
+
+        self._waiters += 1
+        self._update_metrics()
+        try:
+            vm = await self._queue.get()
+        finally:
+            self._waiters -= 1
+            self._update_metrics()
+
+        self._idle_since.pop(vm.id, None)
+        return vm
+
+    async def release(self, vm: VirtualMachineFacade) -> None:
+        self._spawn(self._recycle_vm(vm))
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> asyncio.Task[None]:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _grow(self) -> asyncio.Task[None]:
+        self._size += 1
+        self._booting += 1
+        self._update_metrics()
+        return self._spawn(self._create_and_put())
+
     async def _create_and_put(self) -> None:
-        async with self._lock:
+        try:
+            vm = await self._boot_vm()
+        except Exception as e:
+            logger.error(f"Error creating VM for pool: {e}")
+            self._size -= 1
+            return
+        finally:
+            self._booting -= 1
+            self._update_metrics()
+
+        self._put(vm)
+
+    async def _boot_vm(self) -> VirtualMachineFacade:
+        port = self._reserve_port()
+        start = time.monotonic()
+        try:
             with ProcessPoolExecutor() as ps_pool:
-                vm = await self._loop.run_in_executor(ps_pool, VirtualMachineFacade().create)
-            await asyncio.sleep(4)
-        await self._queue.put(vm)
+                vm = await self._loop.run_in_executor(ps_pool, VirtualMachineFacade(port=port).create)
+        except Exception:
+            self._reserved_ports.discard(port)
+            raise
 
-    async def acquire(self) -> VirtualMachineFacade:
-        return await self._queue.get()
+        try:
+            # also waits until the vm has booted
+            await self._loop.run_in_executor(None, vm.connect)
+        except Exception:
+            await self._destroy_vm(vm)
+            raise
+
+        VM_BOOT_DURATION.observe(time.monotonic() - start)
+        return vm
+
+    def _reserve_port(self) -> int:
+        port = self._base_port
+        while port in self._reserved_ports or not _port_is_free(port):
+            port += 1
+        self._reserved_ports.add(port)
+        return port
+
+    def _put(self, vm: VirtualMachineFacade) -> None:
+        self._idle_since[vm.id] = time.monotonic()
+        self._queue.put_nowait(vm)
+        self._update_metrics()
+
+    async def _recycle_vm(self, vm: VirtualMachineFacade) -> None:
+        vm.mark_used()
+        if vm.uses < self._vm_max_uses:
+            self._recycling += 1
+            try:
+                is_healthy = await self._loop.run_in_executor(None, vm.reset)
+            finally:
+                self._recycling -= 1
 
-    async def release(self, vm: VirtualMachineFacade) -> None:
-        asyncio.create_task(self._recreate_vm(vm))
+            if is_healthy:
+                self._put(vm)
+                return
+            logger.warning('VM %s failed health check after reset, recreating it', vm.id)
+
+        await self._recreate_vm(vm)
 
     async def _recreate_vm(self, vm: VirtualMachineFacade) -> None:
+        await self._destroy_vm(vm)
+
+        if self._size > self._min_size and not self._waiters:
+            self._size -= 1
+            self._update_metrics()
+            return
+
+        self._booting += 1
+        await self._create_and_put()
+
+    async def _destroy_vm(self, vm: VirtualMachineFacade) -> None:
+        # the connection lives in this process only, the pickled copy sent to the process pool has none
+        vm.disconnect()
         try:
             with ProcessPoolExecutor() as ps_pool:
                 await self._loop.run_in_executor(ps_pool, vm.delete)
-            await self._create_and_put()
         except Exception as e:
-            logger.error(f"Error recreating VM for pool: {e}")
+            logger.error(f"Error deleting VM {vm.id}: {e}")
+        self._reserved_ports.discard(vm.exposed_ssh_port)
+        self._idle_since.pop(vm.id, None)
+
+    async def _shrink_idle(self) -> None:
+        while True:
+            await asyncio.sleep(self._idle_check_interval)
+            for vm in self._take_expired_idle_vms():
+                logger.info('VM %s has been idle for too long, removing it from the pool', vm.id)
+                await self._destroy_vm(vm)
+
+    def _take_expired_idle_vms(self) -> list[VirtualMachineFacade]:
+        now = time.monotonic()
+        expired: list[VirtualMachineFacade] = []
+
+        # the queue is fifo, so the longest idle vms come first
+        for _ in range(self._queue.qsize()):
+            vm = self._queue.get_nowait()
+            idle_for = now - self._idle_since.get(vm.id, now)
+            if self._size - len(expired) > self._min_size and idle_for > self._vm_idle_timeout:
+                expired.append(vm)
+            else:
+                self._queue.put_nowait(vm)
+
+        self._size -= len(expired)
+        self._update_metrics()
+        return expired
+
+    def _update_metrics(self) -> None:
+        VM_POOL_SIZE.set(self._size)
+        VM_POOL_IDLE.set(self._queue.qsize())
+        VM_POOL_BOOTING.set(self._booting)
+        VM_POOL_WAITERS.set(self._waiters)
 
     async def close(self) -> None:
         logger.info("Closing VM pool, destroying VMs...")
+        if self._shrink_task:
+            self._shrink_task.cancel()
+
         while not self._queue.empty():
             vm = self._queue.get_nowait()
-            try:
-                with ProcessPoolExecutor() as ps_pool:
-                    await self._loop.run_in_executor(ps_pool, vm.delete)
-            except Exception as e:
-                logger.error(f"Error deleting VM during pool close: {e}")
+            await self._destroy_vm(vm)
+            self._size -= 1
+        self._update_metrics()
 
 
 class UnixPlaygroundFactory(PlaygroundFactory):
@@ -293,7 +600,11 @@ class UnixPlaygroundFactory(PlaygroundFactory):
             self,
             code_duration_timeout: int,
             identifier: str | None = None,
+            lane: PlaygroundLane = PlaygroundLane.GRADING,
+            user_id: UserID | None = None,
+            course_id: CourseID | None = None,
     ) -> UnixPlayground:
+        # submissions are put in order by the PlaygroundScheduler in front of the factory
         return UnixPlayground(
             identifier=identifier,
             code_duration_timeout=code_duration_timeout,
@@ -7,6 +7,10 @@ import toml
 class RedisConfig:
     host: str = "localhost"
     port: int = 6379
+    # connections shared by every redis user of the process
+    max_connections: int = 50
+    # seconds to wait for a free connection when all of them are in use
+    pool_timeout: int = 5
 
     @property
     def dsn(self) -> str:
@@ -19,3 +23,39 @@ def load_redis_config(config_path: str) -> RedisConfig:
 
     config = RedisConfig(**data)
     return config
+
+
+@dataclass
+class RateLimitConfig:
+    # submissions of code are limited by token buckets: "burst" submissions can be sent at once,
+    # then the bucket is refilled by "per_minute" submissions a minute. 0 per minute disables the limit
+    user_submissions_burst: int = 5
+    user_submissions_per_minute: float = 6
+    course_submissions_burst: int = 100
+    course_submissions_per_minute: float = 300
+
+
+def load_rate_limit_config(config_path: str) -> RateLimitConfig:
+    with open(config_path, "r") as config_file:
+        data = toml.load(config_file).get('rate_limit', {})
+
+    config = RateLimitConfig(**data)
+    return config
+
+
+@dataclass
+class TaskCacheConfig:
+    # tasks kept in memory of every process; they are dropped on change,
+    # local_ttl only limits staleness if an invalidation message is missed
+    local_max_size: int = 1024
+    local_ttl: int = 60
+    # lifetime of the tasks in redis shared by all processes
+    ttl: int = 3600
+
+
+def load_task_cache_config(config_path: str) -> TaskCacheConfig:
+    with open(config_path, "r") as config_file:
+        data = toml.load(config_file).get('task_cache', {})
+
+    config = TaskCacheConfig(**data)
+    return config
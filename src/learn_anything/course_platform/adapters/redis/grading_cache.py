@@ -0,0 +1,41 @@
+import json
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.metrics import GRADING_CACHE_REQUESTS
+from learn_anything.course_platform.application.ports.grading_cache import GradingCache, GradingResult
+
+
+class RedisGradingCache(GradingCache):
+    _key_prefix = 'grading_cache'
+
+    def __init__(self, redis_client: aioredis.Redis, ttl: int) -> None:  # type: ignore[type-arg]
+        self._redis = redis_client
+        self._ttl = ttl
+
+    async def get(self, key: str) -> GradingResult | None:
+        try:
+            raw_result = await self._redis.get(f'{self._key_prefix}:{key}')
+        except RedisError as e:
+            # cache is only an optimization, submission is graded in the playground if it is unavailable
+            logger.warning('Failed to read grading cache: %s', e)
+            return None
+
+        if raw_result is None:
+            GRADING_CACHE_REQUESTS.labels(result='miss').inc()
+            return None
+
+        GRADING_CACHE_REQUESTS.labels(result='hit').inc()
+        return GradingResult(**json.loads(raw_result))
+
+    async def set(self, key: str, result: GradingResult) -> None:
+        try:
+            await self._redis.set(
+                f'{self._key_prefix}:{key}',
+                json.dumps({'output': result.output, 'failed_test_idx': result.failed_test_idx}),
+                ex=self._ttl,
+            )
+        except RedisError as e:
+            logger.warning('Failed to write grading cache: %s', e)
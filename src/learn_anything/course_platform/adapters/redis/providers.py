@@ -0,0 +1,47 @@
+from typing import AsyncGenerator
+
+import redis.asyncio as aioredis
+
+from learn_anything.course_platform.adapters.metrics import REDIS_POOL_CONNECTIONS_IN_USE, \
+    REDIS_POOL_CONNECTIONS_IDLE, REDIS_POOL_MAX_CONNECTIONS
+from learn_anything.course_platform.adapters.redis.config import RedisConfig, RateLimitConfig, TaskCacheConfig
+from learn_anything.course_platform.adapters.redis.rate_limiter import RedisSubmissionRateLimiter
+from learn_anything.course_platform.adapters.redis.task_cache import TaskCache
+from learn_anything.course_platform.application.ports.rate_limiter import SubmissionRateLimiter
+
+
+async def get_redis_connection_pool(redis_cfg: RedisConfig) -> AsyncGenerator[aioredis.ConnectionPool, None]:
+    pool = aioredis.BlockingConnectionPool.from_url(
+        redis_cfg.dsn,
+        max_connections=redis_cfg.max_connections,
+        timeout=redis_cfg.pool_timeout,
+        decode_responses=True,
+    )
+
+    REDIS_POOL_MAX_CONNECTIONS.set(redis_cfg.max_connections)
+    REDIS_POOL_CONNECTIONS_IN_USE.set_function(lambda: len(pool._in_use_connections))
+    REDIS_POOL_CONNECTIONS_IDLE.set_function(lambda: len(pool._available_connections))
+
+    yield pool
+    await pool.aclose()
+
+
+async def get_redis_client(pool: aioredis.ConnectionPool) -> aioredis.Redis:  # type: ignore[type-arg]
+    return aioredis.Redis(connection_pool=pool)
+
+
+async def get_submission_rate_limiter(
+        redis_client: aioredis.Redis,  # type: ignore[type-arg]
+        rate_limit_cfg: RateLimitConfig,
+) -> SubmissionRateLimiter:
+    return RedisSubmissionRateLimiter(redis_client=redis_client, config=rate_limit_cfg)
+
+
+async def get_task_cache(
+        redis_client: aioredis.Redis,  # type: ignore[type-arg]
+        task_cache_cfg: TaskCacheConfig,
+) -> AsyncGenerator[TaskCache, None]:
+    task_cache = TaskCache(redis_client=redis_client, config=task_cache_cfg)
+    await task_cache.start()
+    yield task_cache
+    await task_cache.close()
@@ -0,0 +1,83 @@
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.metrics import SUBMISSIONS_RATE_LIMITED
+from learn_anything.course_platform.adapters.redis.config import RateLimitConfig
+from learn_anything.course_platform.application.ports.rate_limiter import SubmissionRateLimiter
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+# Takes a token from every bucket in KEYS, but only if all of them have one, so a rejected submission
+# does not waste the quota of the others. ARGV holds capacity and refill rate (tokens a second) of every bucket.
+# Returns seconds until the submission would be allowed, as a string to keep the fraction
+_TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tokens = {}
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if available < 1 then
+        retry_after = math.max(retry_after, (1 - available) / rate)
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local available = tokens[i]
+    if retry_after == 0 then
+        available = available - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(available), 'ts', tostring(now))
+    -- a full bucket is the same as no bucket
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+
+return tostring(retry_after)
+"""
+
+
+class RedisSubmissionRateLimiter(SubmissionRateLimiter):
+    _key_prefix = 'rate_limit:submissions'
+
+    def __init__(self, redis_client: aioredis.Redis, config: RateLimitConfig) -> None:  # type: ignore[type-arg]
+        self._redis = redis_client
+        self._cfg = config
+        self._script = redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, user_id: UserID, course_id: CourseID) -> float:
+        keys: list[str] = []
+        args: list[float] = []
+        for key, burst, per_minute in (
+                (f'{self._key_prefix}:user:{user_id}', self._cfg.user_submissions_burst,
+                 self._cfg.user_submissions_per_minute),
+                (f'{self._key_prefix}:course:{course_id}', self._cfg.course_submissions_burst,
+                 self._cfg.course_submissions_per_minute),
+        ):
+            if per_minute <= 0:
+                continue
+            keys.append(key)
+            args.extend((max(burst, 1), per_minute / 60))
+
+        if not keys:
+            return 0
+
+        try:
+            retry_after = float(await self._script(keys=keys, args=args))
+        except RedisError as e:
+            # limiter only protects the playground, submissions are not rejected because of it being unavailable
+            logger.warning('Failed to check submissions rate limit: %s', e)
+            return 0
+
+        if retry_after:
+            SUBMISSIONS_RATE_LIMITED.inc()
+        return retry_after
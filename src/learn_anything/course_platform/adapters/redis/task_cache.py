@@ -0,0 +1,201 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Iterable, Coroutine
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.metrics import TASK_CACHE_REQUESTS
+from learn_anything.course_platform.adapters.redis.config import TaskCacheConfig
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.task.enums import TaskType
+from learn_anything.course_platform.domain.entities.task.models import CodeTask, PollTask, TaskID, CodeTaskTest, \
+    PollTaskOption, PollTaskOptionID
+
+CachedTask = CodeTask | PollTask
+
+TASK_CACHE_INVALIDATION_CHANNEL = 'task_cache_invalidations'
+
+# task is written only if its version has not been bumped since the caller read it,
+# so a task loaded from the db right before a change can not get into the cache after it
+_SET_IF_VERSION_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], 'version') or '0'
+if version ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'version', version, 'data', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class TaskCache:
+    """
+    Read-through cache of code and poll tasks: an LRU in the process in front of redis shared by all processes.
+    Every task has a version in redis, changing the task bumps it and tells every process
+    to drop its local copy through pub/sub. Local copies also expire on their own in case a message was missed
+    """
+    _key_prefix = 'task_cache'
+    _reconnect_delay = 1
+
+    def __init__(self, redis_client: aioredis.Redis, config: TaskCacheConfig) -> None:  # type: ignore[type-arg]
+        self._redis = redis_client
+        self._max_size = config.local_max_size
+        self._ttl = config.ttl
+        self._local_ttl = config.local_ttl
+        self._set_if_version = redis_client.register_script(_SET_IF_VERSION_SCRIPT)
+
+        # task id -> (version, raw task, expiration time)
+        self._local: OrderedDict[TaskID, tuple[str, str, float]] = OrderedDict()
+        self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        self._listen_task: asyncio.Task[None] | None = None
+        self._background_tasks: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        await self._pubsub.subscribe(TASK_CACHE_INVALIDATION_CHANNEL)
+        self._listen_task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self._listen_task:
+            self._listen_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listen_task
+        await self._pubsub.aclose()
+
+    async def get(self, task_id: TaskID) -> tuple[CachedTask | None, str]:
+        """
+        Returns a fresh copy of the cached task and its version.
+        On a miss the version must be passed to set() together with the task loaded from the db
+        """
+        local = self._local.get(task_id)
+        if local is not None and local[2] > time.monotonic():
+            self._local.move_to_end(task_id)
+            TASK_CACHE_REQUESTS.labels(result='local_hit').inc()
+            return _load_task(local[1]), local[0]
+
+        try:
+            version, raw_task = await self._redis.hmget(self._key(task_id), ['version', 'data'])
+        except RedisError as e:
+            # the version is unknown, so whatever is loaded from the db must not be cached
+            logger.warning('Failed to read task cache: %s', e)
+            return None, ''
+
+        version = version or '0'
+        if raw_task is None:
+            TASK_CACHE_REQUESTS.labels(result='miss').inc()
+            return None, version
+
+        TASK_CACHE_REQUESTS.labels(result='redis_hit').inc()
+        self._put_local(task_id, version, raw_task)
+        return _load_task(raw_task), version
+
+    async def set(self, task: CachedTask, version: str) -> None:
+        if not version:
+            return
+
+        raw_task = _dump_task(task)
+        try:
+            is_set = await self._set_if_version(keys=[self._key(task.id)], args=[version, raw_task, self._ttl])
+        except RedisError as e:
+            logger.warning('Failed to write task cache: %s', e)
+            return
+
+        if is_set:
+            self._put_local(task.id, version, raw_task)
+
+    async def invalidate(self, task_ids: Iterable[TaskID]) -> None:
+        task_ids = set(task_ids)
+        if not task_ids:
+            return
+
+        self._drop_local(task_ids)
+        await self._bump_versions(task_ids)
+
+    def invalidate_soon(self, task_ids: Iterable[TaskID]) -> None:
+        """
+        For sync code running in the event loop, like sqlalchemy session events.
+        The local copies are dropped right away, only redis is updated in the background
+        """
+        task_ids = set(task_ids)
+        if not task_ids:
+            return
+
+        self._drop_local(task_ids)
+        self._spawn(self._bump_versions(task_ids))
+
+    async def _bump_versions(self, task_ids: Iterable[TaskID]) -> None:
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for task_id in task_ids:
+                    pipe.hincrby(self._key(task_id), 'version', 1)
+                    pipe.hdel(self._key(task_id), 'data')
+                    pipe.expire(self._key(task_id), self._ttl)
+                pipe.publish(TASK_CACHE_INVALIDATION_CHANNEL, ','.join(map(str, task_ids)))
+                await pipe.execute()
+        except RedisError as e:
+            # other processes keep their local copies until those expire
+            logger.error('Failed to invalidate tasks %s in cache: %s', task_ids, e)
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _put_local(self, task_id: TaskID, version: str, raw_task: str) -> None:
+        self._local[task_id] = (version, raw_task, time.monotonic() + self._local_ttl)
+        self._local.move_to_end(task_id)
+        while len(self._local) > self._max_size:
+            self._local.popitem(last=False)
+
+    def _drop_local(self, task_ids: Iterable[TaskID]) -> None:
+        for task_id in task_ids:
+            self._local.pop(task_id, None)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message['type'] == 'message':
+                        self._drop_local(TaskID(int(task_id)) for task_id in message['data'].split(','))
+            except RedisError as e:
+                # changes made while disconnected are missed, so nothing local can be trusted anymore
+                logger.warning('Task cache invalidations subscription failed, reconnecting: %s', e)
+                self._local.clear()
+                await asyncio.sleep(self._reconnect_delay)
+
+    def _key(self, task_id: TaskID) -> str:
+        return f'{self._key_prefix}:{task_id}'
+
+
+def _dump_task(task: CachedTask) -> str:
+    data = asdict(task)
+    data['created_at'] = task.created_at.isoformat()
+    data['updated_at'] = task.updated_at.isoformat()
+    return json.dumps(data)
+
+
+def _load_task(raw_task: str) -> CachedTask:
+    data = json.loads(raw_task)
+    data['id'] = TaskID(data['id'])
+    data['type'] = TaskType(data['type'])
+    data['course_id'] = CourseID(data['course_id'])
+    data['created_at'] = datetime.fromisoformat(data['created_at'])
+    data['updated_at'] = datetime.fromisoformat(data['updated_at'])
+
+    if data['type'] == TaskType.CODE:
+        data['tests'] = [CodeTaskTest(**test) for test in data['tests']]
+        return CodeTask(**data)
+
+    data['options'] = [
+        PollTaskOption(id=PollTaskOptionID(option['id']), content=option['content'], is_correct=option['is_correct'])
+        for option in data['options']
+    ]
+    return PollTask(**data)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import toml
 
@@ -10,6 +10,18 @@ class RMQConfig:
     user: str
     password: str
     pool_size: int = 10
+    # must be the same as in the api_gateway config
+    tg_updates_shards: int = 8
+    # shards of telegram updates consumed by this instance, empty means all of them.
+    # every shard is processed by one instance at a time, others take it over if that one goes down
+    tg_updates_consumed_shards: list[int] = field(default_factory=list)
+    # number of telegram updates processed at the same time
+    tg_updates_concurrency: int = 10
+    # failed update is retried this number of times with a delay in seconds, then moved to the dead letter queue
+    tg_updates_max_retries: int = 5
+    tg_updates_retry_delay: float = 5
+    # number of ide submissions processed at the same time, 0 means as many as the playground can run
+    ide_submissions_concurrency: int = 0
 
     @property
     def uri(self) -> str:
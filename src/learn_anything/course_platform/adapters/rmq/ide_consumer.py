@@ -4,9 +4,9 @@ Reads code submission from RMQ, runs it through the interactor, writes result to
 """
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
+from functools import partial
 from typing import cast
 
 import msgpack
@@ -14,17 +14,17 @@ import redis.asyncio as aioredis
 from aio_pika.abc import AbstractIncomingMessage
 from dishka import AsyncContainer
 
-from learn_anything.course_platform.adapters.rmq.ide_submissions import IDE_SUBMISSIONS_QUEUE, IDE_RESULT_TTL
+from learn_anything.course_platform.adapters.rmq.ide_submissions import (
+    IDE_SUBMISSIONS_QUEUE,
+    IDE_RESULT_TTL,
+    code_task_from_snapshot,
+    ide_result_key,
+    ide_result_channel,
+)
+from learn_anything.course_platform.adapters.rmq.worker_pool import ConsumerWorkerPool
 
 logger = logging.getLogger(__name__)
 
-RESULT_KEY_PREFIX = "ide_result:"
-
-
-def _result_key(submission_id: str) -> str:
-    return f"{RESULT_KEY_PREFIX}{submission_id}"
-
-
 async def process_ide_submission(
     msg: AbstractIncomingMessage,
     redis_client: aioredis.Redis,  # type: ignore[type-arg]
@@ -36,6 +36,14 @@ async def process_ide_submission(
     task_id: int = payload["task_id"]
     user_id: int = payload["user_id"]
     code: str = payload["code"]
+    # messages published before snapshots were added have none, the interactor loads the task for them
+    task = code_task_from_snapshot(payload["task"]) if payload.get("task") else None
+
+    if await redis_client.exists(ide_result_key(submission_id)):
+        # redelivered message of a submission which has already been graded and saved
+        logger.info("IDE submission %s already has a result, skipping it", submission_id)
+        await msg.ack()
+        return
 
     logger.info(
         "Processing IDE submission %s for task=%s user=%s",
@@ -50,7 +58,7 @@ async def process_ide_submission(
             CreateCodeTaskSubmissionInteractor,
             CreateCodeTaskSubmissionInputData,
         )
-        from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
+        from learn_anything.course_platform.application.ports.playground import PlaygroundLane
 
         dummy_tg_object = CallbackQuery(
             id="1",
@@ -60,14 +68,13 @@ async def process_ide_submission(
 
         async with container(context={TelegramObject: dummy_tg_object}) as request_container:
             interactor = await request_container.get(CreateCodeTaskSubmissionInteractor)
-            task_gateway = await request_container.get(TaskGateway)
-
-            task = await task_gateway.get_code_task_with_id(task_id)
 
             output_data = await interactor.execute(
                 data=CreateCodeTaskSubmissionInputData(
                     task_id=task_id,
                     submission=code,
+                    lane=PlaygroundLane.INTERACTIVE,
+                    task_snapshot=task,
                 )
             )
 
@@ -115,9 +122,12 @@ async def process_ide_submission(
             "failed_test": None,
         }
 
-    # Write result to Redis with TTL
-    key = _result_key(submission_id)
-    await redis_client.setex(key, IDE_RESULT_TTL, json.dumps(result))
+    # Write result to Redis with TTL and notify clients waiting for it
+    raw_result = json.dumps(result)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.setex(ide_result_key(submission_id), IDE_RESULT_TTL, raw_result)
+        pipe.publish(ide_result_channel(submission_id), raw_result)
+        await pipe.execute()
     logger.info("Wrote IDE result for submission %s → %s", submission_id, result["status"])
 
     await msg.ack()
@@ -127,22 +137,22 @@ async def start_ide_consumer(
     channel: object,
     redis_client: aioredis.Redis,  # type: ignore[type-arg]
     container: AsyncContainer,
+    concurrency: int,
 ) -> None:
-    """Start consuming ide_submissions queue. Runs indefinitely."""
+    """Start consuming ide_submissions queue. Runs until cancelled, then drains in-progress submissions."""
     from aio_pika.abc import AbstractChannel, ExchangeType  # local import to avoid circular
 
+    worker_pool = ConsumerWorkerPool(
+        queue_name=IDE_SUBMISSIONS_QUEUE,
+        handler=partial(process_ide_submission, redis_client=redis_client, container=container),
+        concurrency=concurrency,
+    )
+
     ch = cast("AbstractChannel", channel)  # type: ignore[type-arg]
     exchange = await ch.declare_exchange(IDE_SUBMISSIONS_QUEUE, ExchangeType.TOPIC, durable=True)
     queue = await ch.declare_queue(name=IDE_SUBMISSIONS_QUEUE, durable=True)
     await queue.bind(exchange, IDE_SUBMISSIONS_QUEUE)
-    await ch.set_qos(prefetch_count=5)
+    await ch.set_qos(prefetch_count=worker_pool.prefetch_count)
 
     logger.info("Starting IDE submissions consumer…")
-    async for message in queue.iterator():
-        asyncio.create_task(
-            process_ide_submission(
-                cast(AbstractIncomingMessage, message),
-                redis_client,
-                container,
-            )
-        )
+    await worker_pool.run(queue)
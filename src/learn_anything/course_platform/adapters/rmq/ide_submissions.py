@@ -4,20 +4,104 @@ IDE submission consumer — reads from `ide_submissions` queue and writes result
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import uuid
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
 
 import aio_pika
 import msgpack
 from aio_pika.abc import AbstractChannel, ExchangeType
 
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.task.enums import TaskType
+from learn_anything.course_platform.domain.entities.task.models import CodeTask, CodeTaskTest, TaskID
+
 if TYPE_CHECKING:
     import redis.asyncio as aioredis
 
 IDE_SUBMISSIONS_QUEUE = "ide_submissions"
 IDE_RESULT_TTL = 300  # 5 minutes
+IDE_RESULT_KEY_PREFIX = "ide_result:"
+# result is also published here the moment it is written, so clients don't have to poll for it
+IDE_RESULT_CHANNEL_PREFIX = "ide_result_events:"
+# repeated submissions of the same code, or with the same idempotency key, within this number of seconds
+# get the id of the first one instead of being graded again
+IDE_SUBMISSION_DEDUP_WINDOW = 60
+IDE_SUBMISSION_DEDUP_KEY_PREFIX = "ide_submission:"
+
+
+def ide_result_key(submission_id: str) -> str:
+    return f"{IDE_RESULT_KEY_PREFIX}{submission_id}"
+
+
+def ide_result_channel(submission_id: str) -> str:
+    return f"{IDE_RESULT_CHANNEL_PREFIX}{submission_id}"
+
+
+def ide_submission_dedup_key(user_id: int, task_id: int, code: str, idempotency_key: str | None = None) -> str:
+    if idempotency_key:
+        return f"{IDE_SUBMISSION_DEDUP_KEY_PREFIX}{user_id}:key:{idempotency_key}"
+    code_hash = hashlib.sha256(code.encode()).hexdigest()
+    return f"{IDE_SUBMISSION_DEDUP_KEY_PREFIX}{user_id}:{task_id}:{code_hash}"
+
+
+async def claim_ide_submission(
+    redis_client: aioredis.Redis,  # type: ignore[type-arg]
+    dedup_key: str,
+) -> tuple[str, bool]:
+    """Returns the submission id for the key and whether it is a new submission which has to be published"""
+    submission_id = str(uuid.uuid4())
+    if await redis_client.set(dedup_key, submission_id, nx=True, ex=IDE_SUBMISSION_DEDUP_WINDOW):
+        return submission_id, True
+
+    existing_submission_id = await redis_client.get(dedup_key)
+    if existing_submission_id is None:
+        # the window has just expired, nothing to collapse onto
+        await redis_client.set(dedup_key, submission_id, ex=IDE_SUBMISSION_DEDUP_WINDOW)
+        return submission_id, True
+    return existing_submission_id, False  # type: ignore[no-any-return]
+
+
+def code_task_snapshot(task: CodeTask) -> dict[str, Any]:
+    """
+    Everything needed to grade a submission of the task, taken when it was submitted.
+    The consumer grades against it instead of loading the task again, updated_at is the version of the task
+    """
+    return {
+        "id": task.id,
+        "topic": task.topic,
+        "title": task.title,
+        "body": task.body,
+        "course_id": task.course_id,
+        "index_in_course": task.index_in_course,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat(),
+        "attempts_limit": task.attempts_limit,
+        "prepared_code": task.prepared_code,
+        "code_duration_timeout": task.code_duration_timeout,
+        "tests": [test.code for test in task.tests],
+    }
+
+
+def code_task_from_snapshot(snapshot: dict[str, Any]) -> CodeTask:
+    return CodeTask(
+        id=TaskID(snapshot["id"]),
+        type=TaskType.CODE,
+        topic=snapshot["topic"],
+        title=snapshot["title"],
+        body=snapshot["body"],
+        course_id=CourseID(snapshot["course_id"]),
+        index_in_course=snapshot["index_in_course"],
+        created_at=datetime.fromisoformat(snapshot["created_at"]),
+        updated_at=datetime.fromisoformat(snapshot["updated_at"]),
+        attempts_limit=snapshot["attempts_limit"],
+        prepared_code=snapshot["prepared_code"],
+        code_duration_timeout=snapshot["code_duration_timeout"],
+        tests=[CodeTaskTest(code=code) for code in snapshot["tests"]],
+    )
 
 
 @dataclass
@@ -30,19 +114,17 @@ class IdeSubmissionMessage:
 
 async def publish_ide_submission(
     channel: AbstractChannel,
-    task_id: int,
+    task: CodeTask,
     user_id: int,
     code: str,
-    prepared_code: str | None = None,
-    tests: list[dict[str, str]] | None = None,
-    code_duration_timeout: int = 10,
+    submission_id: str | None = None,
 ) -> str:
-    """Publish an IDE submission to RMQ. Returns submission_id."""
-    submission_id = str(uuid.uuid4())
+    """Publish an IDE submission to RMQ together with the snapshot of its task. Returns submission_id."""
+    submission_id = submission_id or str(uuid.uuid4())
 
     msg = IdeSubmissionMessage(
         submission_id=submission_id,
-        task_id=task_id,
+        task_id=task.id,
         user_id=user_id,
         code=code,
     )
@@ -61,9 +143,7 @@ async def publish_ide_submission(
                     "task_id": msg.task_id,
                     "user_id": msg.user_id,
                     "code": msg.code,
-                    "prepared_code": prepared_code,
-                    "tests": tests or [],
-                    "code_duration_timeout": code_duration_timeout,
+                    "task": code_task_snapshot(task),
                 }
             ),
         ),
@@ -0,0 +1,80 @@
+"""
+Topology of telegram updates queues, shared by the api_gateway publisher and the course_platform consumer.
+
+Updates are split into shards by chat id, every shard has its own queue. All updates of a chat get into
+the same shard, and every shard is consumed by only one consumer at a time (single active consumer),
+so consumers can be scaled out without breaking the order of updates of a user.
+Number of shards must be the same for the gateway and all consumers.
+
+Updates travel as msgpack in the Bot API format without empty fields, the same way telegram sends them to webhook.
+"""
+from typing import Any
+
+import msgpack
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractQueue, ExchangeType
+from aiogram import Bot
+from aiogram.types import Update
+
+TG_UPDATES_EXCHANGE = 'tg_updates'
+
+
+def update_to_dict(update: Update) -> dict[str, Any]:
+    # most of the fields of an update are empty, dumping them makes the message ~10 times bigger
+    return update.model_dump(exclude_none=True, by_alias=True)
+
+
+def pack_update(update: dict[str, Any]) -> bytes:
+    return msgpack.packb(update)  # type: ignore[no-any-return]
+
+
+def unpack_update(body: bytes, bot: Bot) -> Update:
+    # update validated with the bot in context is not validated again by Dispatcher.feed_update
+    return Update.model_validate(msgpack.unpackb(body), context={'bot': bot})
+
+
+def tg_updates_shard_name(shard: int) -> str:
+    """Name of the shard queue, it is also used as a routing key"""
+    return f'{TG_UPDATES_EXCHANGE}.{shard}'
+
+
+def tg_updates_shard(update: dict[str, Any], shards_number: int) -> int:
+    chat_id = _find_chat_id(update)
+    if chat_id is None:
+        return 0
+    return abs(chat_id) % shards_number
+
+
+def _find_chat_id(update: dict[str, Any]) -> int | None:
+    for field, event in update.items():
+        if field == 'update_id' or not isinstance(event, dict):
+            continue
+
+        chat = event.get('chat') or (event.get('message') or {}).get('chat')
+        if chat:
+            return int(chat['id'])
+
+        # inline queries and some other updates are not bound to a chat, the user's private chat has their id
+        user = event.get('from') or event.get('from_user') or event.get('user')
+        if user:
+            return int(user['id'])
+    return None
+
+
+async def declare_tg_updates_topology(
+        channel: AbstractChannel,
+        shards_number: int,
+) -> tuple[AbstractExchange, list[AbstractQueue]]:
+    """Returns the exchange and the queues of all shards, in order"""
+    exchange = await channel.declare_exchange(TG_UPDATES_EXCHANGE, ExchangeType.TOPIC, durable=True)
+
+    queues = []
+    for shard in range(shards_number):
+        queue = await channel.declare_queue(
+            name=tg_updates_shard_name(shard),
+            durable=True,
+            arguments={'x-single-active-consumer': True},
+        )
+        await queue.bind(exchange, tg_updates_shard_name(shard))
+        queues.append(queue)
+
+    return exchange, queues
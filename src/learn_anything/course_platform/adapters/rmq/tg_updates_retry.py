@@ -0,0 +1,178 @@
+"""
+Broker-level retries of telegram updates.
+
+An update which failed to be processed is acked right away and published into the retry queue with an increased
+retry counter, so it does not hold a prefetch slot of the consumer while waiting. The retry queue has no consumers:
+after the delay rabbitmq dead-letters the update back into the tg_updates exchange with its original routing key,
+and it comes back to its shard queue. Updates which failed too many times, or could not even be decoded,
+are parked in the dead letter queue until they are replayed with `learn-anything dlq replay`.
+"""
+from typing import Any
+
+import msgpack
+from aio_pika import Message, DeliveryMode
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractIncomingMessage, AbstractQueue, ExchangeType
+
+from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.metrics import TG_UPDATES_FAILURES
+from learn_anything.course_platform.adapters.rmq.tg_updates import TG_UPDATES_EXCHANGE, tg_updates_shard, \
+    tg_updates_shard_name
+
+TG_UPDATES_RETRY_EXCHANGE = 'tg_updates.retry'
+TG_UPDATES_RETRY_QUEUE = 'tg_updates.retry'
+TG_UPDATES_DLQ = 'tg_updates.dlq'
+
+RETRY_COUNT_HEADER = 'x-retry-count'
+LAST_ERROR_HEADER = 'x-last-error'
+
+_MAX_ERROR_LENGTH = 500
+
+
+async def declare_tg_updates_retry_topology(
+        channel: AbstractChannel,
+        retry_delay: float,
+) -> tuple[AbstractExchange, AbstractQueue]:
+    """Returns the retry exchange and the dead letter queue"""
+    retry_exchange = await channel.declare_exchange(TG_UPDATES_RETRY_EXCHANGE, ExchangeType.TOPIC, durable=True)
+    retry_queue = await channel.declare_queue(
+        name=TG_UPDATES_RETRY_QUEUE,
+        durable=True,
+        arguments={
+            'x-message-ttl': int(retry_delay * 1000),
+            # routing key is kept, so the update gets back into the queue of its shard
+            'x-dead-letter-exchange': TG_UPDATES_EXCHANGE,
+        },
+    )
+    await retry_queue.bind(retry_exchange, '#')
+
+    dlq = await channel.declare_queue(name=TG_UPDATES_DLQ, durable=True)
+    return retry_exchange, dlq
+
+
+def retry_count(message: AbstractIncomingMessage) -> int:
+    return int((message.headers or {}).get(RETRY_COUNT_HEADER, 0))  # type: ignore[arg-type]
+
+
+class TgUpdatesRetrier:
+    def __init__(self, channel: AbstractChannel, retry_exchange: AbstractExchange, max_retries: int) -> None:
+        self._channel = channel
+        self._retry_exchange = retry_exchange
+        self._max_retries = max_retries
+
+    async def retry(self, message: AbstractIncomingMessage, error: Exception) -> None:
+        """Schedule one more attempt to process the update, or dead-letter it if it has run out of attempts"""
+        retries = retry_count(message)
+        if retries >= self._max_retries:
+            await self.dead_letter(message, error)
+            return
+
+        logger.warning('Update will be retried, attempt %s of %s', retries + 1, self._max_retries)
+        await self._retry_exchange.publish(
+            _failed_message(message, retries=retries + 1, error=error),
+            routing_key=message.routing_key or tg_updates_shard_name(0),
+        )
+        TG_UPDATES_FAILURES.labels(outcome='retried').inc()
+
+    async def dead_letter(self, message: AbstractIncomingMessage, error: Exception) -> None:
+        logger.error('Update is moved to the dead letter queue after %s retries', retry_count(message))
+        await self._channel.default_exchange.publish(
+            _failed_message(message, retries=retry_count(message), error=error),
+            routing_key=TG_UPDATES_DLQ,
+        )
+        TG_UPDATES_FAILURES.labels(outcome='dead_lettered').inc()
+
+
+def _failed_message(message: AbstractIncomingMessage, retries: int, error: Exception) -> Message:
+    headers: dict[str, Any] = dict(message.headers or {})
+    headers[RETRY_COUNT_HEADER] = retries
+    headers[LAST_ERROR_HEADER] = f'{type(error).__name__}: {error}'[:_MAX_ERROR_LENGTH]
+    return Message(
+        body=message.body,
+        headers=headers,
+        correlation_id=message.correlation_id,
+        delivery_mode=DeliveryMode.PERSISTENT,
+    )
+
+
+async def peek_dead_letters(dlq: AbstractQueue, limit: int) -> list[AbstractIncomingMessage]:
+    """Messages from the head of the dead letter queue, they are left in the queue"""
+    messages: list[AbstractIncomingMessage] = []
+    # messages are held unacked until all of them are fetched, otherwise the same one would be fetched again
+    while len(messages) < limit:
+        message = await dlq.get(no_ack=False, fail=False)
+        if message is None:
+            break
+        messages.append(message)
+
+    for message in messages:
+        await message.nack(requeue=True)
+    return messages
+
+
+async def replay_dead_letters(
+        channel: AbstractChannel,
+        dlq: AbstractQueue,
+        shards_number: int,
+        limit: int | None = None,
+) -> int:
+    """
+    Publish dead-lettered updates back into their shard queues with a fresh retry counter.
+    Only messages which were in the queue at the start are replayed, returns their number
+    """
+    exchange = await channel.declare_exchange(TG_UPDATES_EXCHANGE, ExchangeType.TOPIC, durable=True)
+    declared = await dlq.declare()
+    to_replay = declared.message_count or 0
+    if limit is not None:
+        to_replay = min(to_replay, limit)
+
+    replayed = 0
+    while replayed < to_replay:
+        message = await dlq.get(no_ack=False, fail=False)
+        if message is None:
+            break
+
+        headers = {
+            key: value for key, value in (message.headers or {}).items()
+            if key not in (RETRY_COUNT_HEADER, LAST_ERROR_HEADER)
+        }
+        await exchange.publish(
+            Message(
+                body=message.body,
+                headers=headers,
+                correlation_id=message.correlation_id,
+                delivery_mode=DeliveryMode.PERSISTENT,
+            ),
+            routing_key=tg_updates_shard_name(_shard_of(message.body, shards_number)),
+        )
+        # publish is confirmed by the broker, so the update can not be lost in between
+        await message.ack()
+        replayed += 1
+
+    return replayed
+
+
+def describe_dead_letter(message: AbstractIncomingMessage) -> str:
+    try:
+        update = msgpack.unpackb(message.body)
+        kind = next((field for field in update if field != 'update_id'), 'unknown')
+        summary = f'update {update.get("update_id")} ({kind})'
+    except Exception:
+        summary = f'undecodable message of {len(message.body)} bytes'
+
+    headers = message.headers or {}
+    last_error = headers.get(LAST_ERROR_HEADER)
+    # string headers may come back from the broker as bytes
+    if isinstance(last_error, bytes):
+        last_error = last_error.decode(errors='replace')
+    return (
+        f'{summary}, retries: {retry_count(message)}, '
+        f'correlation id: {message.correlation_id}, error: {last_error}'
+    )
+
+
+def _shard_of(body: bytes, shards_number: int) -> int:
+    # shards are computed again, their number could have changed since the update was dead-lettered
+    try:
+        return tg_updates_shard(msgpack.unpackb(body), shards_number)
+    except Exception:
+        return 0
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractQueue
+
+from learn_anything.course_platform.adapters.logger import logger
+from learn_anything.course_platform.adapters.metrics import CONSUMER_IN_FLIGHT, CONSUMER_QUEUED
+
+MessageHandler = Callable[[AbstractIncomingMessage], Awaitable[None]]
+
+
+class ConsumerWorkerPool:
+    """
+    Consumes the queue with a fixed number of workers.
+    Messages are pulled from the broker only while there is room in a small local buffer,
+    so the rest of a flood stays in rabbitmq instead of piling up in the process
+    """
+
+    def __init__(
+            self,
+            queue_name: str,
+            handler: MessageHandler,
+            concurrency: int,
+            drain_timeout: float = 30,
+    ) -> None:
+        self._queue_name = queue_name
+        self._handler = handler
+        self._concurrency = concurrency
+        self._drain_timeout = drain_timeout
+
+        self._messages: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue(maxsize=concurrency)
+        self._workers: set[asyncio.Task[None]] = set()
+        self._in_flight = 0
+
+    @property
+    def prefetch_count(self) -> int:
+        """Limit of unacked messages for the whole channel, when it is reached the rest waits in the broker"""
+        return self._concurrency * 2
+
+    async def run(self, *queues: AbstractQueue) -> None:
+        """Consume the queues until cancelled, then let the workers finish already received messages"""
+        self._workers = {asyncio.create_task(self._work()) for _ in range(self._concurrency)}
+        logger.info('Started %s workers for queue %s', self._concurrency, self._queue_name)
+        try:
+            await asyncio.gather(*(self._consume(queue) for queue in queues))
+        finally:
+            await self._drain()
+
+    async def _consume(self, queue: AbstractQueue) -> None:
+        async with queue.iterator() as queue_iter:
+            async for message in queue_iter:
+                try:
+                    await self._messages.put(message)
+                except asyncio.CancelledError:
+                    # message was received while all workers were busy, give it back to the broker
+                    await message.nack(requeue=True)
+                    raise
+                self._update_metrics()
+
+    async def _work(self) -> None:
+        while True:
+            message = await self._messages.get()
+            self._in_flight += 1
+            self._update_metrics()
+            try:
+                await self._handler(message)
+            except Exception as e:
+                logger.exception('Unhandled error while processing message from %s: %s', self._queue_name, e)
+                if not message.processed:
+                    await message.reject()
+            finally:
+                self._in_flight -= 1
+                self._messages.task_done()
+                self._update_metrics()
+
+    async def _drain(self) -> None:
+        logger.info(
+            'Draining queue %s consumer: %s messages in flight, %s queued',
+            self._queue_name, self._in_flight, self._messages.qsize(),
+        )
+        try:
+            await asyncio.wait_for(self._messages.join(), timeout=self._drain_timeout)
+        except TimeoutError:
+            # unacked messages are redelivered by the broker once the channel is closed
+            logger.warning('Queue %s consumer was not drained in %s seconds', self._queue_name, self._drain_timeout)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._update_metrics()
+
+    def _update_metrics(self) -> None:
+        CONSUMER_IN_FLIGHT.labels(queue=self._queue_name).set(self._in_flight)
+        CONSUMER_QUEUED.labels(queue=self._queue_name).set(self._messages.qsize())
@@ -1,2 +1,23 @@
+import math
+from dataclasses import dataclass
+
+from learn_anything.course_platform.domain.error import ApplicationError
+
+
 class UserNotAuthenticatedError(Exception):
     message: str = "User not authenticated"
+
+
+@dataclass
+class SubmissionRateLimitExceededError(ApplicationError):
+    retry_after: float
+
+    @property
+    def message(self) -> str:
+        return f"Too many submissions, try again in {math.ceil(self.retry_after)} seconds"
+
+
+class InvalidPaginationCursorError(ApplicationError):
+    @property
+    def message(self) -> str:
+        return "List has changed, open it again"
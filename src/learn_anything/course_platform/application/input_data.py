@@ -6,6 +6,10 @@ from typing import Literal
 class Pagination:
     offset: int | None = None
     limit: int | None = None
+    # opaque position returned with the previous page, when it is set offset is ignored
+    cursor: str | None = None
+    # counting all the items is a separate scan, so it can be skipped when only next/prev are needed
+    with_total: bool = True
 
 
 # special sentinel object which used in a situation when None might be a useful value
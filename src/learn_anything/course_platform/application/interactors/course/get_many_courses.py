@@ -1,4 +1,3 @@
-import asyncio
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Sequence
@@ -7,10 +6,12 @@ from learn_anything.course_platform.application.input_data import Pagination
 from learn_anything.course_platform.application.ports.auth.identity_provider import IdentityProvider
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway, GetManyCoursesFilters, \
     RegistrationForCourseGateway
+from learn_anything.course_platform.application.ports.data.course_search import CourseSearch
 from learn_anything.course_platform.application.ports.data.file_manager import FileManager, COURSES_DEFAULT_DIRECTORY, \
     FilePath
 from learn_anything.course_platform.application.ports.data.user_gateway import UserGateway
-from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.course.models import CourseID, Course
+from learn_anything.course_platform.domain.entities.user.models import UserID
 
 
 @dataclass
@@ -36,19 +37,78 @@ class CourseData:
 class GetManyCoursesOutputData:
     courses: Sequence[CourseData]
     pagination: Pagination
-    total: int
+    total: int | None
+    next_cursor: str | None = None
+
+
+async def _make_courses_data(
+        courses: Sequence[Course],
+        actor_id: UserID,
+        user_gateway: UserGateway,
+        registration_for_course_gateway: RegistrationForCourseGateway,
+        file_manager: FileManager,
+) -> list[CourseData]:
+    if not courses:
+        return []
+
+    # creators and registrations of the whole page are read at once, not for every course
+    creators = await user_gateway.with_ids(list({course.creator_id for course in courses}))
+    registrations = await registration_for_course_gateway.read_many(
+        user_id=actor_id,
+        course_ids=[course.id for course in courses],
+    )
+    creator_names = {creator.id: creator.fullname for creator in creators}
+    registered_course_ids = {registration.course_id for registration in registrations}
+
+    courses_output_data = []
+    for course in courses:
+        course_data = CourseData(
+            id=course.id,
+            title=course.title,
+            description=course.description,
+            created_at=course.created_at,
+            creator=creator_names.get(course.creator_id, 'undefined'),
+            total_registered=course.total_registered,
+            user_is_registered=course.id in registered_course_ids,
+            photo_id=None,
+            photo_path=None,
+        )
+        if course.photo_id:
+            course_data.photo_id = course.photo_id
+            course_data.photo_path = file_manager.generate_path(
+                directories=(COURSES_DEFAULT_DIRECTORY, ),
+                filename=course.photo_id,
+            )
+
+        courses_output_data.append(course_data)
+
+    return courses_output_data
+
+
+async def _find_courses(
+        pagination: Pagination,
+        filters: GetManyCoursesFilters,
+        course_gateway: CourseGateway,
+        course_search: CourseSearch,
+) -> tuple[Sequence[Course], int | None, str | None]:
+    # text filters go to the search, it ranks the courses by how well they match
+    if filters.title or filters.author_name:
+        return await course_search.search(pagination=pagination, filters=filters)
+    return await course_gateway.all(pagination=pagination, filters=filters)
 
 
 class GetAllCoursesInteractor:
     def __init__(
             self,
             course_gateway: CourseGateway,
+            course_search: CourseSearch,
             registration_for_course_gateway: RegistrationForCourseGateway,
             user_gateway: UserGateway,
             file_manager: FileManager,
             id_provider: IdentityProvider
     ) -> None:
         self._course_gateway = course_gateway
+        self._course_search = course_search
         self._registration_for_course_gateway = registration_for_course_gateway
         self._user_gateway = user_gateway
         self._file_manager = file_manager
@@ -57,45 +117,24 @@ class GetAllCoursesInteractor:
     async def execute(self, data: GetManyCoursesInputData) -> GetManyCoursesOutputData:
         actor_id = await self._id_provider.get_current_user_id()
 
-        courses, total = await self._course_gateway.all(
+        courses, total, next_cursor = await _find_courses(
             pagination=data.pagination,
             filters=data.filters,
+            course_gateway=self._course_gateway,
+            course_search=self._course_search,
         )
 
-        courses_output_data = []
-        for course in courses:
-            creator, registration = await asyncio.gather(
-                self._user_gateway.with_id(course.creator_id),
-                self._registration_for_course_gateway.read(user_id=actor_id, course_id=course.id)
-            )
-            creator_name = 'undefined'
-            if creator:
-                creator_name = creator.fullname
-
-            course_data = CourseData(
-                id=course.id,
-                title=course.title,
-                description=course.description,
-                created_at=course.created_at,
-                creator=creator_name,
-                total_registered=course.total_registered,
-                user_is_registered=registration is not None,
-                photo_id=None,
-                photo_path=None,
-            )
-            if course.photo_id:
-                course_data.photo_id = course.photo_id
-                course_data.photo_path = self._file_manager.generate_path(
-                    directories=(COURSES_DEFAULT_DIRECTORY, ),
-                    filename=course.photo_id,
-                )
-
-            courses_output_data.append(course_data)
-
         return GetManyCoursesOutputData(
-            courses=courses_output_data,
+            courses=await _make_courses_data(
+                courses=courses,
+                actor_id=actor_id,
+                user_gateway=self._user_gateway,
+                registration_for_course_gateway=self._registration_for_course_gateway,
+                file_manager=self._file_manager,
+            ),
             pagination=data.pagination,
             total=total,
+            next_cursor=next_cursor,
         )
 
 
@@ -103,12 +142,14 @@ class GetActorCreatedCoursesInteractor:
     def __init__(
             self,
             course_gateway: CourseGateway,
+            course_search: CourseSearch,
             registration_for_course_gateway: RegistrationForCourseGateway,
             user_gateway: UserGateway,
             file_manager: FileManager,
             id_provider: IdentityProvider
     ) -> None:
         self._course_gateway = course_gateway
+        self._course_search = course_search
         self._registration_for_course_gateway = registration_for_course_gateway
         self._user_gateway = user_gateway
         self._file_manager = file_manager
@@ -119,45 +160,24 @@ class GetActorCreatedCoursesInteractor:
 
         data.filters.with_creator_id = actor_id
 
-        courses, total = await self._course_gateway.all(
+        courses, total, next_cursor = await _find_courses(
             pagination=data.pagination,
             filters=data.filters,
+            course_gateway=self._course_gateway,
+            course_search=self._course_search,
         )
 
-        courses_output_data = []
-        for course in courses:
-            creator, registration = await asyncio.gather(
-                self._user_gateway.with_id(course.creator_id),
-                self._registration_for_course_gateway.read(user_id=actor_id, course_id=course.id)
-            )
-            creator_name = 'undefined'
-            if creator:
-                creator_name = creator.fullname
-
-            course_data = CourseData(
-                id=course.id,
-                title=course.title,
-                description=course.description,
-                created_at=course.created_at,
-                creator=creator_name,
-                total_registered=course.total_registered,
-                user_is_registered=registration is not None,
-                photo_id=None,
-                photo_path=None,
-            )
-            if course.photo_id:
-                course_data.photo_id = course.photo_id
-                course_data.photo_path = self._file_manager.generate_path(
-                    directories=(COURSES_DEFAULT_DIRECTORY, ),
-                    filename=course.photo_id,
-                )
-
-            courses_output_data.append(course_data)
-
         return GetManyCoursesOutputData(
-            courses=courses_output_data,
+            courses=await _make_courses_data(
+                courses=courses,
+                actor_id=actor_id,
+                user_gateway=self._user_gateway,
+                registration_for_course_gateway=self._registration_for_course_gateway,
+                file_manager=self._file_manager,
+            ),
             pagination=data.pagination,
             total=total,
+            next_cursor=next_cursor,
         )
 
 
@@ -165,12 +185,14 @@ class GetActorRegisteredCoursesInteractor:
     def __init__(
             self,
             course_gateway: CourseGateway,
+            course_search: CourseSearch,
             registration_for_course_gateway: RegistrationForCourseGateway,
             user_gateway: UserGateway,
             file_manager: FileManager,
             id_provider: IdentityProvider
     ) -> None:
         self._course_gateway = course_gateway
+        self._course_search = course_search
         self._registration_for_course_gateway = registration_for_course_gateway
         self._user_gateway = user_gateway
         self._file_manager = file_manager
@@ -181,43 +203,22 @@ class GetActorRegisteredCoursesInteractor:
 
         data.filters.with_registered_actor_id = actor_id
 
-        courses, total = await self._course_gateway.all(
+        courses, total, next_cursor = await _find_courses(
             pagination=data.pagination,
             filters=data.filters,
+            course_gateway=self._course_gateway,
+            course_search=self._course_search,
         )
 
-        courses_output_data = []
-        for course in courses:
-            creator, registration = await asyncio.gather(
-                self._user_gateway.with_id(course.creator_id),
-                self._registration_for_course_gateway.read(user_id=actor_id, course_id=course.id)
-            )
-            creator_name = 'undefined'
-            if creator:
-                creator_name = creator.fullname
-
-            course_data = CourseData(
-                id=course.id,
-                title=course.title,
-                description=course.description,
-                created_at=course.created_at,
-                creator=creator_name,
-                total_registered=course.total_registered,
-                user_is_registered=registration is not None,
-                photo_id=None,
-                photo_path=None,
-            )
-            if course.photo_id:
-                course_data.photo_id = course.photo_id
-                course_data.photo_path = self._file_manager.generate_path(
-                    directories=(COURSES_DEFAULT_DIRECTORY, ),
-                    filename=course.photo_id,
-                )
-
-            courses_output_data.append(course_data)
-
         return GetManyCoursesOutputData(
-            courses=courses_output_data,
+            courses=await _make_courses_data(
+                courses=courses,
+                actor_id=actor_id,
+                user_gateway=self._user_gateway,
+                registration_for_course_gateway=self._registration_for_course_gateway,
+                file_manager=self._file_manager,
+            ),
             pagination=data.pagination,
             total=total,
+            next_cursor=next_cursor,
         )
@@ -1,4 +1,3 @@
-import asyncio
 from dataclasses import dataclass
 
 from learn_anything.course_platform.application.ports.auth.identity_provider import IdentityProvider
@@ -6,7 +5,6 @@ from learn_anything.course_platform.application.ports.committer import Commiter
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway, RegistrationForCourseGateway
 from learn_anything.course_platform.domain.entities.course.errors import CourseDoesNotExistError, RegistrationForCourseDoesNotExistError
 from learn_anything.course_platform.domain.entities.course.models import CourseID
-from learn_anything.course_platform.domain.entities.course.rules import decrement_course_registrations_number
 
 
 @dataclass
@@ -38,11 +36,7 @@ class LeaveCourseInteractor:
         if not registration:
             raise RegistrationForCourseDoesNotExistError
 
-        course = decrement_course_registrations_number(course=course)
-
-        await asyncio.gather(
-            self._course_gateway.save(course),
-            self._registration_for_course_gateway.delete(user_id=actor_id, course_id=course.id),
-        )
+        await self._registration_for_course_gateway.delete(user_id=actor_id, course_id=course.id)
+        await self._course_gateway.update_total_registered(course_id=course.id, delta=-1)
 
         await self._commiter.commit()
@@ -1,10 +1,10 @@
-import asyncio
 from dataclasses import dataclass
 
 from learn_anything.course_platform.application.ports.auth.identity_provider import IdentityProvider
 from learn_anything.course_platform.application.ports.committer import Commiter
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway, RegistrationForCourseGateway
-from learn_anything.course_platform.domain.entities.course.errors import CourseDoesNotExistError, UserAlreadyRegisteredForCourseError
+from learn_anything.course_platform.domain.entities.course.errors import CourseDoesNotExistError, UserAlreadyRegisteredForCourseError, \
+    RegistrationsLimitExceededError
 from learn_anything.course_platform.domain.entities.course.models import CourseID
 from learn_anything.course_platform.domain.entities.course.rules import increment_course_registrations_number, create_registration_for_course
 
@@ -38,12 +38,13 @@ class RegisterForCourseInteractor:
         if registration:
             raise UserAlreadyRegisteredForCourseError(course.title)
 
+        # checks the registrations limit, the counter itself is changed by the gateway
         course = increment_course_registrations_number(course=course)
         new_registration = create_registration_for_course(user_id=actor_id, course_id=course.id)
 
-        await asyncio.gather(
-            self._course_gateway.save(course),
-            self._registration_for_course_gateway.save(new_registration)
-        )
+        # the limit is checked once more by the update, a concurrent registration may have taken the last place
+        if not await self._course_gateway.update_total_registered(course_id=course.id, delta=1):
+            raise RegistrationsLimitExceededError(course.id)
+        await self._registration_for_course_gateway.save(new_registration)
 
         await self._commiter.commit()
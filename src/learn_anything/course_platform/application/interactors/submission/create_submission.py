@@ -1,14 +1,19 @@
 import abc
+import hashlib
+import json
 from dataclasses import dataclass
 from datetime import datetime
 
+from learn_anything.course_platform.application.errors import SubmissionRateLimitExceededError
 from learn_anything.course_platform.application.ports.auth.identity_provider import IdentityProvider
 from learn_anything.course_platform.application.ports.committer import Commiter
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway, \
     RegistrationForCourseGateway
 from learn_anything.course_platform.application.ports.data.submission_gateway import SubmissionGateway
 from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
-from learn_anything.course_platform.application.ports.playground import PlaygroundFactory
+from learn_anything.course_platform.application.ports.grading_cache import GradingCache, GradingResult
+from learn_anything.course_platform.application.ports.rate_limiter import SubmissionRateLimiter
+from learn_anything.course_platform.application.ports.playground import PlaygroundFactory, CodeWithTestsResult, PlaygroundLane
 from learn_anything.course_platform.domain.entities.course.errors import CourseDoesNotExistError
 from learn_anything.course_platform.domain.entities.submission.models import PollSubmission, TextInputSubmission
 from learn_anything.course_platform.domain.entities.submission.rules import create_code_submission
@@ -17,7 +22,7 @@ from learn_anything.course_platform.domain.entities.task.errors import TaskDoesN
     AttemptsLimitReachedForTaskError, PollTaskOptionDoesNotExistError
 from learn_anything.course_platform.domain.entities.task.models import TaskID, TextInputTaskAnswer, PracticeTask, \
     CodeTask, \
-    CodeTaskTest, PollTaskOptionID
+    PollTaskOptionID
 from learn_anything.course_platform.domain.entities.task.rules import answer_is_correct, find_task_option_by_id
 from learn_anything.course_platform.domain.entities.user.models import UserID
 
@@ -72,6 +77,9 @@ class CreateTaskSubmissionBaseInteractor(abc.ABC):
 class CreateCodeTaskSubmissionInputData:
     task_id: TaskID
     submission: str
+    lane: PlaygroundLane = PlaygroundLane.GRADING
+    # task as it was when the submission was sent, it is trusted and not loaded again
+    task_snapshot: CodeTask | None = None
 
 
 @dataclass
@@ -86,27 +94,59 @@ class CreateCodeTaskSubmissionOutputData:
 
 
 class CreateCodeTaskSubmissionInteractor(CreateTaskSubmissionBaseInteractor):
+    def __init__(
+            self,
+            id_provider: IdentityProvider,
+            submission_gateway: SubmissionGateway,
+            task_gateway: TaskGateway,
+            course_gateway: CourseGateway,
+            playground_factory: PlaygroundFactory,
+            commiter: Commiter,
+            registration_for_course_gateway: RegistrationForCourseGateway,
+            grading_cache: GradingCache,
+            rate_limiter: SubmissionRateLimiter,
+    ) -> None:
+        super().__init__(
+            id_provider=id_provider,
+            submission_gateway=submission_gateway,
+            task_gateway=task_gateway,
+            course_gateway=course_gateway,
+            playground_factory=playground_factory,
+            commiter=commiter,
+            registration_for_course_gateway=registration_for_course_gateway,
+        )
+        self._grading_cache = grading_cache
+        self._rate_limiter = rate_limiter
+
     async def execute(self, data: CreateCodeTaskSubmissionInputData) -> CreateCodeTaskSubmissionOutputData:
         actor_id = await self._id_provider.get_current_user_id()
-        task = await self._task_gateway.get_code_task_with_id(data.task_id)
+        task = data.task_snapshot
+        if task is None or task.id != data.task_id:
+            task = await self._task_gateway.get_code_task_with_id(data.task_id)
         if not task:
             raise TaskDoesNotExistError(data.task_id)
 
         await self._ensure_actor_can_create_submission(actor_id=actor_id, task=task)
 
-        result_output, failed_test_idx = await self._check_submission(
-            actor_id=actor_id,
-            task=task,
-            submission=data.submission,
-        )
-        # result_output, failed_test_idx = await self._check_submission(
-        #     type='fsaf',
-        #     Message(
-        #         actor_id=actor_id,
-        #         task=task,
-        #         submission=data.submission
-        #     ),
-        # )
+        # web IDE submissions are limited by the api gateway before they are queued
+        if data.lane != PlaygroundLane.INTERACTIVE:
+            retry_after = await self._rate_limiter.acquire(user_id=actor_id, course_id=task.course_id)
+            if retry_after:
+                raise SubmissionRateLimitExceededError(retry_after=retry_after)
+
+        cache_key = _grading_cache_key(task=task, submission=data.submission)
+        grading_result = await self._grading_cache.get(cache_key)
+        if grading_result is None:
+            grading_result, cacheable = await self._check_submission(
+                actor_id=actor_id,
+                task=task,
+                submission=data.submission,
+                lane=data.lane,
+            )
+            if cacheable:
+                await self._grading_cache.set(cache_key, grading_result)
+
+        result_output, failed_test_idx = grading_result.output, grading_result.failed_test_idx
 
         submission = create_code_submission(
             user_id=actor_id,
@@ -128,58 +168,59 @@ class CreateCodeTaskSubmissionInteractor(CreateTaskSubmissionBaseInteractor):
             )
         return CreateCodeTaskSubmissionOutputData()
 
-    async def _check_submission(self, actor_id: UserID, task: CodeTask, submission: str) -> tuple[str, int]:
+    async def _check_submission(
+            self,
+            actor_id: UserID,
+            task: CodeTask,
+            submission: str,
+            lane: PlaygroundLane,
+    ) -> tuple[GradingResult, bool]:
+        """Returns the grading result and whether it may be cached"""
         async with self._playground_factory.create(
                 identifier=f'{actor_id}_{task.id}',
                 code_duration_timeout=task.code_duration_timeout,
+                lane=lane,
+                user_id=actor_id,
+                course_id=task.course_id,
         ) as pl:
-            self._pl = pl
-
             code = submission
             if task.prepared_code:
                 code = task.prepared_code + '\n' + submission
 
-            out, err = await pl.execute_code(code=code)
-            user_output = (out + '\n' + err).strip()
-            if err:
-                return f"Your Output:\n{user_output}", -1
-
-            for index, test in enumerate(task.tests):
-                output, passed = await self._check_test(
-                    test=test,
-                    pre_exec_code=code,
-                    user_submission_output=out,
-                    user_submission_stderr=err,
-                )
-                if not passed:
-                    return f"Your Output:\n{user_output}" + '\n\n' + output, index
-        return 'ok', -1
+            result = await pl.execute_tests(code=code, tests=[test.code for test in task.tests])
 
-    async def _check_test(
-            self,
-            test: CodeTaskTest,
-            pre_exec_code: str,
-            user_submission_output: str,
-            user_submission_stderr: str,
-    ) -> tuple[str, bool]:
-        # escaping potential quotes
-        user_submission_output = user_submission_output.replace('\'', '\\\'')
-        user_submission_stderr = user_submission_stderr.replace('\'', '\\\'')
-
-        # you can use 'stdout' variable to retrieve an output from the user's code
-        # and 'stderr' variable to retrieve a stderr from the user's code
-        test_code = (
-                f'{pre_exec_code}\n'
-                f'stdout = \'\'\'{user_submission_output}\'\'\'\n'
-                f'stderr = \'\'\'{user_submission_stderr}\'\'\'\n'
-                + test.code
-        )
+        # timeouts may be caused by a loaded sandbox rather than by the code itself
+        cacheable = not _has_timed_out(result)
+
+        user_output = (result.out + '\n' + result.err).strip()
+        if result.err:
+            return GradingResult(output=f"Your Output:\n{user_output}", failed_test_idx=-1), cacheable
+
+        for index, (_, test_err) in enumerate(result.tests):
+            if test_err:
+                return GradingResult(
+                    output=f"Your Output:\n{user_output}" + '\n\n' + f"Test Output:\n{test_err.strip()}",
+                    failed_test_idx=index,
+                ), cacheable
+        return GradingResult(output='ok', failed_test_idx=-1), cacheable
+
+
+def _grading_cache_key(task: CodeTask, submission: str) -> str:
+    """
+    Key is derived from everything the grading result depends on,
+    so any change of the task's code, tests or timeout makes its previous results unreachable
+    """
+    content = json.dumps([
+        task.prepared_code,
+        [test.code for test in task.tests],
+        task.code_duration_timeout,
+        submission,
+    ])
+    return f'{task.id}:{hashlib.sha256(content.encode()).hexdigest()}'
 
-        out, err = await self._pl.execute_code(code=test_code)
-        if err:
-            return f"Test Output:\n{err.strip()}", False
 
-        return out, True
+def _has_timed_out(result: CodeWithTestsResult) -> bool:
+    return any(err.startswith('TimeoutError:') for err in [result.err, *(test_err for _, test_err in result.tests)])
 
 
 @dataclass
@@ -36,7 +36,8 @@ class SubmissionData:
 class GetManySubmissionsOutputData:
     submissions: Sequence[SubmissionData]
     pagination: Pagination
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class GetActorSubmissionsInteractor:
@@ -70,10 +71,12 @@ class GetActorSubmissionsInteractor:
 
         data.filters.with_actor_id = actor_id
 
-        submissions_output_data, total = [], 0
+        submissions_output_data = []
+        total: int | None = 0
+        next_cursor: str | None = None
         match task.type:
             case TaskType.CODE:
-                code_submissions, total = await self._submission_gateway.many_with_code_task_id(
+                code_submissions, total, next_cursor = await self._submission_gateway.many_with_code_task_id(
                     task_id=task.id,
                     filters=data.filters,
                     pagination=data.pagination,
@@ -89,7 +92,7 @@ class GetActorSubmissionsInteractor:
                     submissions_output_data.append(submission_data)
 
             case TaskType.POLL:
-                poll_submissions, total = await self._submission_gateway.many_with_poll_task_id(
+                poll_submissions, total, next_cursor = await self._submission_gateway.many_with_poll_task_id(
                     task_id=task.id,
                     filters=data.filters,
                     pagination=data.pagination,
@@ -108,6 +111,7 @@ class GetActorSubmissionsInteractor:
             submissions=submissions_output_data,
             pagination=data.pagination,
             total=total,
+            next_cursor=next_cursor,
         )
 
 
@@ -145,10 +149,12 @@ class GetTaskSubmissionsInteractor:
         share_rules = await self._course_gateway.get_share_rules(course_id=course.id)
         ensure_actor_has_write_access(actor_id=actor_id, course=course, share_rules=share_rules)
 
-        submissions_output_data, total = [], 0
+        submissions_output_data = []
+        total: int | None = 0
+        next_cursor: str | None = None
         match task.type:
             case TaskType.CODE:
-                code_submissions, total = await self._submission_gateway.many_with_code_task_id(
+                code_submissions, total, next_cursor = await self._submission_gateway.many_with_code_task_id(
                     task_id=task.id,
                     filters=data.filters,
                     pagination=data.pagination,
@@ -163,7 +169,7 @@ class GetTaskSubmissionsInteractor:
                     submissions_output_data.append(submission_data)
 
             case TaskType.POLL:
-                poll_submissions, total = await self._submission_gateway.many_with_poll_task_id(
+                poll_submissions, total, next_cursor = await self._submission_gateway.many_with_poll_task_id(
                     task_id=task.id,
                     filters=data.filters,
                     pagination=data.pagination,
@@ -182,4 +188,5 @@ class GetTaskSubmissionsInteractor:
             submissions=submissions_output_data,
             pagination=data.pagination,
             total=total,
+            next_cursor=next_cursor,
         )
@@ -7,7 +7,7 @@ from learn_anything.course_platform.application.ports.auth.identity_provider imp
 from learn_anything.course_platform.application.ports.committer import Commiter
 from learn_anything.course_platform.application.ports.data.course_gateway import CourseGateway
 from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
-from learn_anything.course_platform.application.ports.playground import PlaygroundFactory, CodeIsInvalidError
+from learn_anything.course_platform.application.ports.playground import PlaygroundFactory, CodeIsInvalidError, PlaygroundLane
 from learn_anything.course_platform.domain.entities.course.errors import CourseDoesNotExistError
 from learn_anything.course_platform.domain.entities.course.models import CourseID
 from learn_anything.course_platform.domain.entities.course.rules import ensure_actor_has_write_access
@@ -128,6 +128,7 @@ class CreateCodeTaskInteractor:
 
         await self._ensure_codes_are_valid(
             actor_id=actor_id,
+            course_id=course.id,
             task_prepared_code=data.prepared_code,
             code_duration_timeout=data.code_duration_timeout,
             codes_of_tests=data.tests,
@@ -154,6 +155,7 @@ class CreateCodeTaskInteractor:
     async def _ensure_codes_are_valid(
             self,
             actor_id: UserID,
+            course_id: CourseID,
             task_prepared_code: str | None,
             codes_of_tests: Sequence[str],
             code_duration_timeout: int,
@@ -161,6 +163,9 @@ class CreateCodeTaskInteractor:
         async with self._playground_factory.create(
                 identifier=None,
                 code_duration_timeout=code_duration_timeout,
+                lane=PlaygroundLane.AUTHORING,
+                user_id=actor_id,
+                course_id=course_id,
         ) as pl:
             if task_prepared_code:
                 _, err = await pl.execute_code(code=task_prepared_code)
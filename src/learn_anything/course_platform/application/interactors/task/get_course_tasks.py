@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Sequence, TypeAlias
+from typing import Sequence, TypeAlias, cast
 
 from learn_anything.course_platform.application.input_data import Pagination
 from learn_anything.course_platform.application.ports.auth.identity_provider import IdentityProvider
@@ -14,7 +14,6 @@ from learn_anything.course_platform.domain.entities.course.rules import ensure_a
     actor_has_write_access
 from learn_anything.course_platform.domain.entities.task.enums import TaskType
 from learn_anything.course_platform.domain.entities.task.models import TaskID, CodeTask
-from learn_anything.course_platform.domain.entities.task.rules import is_task_solved_by_actor
 
 
 @dataclass
@@ -71,7 +70,8 @@ AnyTaskData: TypeAlias = TheoryTaskData | CodeTaskData
 class GetCourseTasksOutputData:
     tasks: Sequence[AnyTaskData]
     pagination: Pagination
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class GetCourseTasksInteractor:
@@ -97,14 +97,17 @@ class GetCourseTasksInteractor:
 
         ensure_actor_has_read_access(actor_id=actor_id, course=course, share_rules=share_rules)
 
-        tasks, total = await self._task_gateway.with_course(
+        # one query for the whole page instead of loading the tests and submissions of every task one by one
+        tasks, total, next_cursor = await self._task_gateway.with_course_and_submissions_stats(
             course_id=data.course_id,
+            actor_id=actor_id,
             pagination=data.pagination,
             filters=data.filters,
         )
 
         tasks_output_data = []
-        for task in tasks:
+        for task_with_stats in tasks:
+            task, submissions_stats = task_with_stats.task, task_with_stats.submissions_stats
             # creator = await self._user_gateway.with_id(task.creator_id)
 
             base_task_data = BaseTaskData(
@@ -136,19 +139,7 @@ class GetCourseTasksInteractor:
                 )
 
             elif task.type == TaskType.CODE:
-                code_task: CodeTask = await self._task_gateway.get_code_task_with_id(
-                    task_id=task.id
-                )  # type:ignore[assignment]
-
-                total_submissions = await self._submission_gateway.total_with_task_id(task_id=code_task.id)
-                total_correct_submissions = await self._submission_gateway.total_correct_with_task_id(
-                    task_id=code_task.id
-                )
-
-                user_submissions = await self._submission_gateway.with_id(
-                    user_id=actor_id,
-                    task_id=code_task.id,
-                )
+                code_task = cast(CodeTask, task)
                 task_data = CodeTaskData(
                     id=base_task_data.id,
                     title=base_task_data.title,
@@ -160,10 +151,10 @@ class GetCourseTasksInteractor:
                     updated_at=base_task_data.updated_at,
                     actor_has_write_access=base_task_data.actor_has_write_access,
                     attempts_limit=code_task.attempts_limit,
-                    total_actor_submissions=len(user_submissions),
-                    total_submissions=total_submissions,
-                    total_correct_submissions=total_correct_submissions,
-                    solved_by_actor=is_task_solved_by_actor(actor_submissions=user_submissions),
+                    total_actor_submissions=submissions_stats.total_actor_submissions,
+                    total_submissions=submissions_stats.total_submissions,
+                    total_correct_submissions=submissions_stats.total_correct_submissions,
+                    solved_by_actor=submissions_stats.solved_by_actor,
                     code_duration_timeout=code_task.code_duration_timeout,
                     prepared_code=code_task.prepared_code,
                     is_published=course.is_published,
@@ -195,4 +186,5 @@ class GetCourseTasksInteractor:
             tasks=tasks_output_data,
             pagination=data.pagination,
             total=total,
+            next_cursor=next_cursor,
         )
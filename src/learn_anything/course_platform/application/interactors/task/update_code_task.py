@@ -9,7 +9,7 @@ from learn_anything.course_platform.application.ports.data.course_gateway import
 from learn_anything.course_platform.application.ports.data.file_manager import FileManager
 from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
 from learn_anything.course_platform.application.ports.data.user_gateway import UserGateway
-from learn_anything.course_platform.application.ports.playground import PlaygroundFactory
+from learn_anything.course_platform.application.ports.playground import PlaygroundFactory, PlaygroundLane
 from learn_anything.course_platform.domain.entities.course.rules import ensure_actor_has_write_access
 from learn_anything.course_platform.domain.entities.task.errors import CodeTaskTestAlreadyExistsError, \
     TaskDoesNotExistError
@@ -66,6 +66,9 @@ class UpdateCodeTaskInteractor:
             if data.prepared_code != UNSET:
                 async with self._playground_factory.create(
                         code_duration_timeout=task.code_duration_timeout,
+                        lane=PlaygroundLane.AUTHORING,
+                        user_id=actor_id,
+                        course_id=course.id,
                 ) as pl:
                     out, err = await pl.execute_code(code=data.prepared_code)
                     if err:
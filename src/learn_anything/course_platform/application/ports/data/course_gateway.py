@@ -34,36 +34,27 @@ class GetManyCoursesFilters:
         return self.author_name == other.author_name and self.title == other.title
 
 
-
-@dataclass
-class GetCoursesActorCreatedFilters:
-    title: str | None = None
-    sort_by: SortBy = SortBy.DATE
-
-
 class CourseGateway(Protocol):
     async def with_id(self, course_id: CourseID) -> Course:
         raise NotImplementedError
 
-    async def with_creator(
-            self,
-            user_id: UserID,
-            pagination: Pagination,
-            filters: GetCoursesActorCreatedFilters,
-    ) -> tuple[Sequence[Course], int]:
-        raise NotImplementedError
-
     # todo: rewrite this (srp violation)
+    # returns the page, the total if pagination asks for it and the cursor of the next page if there is one
+    # title and author_name of the filters are not applied, courses are searched by them with CourseSearch
     async def all(
             self,
             pagination: Pagination,
             filters: GetManyCoursesFilters,
-    ) -> tuple[Sequence[Course], int]:
+    ) -> tuple[Sequence[Course], int | None, str | None]:
         raise NotImplementedError
 
     async def save(self, course: Course) -> CourseID:
         raise NotImplementedError
 
+    async def update_total_registered(self, course_id: CourseID, delta: int) -> bool:
+        """Returns False if the counter was not increased because the registrations limit is reached"""
+        raise NotImplementedError
+
     async def delete(self, course_id: CourseID) -> None:
         raise NotImplementedError
 
@@ -81,6 +72,9 @@ class RegistrationForCourseGateway(Protocol):
     async def read(self, user_id: UserID, course_id: CourseID) -> RegistrationForCourse | None:
         raise NotImplementedError
 
+    async def read_many(self, user_id: UserID, course_ids: Sequence[CourseID]) -> Sequence[RegistrationForCourse]:
+        raise NotImplementedError
+
     async def save(self, registration: RegistrationForCourse) -> None:
         raise NotImplementedError
 
@@ -0,0 +1,16 @@
+from typing import Protocol, Sequence
+
+from learn_anything.course_platform.application.input_data import Pagination
+from learn_anything.course_platform.application.ports.data.course_gateway import GetManyCoursesFilters
+from learn_anything.course_platform.domain.entities.course.models import Course
+
+
+class CourseSearch(Protocol):
+    # finds courses by filters.title and filters.author_name, the best matches go first.
+    # Returns the page, the total if pagination asks for it and the cursor of the next page if there is one
+    async def search(
+            self,
+            pagination: Pagination,
+            filters: GetManyCoursesFilters,
+    ) -> tuple[Sequence[Course], int | None, str | None]:
+        raise NotImplementedError
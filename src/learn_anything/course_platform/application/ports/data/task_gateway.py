@@ -5,6 +5,7 @@ from typing import Protocol, Sequence
 from learn_anything.course_platform.application.input_data import Pagination
 from learn_anything.course_platform.domain.entities.course.models import CourseID
 from learn_anything.course_platform.domain.entities.task.models import TaskID, Task, CodeTask, PollTask, TextInputTask
+from learn_anything.course_platform.domain.entities.user.models import UserID
 
 
 class SortBy(StrEnum):
@@ -17,6 +18,21 @@ class GetTasksFilters:
     sort_by: SortBy
 
 
+@dataclass
+class TaskSubmissionsStats:
+    total_submissions: int
+    total_correct_submissions: int
+    total_actor_submissions: int
+    solved_by_actor: bool
+
+
+@dataclass
+class TaskWithSubmissionsStats:
+    # code tasks come as CodeTask with their tests
+    task: Task
+    submissions_stats: TaskSubmissionsStats
+
+
 class TaskGateway(Protocol):
     async def with_id(self, task_id: TaskID) -> Task | None:
         raise NotImplementedError
@@ -35,7 +51,16 @@ class TaskGateway(Protocol):
             course_id: CourseID,
             pagination: Pagination,
             filters: GetTasksFilters | None
-    ) -> tuple[Sequence[Task], int]:
+    ) -> tuple[Sequence[Task], int | None, str | None]:
+        raise NotImplementedError
+
+    async def with_course_and_submissions_stats(
+            self,
+            course_id: CourseID,
+            actor_id: UserID,
+            pagination: Pagination,
+            filters: GetTasksFilters | None
+    ) -> tuple[Sequence[TaskWithSubmissionsStats], int | None, str | None]:
         raise NotImplementedError
 
     async def total_with_course(self, course_id: CourseID) -> int:
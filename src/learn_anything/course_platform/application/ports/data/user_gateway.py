@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Protocol, Sequence
 
 from learn_anything.course_platform.domain.entities.user.models import User, UserID
 
@@ -7,6 +7,9 @@ class UserGateway(Protocol):
     async def with_id(self, user_id: UserID) -> User | None:
         raise NotImplementedError
 
+    async def with_ids(self, user_ids: Sequence[UserID]) -> Sequence[User]:
+        raise NotImplementedError
+
     async def with_username(self, username: str) -> User | None:
         raise NotImplementedError
 
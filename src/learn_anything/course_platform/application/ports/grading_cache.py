@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass
+class GradingResult:
+    output: str
+    # -1 if all tests passed or the submission itself failed
+    failed_test_idx: int
+
+
+class GradingCache(Protocol):
+    async def get(self, key: str) -> GradingResult | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, result: GradingResult) -> None:
+        raise NotImplementedError
@@ -1,12 +1,25 @@
 from dataclasses import dataclass
-from typing import Protocol, Self, Any
+from enum import StrEnum, auto
+from typing import Protocol, Self, Any, Sequence
 
 from typing_extensions import NewType
 
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
 StdOut = NewType('StdOut', str)
 StdErr = NewType('StdErr', str)
 
 
+class PlaygroundLane(StrEnum):
+    # submissions from the web IDE, the user is waiting for the result on the page
+    INTERACTIVE = auto()
+    # submissions from the bot
+    GRADING = auto()
+    # checks of the code written by course authors while they edit tasks
+    AUTHORING = auto()
+
+
 @dataclass
 class CodeIsInvalidError(Exception):
     code: str
@@ -14,6 +27,14 @@ class CodeIsInvalidError(Exception):
     err: str
 
 
+@dataclass
+class CodeWithTestsResult:
+    out: StdOut
+    err: StdErr
+    # results of the tests which were executed, tests after the first failed one are not run
+    tests: list[tuple[StdOut, StdErr]]
+
+
 class Playground(Protocol):
     async def __aenter__(self) -> Self:
         raise NotImplementedError
@@ -24,11 +45,22 @@ class Playground(Protocol):
     async def execute_code(self, code: str, raise_exc_on_err: bool = False) -> tuple[StdOut, StdErr]:
         raise NotImplementedError
 
+    async def execute_tests(self, code: str, tests: Sequence[str]) -> CodeWithTestsResult:
+        """
+        Execute the code and then every test against it in one go.
+        Test can use 'stdout' and 'stderr' variables to retrieve an output of the code, it fails if it writes to stderr
+        """
+        raise NotImplementedError
+
 
 class PlaygroundFactory(Protocol):
     def create(
             self,
             code_duration_timeout: int,
             identifier: str | None = None,
+            lane: PlaygroundLane = PlaygroundLane.GRADING,
+            user_id: UserID | None = None,
+            course_id: CourseID | None = None,
     ) -> Playground:
+        """Playground is taken in turn with the others of the same lane, user and course when it is entered"""
         raise NotImplementedError
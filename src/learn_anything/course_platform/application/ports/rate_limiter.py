@@ -0,0 +1,13 @@
+from typing import Protocol
+
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+
+class SubmissionRateLimiter(Protocol):
+    async def acquire(self, user_id: UserID, course_id: CourseID) -> float:
+        """
+        Take one submission from the quotas of the user and of the course.
+        Returns 0 if the submission is allowed, otherwise the number of seconds until it will be
+        """
+        raise NotImplementedError
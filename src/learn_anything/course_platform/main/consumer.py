@@ -2,14 +2,13 @@ import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, cast
+from functools import partial
+from typing import AsyncGenerator, Awaitable
 
-import msgpack
 import redis.asyncio as aioredis
 import uvicorn
-from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, ExchangeType
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage
 from aiogram import Dispatcher, Bot
-from aiogram.types import Update
 from dishka import AsyncContainer
 from dishka.integrations.aiogram import setup_dishka
 from fastapi import FastAPI
@@ -18,44 +17,58 @@ from learn_anything.course_platform.adapters.bootstrap.tg_bot_di import setup_di
 from learn_anything.course_platform.adapters.logger import logger, correlation_id_ctx, LOGGING_CONFIG
 from learn_anything.course_platform.adapters.metrics import TOTAL_MESSAGES_CONSUMED
 from learn_anything.course_platform.adapters.persistence.tables.map import map_tables
-from learn_anything.course_platform.adapters.redis.config import load_redis_config
+from learn_anything.course_platform.adapters.playground.config import PlaygroundConfig
+from learn_anything.course_platform.adapters.rmq.config import RMQConfig
 from learn_anything.course_platform.adapters.rmq.ide_consumer import start_ide_consumer
-from learn_anything.course_platform.presentation.bg_tasks import background_tasks
+from learn_anything.course_platform.adapters.rmq.tg_updates import declare_tg_updates_topology, \
+    TG_UPDATES_EXCHANGE, unpack_update
+from learn_anything.course_platform.adapters.rmq.tg_updates_retry import declare_tg_updates_retry_topology, \
+    TgUpdatesRetrier
+from learn_anything.course_platform.adapters.rmq.worker_pool import ConsumerWorkerPool
 from learn_anything.course_platform.presentation.tg_bot.handlers import register_handlers
 from learn_anything.course_platform.presentation.tg_bot.middlewares.__logging import LoggingMiddleware
 from learn_anything.course_platform.presentation.tg_bot.middlewares.auth import AuthMiddleware
 from learn_anything.course_platform.presentation.web.config import load_web_config
 from learn_anything.course_platform.presentation.web.fastapi_routers.tech import router
-from learn_anything.course_platform.adapters.playground.unix_playground import VirtualMachinePool
+from learn_anything.course_platform.application.ports.playground import PlaygroundFactory
 
-RETRIES_NUMBER = 5
-
-
-async def callback(msg: AbstractIncomingMessage, dp: Dispatcher, bot: Bot) -> None:
+async def callback(msg: AbstractIncomingMessage, dp: Dispatcher, bot: Bot, retrier: TgUpdatesRetrier) -> None:
     if msg.correlation_id:
         correlation_id_ctx.set(msg.correlation_id)
 
-    update_dct = msgpack.unpackb(msg.body)
     logger.info('Processing update..')
-    update = Update.model_validate(update_dct)
+    TOTAL_MESSAGES_CONSUMED.inc()
+    try:
+        update = unpack_update(msg.body, bot=bot)
+    except Exception as e:
+        # there is no point in retrying an update which can not be decoded
+        logger.exception(e)
+        await _settle_failed(msg, retrier.dead_letter(msg, e))
+        return
 
-    for _ in range(RETRIES_NUMBER):
-        try:
-            await dp.feed_update(bot=bot, update=update)
-            await msg.ack()
-            return
-        except Exception as e:
-            logger.exception(e)
-            await asyncio.sleep(1.5)  # no spamming
-        finally:
-            TOTAL_MESSAGES_CONSUMED.inc()
+    try:
+        await dp.feed_update(bot=bot, update=update)
+    except Exception as e:
+        logger.exception(e)
+        await _settle_failed(msg, retrier.retry(msg, e))
+        return
 
-    await msg.reject()
+    await msg.ack()
 
 
-async def start_consumer(container: AsyncContainer) -> None:
-    queue_name = "tg_updates"
+async def _settle_failed(msg: AbstractIncomingMessage, republish: Awaitable[None]) -> None:
+    try:
+        await republish
+    except Exception as e:
+        # the update must not be lost, the broker will deliver it again
+        logger.exception('Failed to republish the update: %s', e)
+        await msg.nack(requeue=True)
+        return
+
+    await msg.ack()
+
 
+async def start_consumer(container: AsyncContainer) -> None:
     dp = await container.get(Dispatcher)
     dp.message.middleware.register(AuthMiddleware(container))
     dp.callback_query.outer_middleware.register(AuthMiddleware(container))
@@ -69,28 +82,30 @@ async def start_consumer(container: AsyncContainer) -> None:
     register_handlers(dp)
 
     bot = await container.get(Bot)
+    rmq_cfg = await container.get(RMQConfig)
     async with container() as request_container:
         channel = await request_container.get(AbstractChannel)
 
-        # Will take no more than 10 messages in advance
-        await channel.set_qos(prefetch_count=10)
+        # Declaring queues
+        _, queues = await declare_tg_updates_topology(channel, shards_number=rmq_cfg.tg_updates_shards)
+        retry_exchange, _ = await declare_tg_updates_retry_topology(
+            channel,
+            retry_delay=rmq_cfg.tg_updates_retry_delay,
+        )
+        consumed_shards = rmq_cfg.tg_updates_consumed_shards or range(rmq_cfg.tg_updates_shards)
 
-        # Declaring queue
-        exchange = await channel.declare_exchange("tg_updates", ExchangeType.TOPIC, durable=True)
-        queue = await channel.declare_queue(name=queue_name, durable=True)
-        await queue.bind(
-            exchange,
-            queue_name,
+        retrier = TgUpdatesRetrier(channel, retry_exchange, max_retries=rmq_cfg.tg_updates_max_retries)
+        worker_pool = ConsumerWorkerPool(
+            queue_name=TG_UPDATES_EXCHANGE,
+            handler=partial(callback, dp=dp, bot=bot, retrier=retrier),
+            concurrency=rmq_cfg.tg_updates_concurrency,
         )
 
-        logger.info('Starting consumer')
-        async for message in queue.iterator():
-            process_update_task = asyncio.create_task(callback(cast(AbstractIncomingMessage, message), dp, bot))
-            process_update_task.add_done_callback(background_tasks.discard)
+        # Workers take no more messages in advance than they can process soon, whatever the number of shards
+        await channel.set_qos(prefetch_count=worker_pool.prefetch_count, global_=True)
 
-            background_tasks.add(
-                process_update_task
-            )
+        logger.info('Starting consumer of shards %s', list(consumed_shards))
+        await worker_pool.run(*(queues[shard] for shard in consumed_shards))
 
 
 @asynccontextmanager
@@ -100,34 +115,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info('Setup ioc')
     container = setup_di()
 
-    logger.info('Pre-warming VM Pool')
-    vm_pool = await container.get(VirtualMachinePool)
+    logger.info('Pre-warming playground')
+    await container.get(PlaygroundFactory)
 
     tg_task = asyncio.create_task(start_consumer(container))
 
-    # Start IDE submissions consumer (separate channel + redis)
-    cfg_path = os.getenv('COURSE_PLATFORM_CONFIG_PATH') or DEFAULT_COURSE_PLATFORM_CONFIG_PATH
-    redis_cfg = load_redis_config(cfg_path)
-    redis_client: aioredis.Redis = aioredis.from_url(redis_cfg.dsn)  # type: ignore[type-arg]
+    # Start IDE submissions consumer (separate channel, shared redis pool)
+    redis_client = await container.get(aioredis.Redis)
     async with container() as request_container:
         ide_channel = await request_container.get(AbstractChannel)
 
+    rmq_cfg = await container.get(RMQConfig)
+    playground_cfg = await container.get(PlaygroundConfig)
     ide_task = asyncio.create_task(
-        start_ide_consumer(channel=ide_channel, redis_client=redis_client, container=container)
+        start_ide_consumer(
+            channel=ide_channel,
+            redis_client=redis_client,
+            container=container,
+            concurrency=rmq_cfg.ide_submissions_concurrency or playground_cfg.capacity,
+        )
     )
 
     logger.info('Started successfully')
     yield
 
+    # consumers stop taking new messages and finish the ones they have already received
     for task in (tg_task, ide_task):
-        if task is not None:
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-
-    await redis_client.aclose()
+        task.cancel()
+    await asyncio.gather(tg_task, ide_task, return_exceptions=True)
+
+    await container.close()
     logger.info('Ending lifespan')
 
 
@@ -50,23 +50,26 @@ async def get_all_courses(
     filters = data.get('all_courses_filters', DEFAULT_FILTERS)
     pointer = data.get('all_courses_pointer', 0)
     offset = data.get('all_courses_offset', 0)
+    cursor = data.get('all_courses_cursor')
 
     output_data = await interactor.execute(
         GetManyCoursesInputData(
-            pagination=Pagination(offset=offset, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=offset, cursor=cursor, limit=DEFAULT_LIMIT, with_total=False),
             filters=filters,
         )
     )
     courses = data.get('all_courses', output_data.courses)
-    courses[offset: offset + DEFAULT_LIMIT] = output_data.courses
+    courses[offset:] = output_data.courses
 
-    total = output_data.total
+    # exact total is not counted, it is enough to know whether there is one more page
+    total = len(courses) + bool(output_data.next_cursor)
 
     await state.update_data(
         all_courses=courses,
         all_courses_pointer=pointer,
         all_courses_offset=offset,
-        all_courses_total=output_data.total,
+        all_courses_next_cursor=output_data.next_cursor,
+        all_courses_total=total,
         all_courses_filters=filters,
     )
 
@@ -308,6 +311,7 @@ async def reset_filters(
         all_courses_new_filters=DEFAULT_FILTERS,
         all_courses_pointer=0,
         all_courses_offset=0,
+        all_courses_cursor=None,
     )
 
     await bot.edit_message_reply_markup(
@@ -342,19 +346,21 @@ async def apply_filters(
 
     output_data = await interactor.execute(
         GetManyCoursesInputData(
-            pagination=Pagination(offset=0, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=0, limit=DEFAULT_LIMIT, with_total=False),
             filters=data['all_courses_filters'],
         )
     )
 
     courses = output_data.courses
-    total = output_data.total
+    total = len(courses) + bool(output_data.next_cursor)
 
     data = await state.update_data(
         all_courses=courses,
         all_courses_total=total,
+        all_courses_next_cursor=output_data.next_cursor,
         all_courses_pointer=0,
         all_courses_offset=0,
+        all_courses_cursor=None,
     )
 
     filters = data['all_courses_filters']
@@ -528,16 +534,24 @@ async def watch_all_courses_prev_or_next(
         if (pointer + 1) == (offset + DEFAULT_LIMIT):
             output_data = await interactor.execute(
                 GetManyCoursesInputData(
-                    pagination=Pagination(offset=offset + DEFAULT_LIMIT, limit=DEFAULT_LIMIT),
+                    pagination=Pagination(
+                        offset=offset + DEFAULT_LIMIT,
+                        cursor=data.get('all_courses_next_cursor'),
+                        limit=DEFAULT_LIMIT,
+                        with_total=False,
+                    ),
                     filters=data.get('all_courses_filters', DEFAULT_FILTERS),
                 )
             )
 
             courses.extend(output_data.courses)
+            total = len(courses) + bool(output_data.next_cursor)
             await state.update_data(
                 all_courses=courses,
                 all_courses_offset=offset + DEFAULT_LIMIT,
-                all_courses_total=output_data.total
+                all_courses_cursor=data.get('all_courses_next_cursor'),
+                all_courses_next_cursor=output_data.next_cursor,
+                all_courses_total=total,
             )
 
         pointer += 1
@@ -47,23 +47,26 @@ async def get_actor_created_courses(
     filters = data.get('created_courses_filters', DEFAULT_FILTERS)
     pointer = data.get('created_courses_pointer', 0)
     offset = data.get('created_courses_offset', 0)
+    cursor = data.get('created_courses_cursor')
 
     output_data = await interactor.execute(
         GetManyCoursesInputData(
-            pagination=Pagination(offset=offset, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=offset, cursor=cursor, limit=DEFAULT_LIMIT, with_total=False),
             filters=filters,
         )
     )
     courses = data.get('created_courses', output_data.courses)
-    courses[offset: offset + DEFAULT_LIMIT] = output_data.courses
+    courses[offset:] = output_data.courses
 
-    total = output_data.total
+    # exact total is not counted, it is enough to know whether there is one more page
+    total = len(courses) + bool(output_data.next_cursor)
 
     await state.update_data(
         created_courses=courses,
         created_courses_pointer=pointer,
         created_courses_offset=offset,
-        created_courses_total=output_data.total,
+        created_courses_next_cursor=output_data.next_cursor,
+        created_courses_total=total,
         created_courses_filters=filters,
     )
 
@@ -245,6 +248,7 @@ async def reset_course_actor_created_filters(
         created_courses_new_filters=DEFAULT_FILTERS,
         created_courses_pointer=0,
         created_courses_offset=0,
+        created_courses_cursor=None,
     )
 
     await bot.edit_message_reply_markup(
@@ -279,19 +283,21 @@ async def apply_courses_actor_created_filters(
 
     output_data = await interactor.execute(
         GetManyCoursesInputData(
-            pagination=Pagination(offset=0, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=0, limit=DEFAULT_LIMIT, with_total=False),
             filters=data['created_courses_filters'],
         )
     )
 
     courses = output_data.courses
-    total = output_data.total
+    total = len(courses) + bool(output_data.next_cursor)
 
     data = await state.update_data(
         created_courses=courses,
         created_courses_total=total,
+        created_courses_next_cursor=output_data.next_cursor,
         created_courses_pointer=0,
         created_courses_offset=0,
+        created_courses_cursor=None,
     )
 
     filters = data['created_courses_filters']
@@ -463,16 +469,24 @@ async def watch_actor_created_courses_prev_or_next(
         if (pointer + 1) == (offset + DEFAULT_LIMIT):
             output_data = await interactor.execute(
                 GetManyCoursesInputData(
-                    pagination=Pagination(offset=offset + DEFAULT_LIMIT, limit=DEFAULT_LIMIT),
+                    pagination=Pagination(
+                        offset=offset + DEFAULT_LIMIT,
+                        cursor=data.get('created_courses_next_cursor'),
+                        limit=DEFAULT_LIMIT,
+                        with_total=False,
+                    ),
                     filters=data.get('created_courses_filters', DEFAULT_FILTERS),
                 )
             )
 
             courses.extend(output_data.courses)
+            total = len(courses) + bool(output_data.next_cursor)
             await state.update_data(
                 created_courses=courses,
                 created_courses_offset=offset + DEFAULT_LIMIT,
-                created_courses_total=output_data.total
+                created_courses_cursor=data.get('created_courses_next_cursor'),
+                created_courses_next_cursor=output_data.next_cursor,
+                created_courses_total=total,
             )
 
         pointer += 1
@@ -47,26 +47,29 @@ async def get_actor_registered_courses(
     data: dict[str, Any] = await state.get_data()
 
     offset = data.get('registered_courses_offset', 0)
+    cursor = data.get('registered_courses_cursor')
     pointer = data.get('registered_courses_pointer', 0)
     filters = data.get('registered_courses_filters', DEFAULT_FILTERS)
 
     output_data = await interactor.execute(
         GetManyCoursesInputData(
-            pagination=Pagination(offset=offset, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=offset, cursor=cursor, limit=DEFAULT_LIMIT, with_total=False),
             filters=filters,
         )
     )
 
     courses = data.get('registered_courses', output_data.courses)
-    courses[offset: offset + DEFAULT_LIMIT] = output_data.courses
+    courses[offset:] = output_data.courses
 
-    total = output_data.total
+    # exact total is not counted, it is enough to know whether there is one more page
+    total = len(courses) + bool(output_data.next_cursor)
 
     await state.update_data(
         registered_courses=courses,
         registered_courses_pointer=pointer,
         registered_courses_offset=offset,
-        registered_courses_total=output_data.total,
+        registered_courses_next_cursor=output_data.next_cursor,
+        registered_courses_total=total,
         registered_courses_filters=filters,
     )
 
@@ -246,6 +249,7 @@ async def reset_course_actor_registered_filters(
         registered_courses_new_filters=DEFAULT_FILTERS,
         registered_courses_pointer=0,
         registered_courses_offset=0,
+        registered_courses_cursor=None,
     )
 
     await bot.edit_message_reply_markup(
@@ -280,19 +284,21 @@ async def apply_courses_actor_registered_filters(
 
     output_data = await interactor.execute(
         GetManyCoursesInputData(
-            pagination=Pagination(offset=0, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=0, limit=DEFAULT_LIMIT, with_total=False),
             filters=data['registered_courses_filters'],
         )
     )
 
     courses = output_data.courses
-    total = output_data.total
+    total = len(courses) + bool(output_data.next_cursor)
 
     data = await state.update_data(
         registered_courses=courses,
         registered_courses_total=total,
+        registered_courses_next_cursor=output_data.next_cursor,
         registered_courses_pointer=0,
         registered_courses_offset=0,
+        registered_courses_cursor=None,
     )
 
     filters = data['registered_courses_filters']
@@ -464,16 +470,24 @@ async def watch_actor_registered_courses_prev_or_next(
         if (pointer + 1) == (offset + DEFAULT_LIMIT):
             output_data = await interactor.execute(
                 GetManyCoursesInputData(
-                    pagination=Pagination(offset=offset + DEFAULT_LIMIT, limit=DEFAULT_LIMIT),
+                    pagination=Pagination(
+                        offset=offset + DEFAULT_LIMIT,
+                        cursor=data.get('registered_courses_next_cursor'),
+                        limit=DEFAULT_LIMIT,
+                        with_total=False,
+                    ),
                     filters=data.get('registered_courses_filters', DEFAULT_FILTERS),
                 )
             )
 
             courses.extend(output_data.courses)
+            total = len(courses) + bool(output_data.next_cursor)
             await state.update_data(
                 registered_courses=courses,
                 registered_courses_offset=offset + DEFAULT_LIMIT,
-                registered_courses_total=output_data.total
+                registered_courses_cursor=data.get('registered_courses_next_cursor'),
+                registered_courses_next_cursor=output_data.next_cursor,
+                registered_courses_total=total,
             )
 
         pointer += 1
@@ -37,30 +37,33 @@ async def get_my_submissions(
     filters = data.get(f'actor_submissions_{task_id}_filters', DEFAULT_FILTERS)
     pointer: int = data.get(f'actor_submissions_{task_id}_pointer', 0)
     offset: int = data.get(f'actor_submissions_{task_id}_offset', 0)
+    cursor: str | None = data.get(f'actor_submissions_{task_id}_cursor')
 
     output_data = await interactor.execute(
         data=GetManySubmissionsInputData(
             task_id=TaskID(int(task_id)),
-            pagination=Pagination(offset=offset, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=offset, cursor=cursor, limit=DEFAULT_LIMIT, with_total=False),
             filters=filters,
         )
     )
 
     submissions = data.get(f'actor_submissions_{task_id}', output_data.submissions)
-    submissions[offset: offset + DEFAULT_LIMIT] = output_data.submissions
+    submissions[offset:] = output_data.submissions
+    # exact total is not counted, it is enough to know whether there is one more page
+    total = len(submissions) + bool(output_data.next_cursor)
 
     data = await state.update_data(
         {
             f'actor_submissions_{task_id}': submissions,
             f'actor_submissions_{task_id}_pointer': pointer,
             f'actor_submissions_{task_id}_offset': offset,
-            f'actor_submissions_{task_id}_total': output_data.total,
+            f'actor_submissions_{task_id}_next_cursor': output_data.next_cursor,
+            f'actor_submissions_{task_id}_total': total,
             f'actor_submissions_{task_id}_filters': filters,
             'task_id': task_id,
         }
     )
 
-    total = output_data.total
     if total == 0:
         msg_text = 'Вы еще ни разу не решали эту задачу'
 
@@ -118,18 +121,26 @@ async def watch_actor_submissions_prev_or_next(
             output_data = await interactor.execute(
                 data=GetManySubmissionsInputData(
                     task_id=TaskID(int(task_id)),
-                    pagination=Pagination(offset=offset + DEFAULT_LIMIT, limit=DEFAULT_LIMIT),
+                    pagination=Pagination(
+                        offset=offset + DEFAULT_LIMIT,
+                        cursor=data.get(f'actor_submissions_{task_id}_next_cursor'),
+                        limit=DEFAULT_LIMIT,
+                        with_total=False,
+                    ),
                     filters=filters,
                 )
             )
 
             submissions.extend(output_data.submissions)
+            total = len(submissions) + bool(output_data.next_cursor)
             await state.update_data(
                 {
                     f'actor_submissions_{task_id}': submissions,
                     f'actor_submissions_{task_id}_pointer': 0,
                     f'actor_submissions_{task_id}_offset': offset + DEFAULT_LIMIT,
-                    f'actor_submissions_{task_id}_total': output_data.total,
+                    f'actor_submissions_{task_id}_cursor': data.get(f'actor_submissions_{task_id}_next_cursor'),
+                    f'actor_submissions_{task_id}_next_cursor': output_data.next_cursor,
+                    f'actor_submissions_{task_id}_total': total,
                     f'actor_submissions_{task_id}_filters': filters,
                 }
             )
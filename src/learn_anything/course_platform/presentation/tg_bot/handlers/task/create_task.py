@@ -149,6 +149,18 @@ async def get_or_skip_course_task_topic(
     )
 
 
+async def _count_course_tasks(course_id: CourseID, get_course_tasks_interactor: GetCourseTasksInteractor) -> int:
+    # new task is put at the end of the course, so its index is the exact number of tasks,
+    # the total kept in the state while browsing the tasks is only the number of loaded ones
+    output_data = await get_course_tasks_interactor.execute(
+        data=GetCourseTasksInputData(
+            course_id=course_id,
+            pagination=Pagination(offset=0, limit=0, with_total=True)
+        )
+    )
+    return cast(int, output_data.total)
+
+
 @router.callback_query(
     StateFilter(CreateTaskForm.get_type),
     F.data.startswith('create_course_task_type-'),
@@ -174,14 +186,7 @@ async def get_course_task_type(
 
     await bot.delete_message(chat_id=user_id, message_id=data['msg_on_delete'])
 
-    output_data = await get_course_tasks_interactor.execute(
-        data=GetCourseTasksInputData(
-            course_id=course_id,
-            pagination=Pagination(offset=0, limit=0)
-        )
-    )
-
-    index_in_course = output_data.total
+    index_in_course = await _count_course_tasks(course_id, get_course_tasks_interactor)
     match task_type:
         case TaskType.THEORY:
             await state.set_state(state=None)
@@ -407,6 +412,7 @@ async def finish_task_creation(
         state: FSMContext,
         bot: Bot,
         interactor: FromDishka[CreateCodeTaskInteractor],
+        get_course_tasks_interactor: FromDishka[GetCourseTasksInteractor],
 ) -> None:
     user_id: int = callback_query.from_user.id
     data: dict[str, Any] = await state.get_data()
@@ -419,7 +425,7 @@ async def finish_task_creation(
     body = data['body']
     topic = data['topic']
     prepared_code = data['prepared_code']
-    index_in_course = int(data.get(f'course_{course_id}_tasks_total', 0))
+    index_in_course = await _count_course_tasks(CourseID(int(course_id)), get_course_tasks_interactor)
 
     try:
         await interactor.execute(
@@ -42,24 +42,27 @@ async def get_course_tasks(
 
     pointer = data.get(f'course_{course_id}_tasks_pointer', 0)
     offset = data.get(f'course_{course_id}_tasks_offset', 0)
+    cursor = data.get(f'course_{course_id}_tasks_cursor')
 
     output_data = await interactor.execute(
         GetCourseTasksInputData(
             course_id=CourseID(int(course_id)),
-            pagination=Pagination(offset=offset, limit=DEFAULT_LIMIT),
+            pagination=Pagination(offset=offset, cursor=cursor, limit=DEFAULT_LIMIT, with_total=False),
         )
     )
     tasks = data.get(f'course_{course_id}_tasks', output_data.tasks)
-    tasks[offset: offset + DEFAULT_LIMIT] = output_data.tasks
+    tasks[offset:] = output_data.tasks
 
-    total = output_data.total
+    # exact total is not counted, it is enough to know whether there is one more page
+    total = len(tasks) + bool(output_data.next_cursor)
 
     data = await state.update_data(
         {
             f'course_{course_id}_tasks': tasks,
             f'course_{course_id}_tasks_pointer': pointer,
             f'course_{course_id}_tasks_offset': offset,
-            f'course_{course_id}_tasks_total': output_data.total,
+            f'course_{course_id}_tasks_next_cursor': output_data.next_cursor,
+            f'course_{course_id}_tasks_total': total,
         },
     )
 
@@ -129,16 +132,24 @@ async def watch_course_tasks_prev_or_next(
             output_data = await interactor.execute(
                 GetCourseTasksInputData(
                     course_id=CourseID(int(course_id)),
-                    pagination=Pagination(offset=offset + DEFAULT_LIMIT, limit=DEFAULT_LIMIT),
+                    pagination=Pagination(
+                        offset=offset + DEFAULT_LIMIT,
+                        cursor=data.get(f'course_{course_id}_tasks_next_cursor'),
+                        limit=DEFAULT_LIMIT,
+                        with_total=False,
+                    ),
                 )
             )
 
             tasks.extend(output_data.tasks)
+            total = len(tasks) + bool(output_data.next_cursor)
             await state.update_data(
                 {
                     f'course_{course_id}_tasks': tasks,
                     f'course_{course_id}_tasks_offset': offset + DEFAULT_LIMIT,
-                    f'course_{course_id}_tasks_total': output_data.total,
+                    f'course_{course_id}_tasks_cursor': data.get(f'course_{course_id}_tasks_next_cursor'),
+                    f'course_{course_id}_tasks_next_cursor': output_data.next_cursor,
+                    f'course_{course_id}_tasks_total': total,
                 },
             )
 
@@ -1,12 +1,22 @@
+import argparse
 import asyncio
 import logging
+import os
 import sys
 from asyncio.exceptions import CancelledError
 from logging import StreamHandler, Formatter
 
+import aio_pika
 import alembic.config
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from learn_anything.course_platform.adapters.bootstrap.tg_bot_di import DEFAULT_COURSE_PLATFORM_CONFIG_PATH
 from learn_anything.course_platform.adapters.persistence.alembic.config import ALEMBIC_CONFIG
+from learn_anything.course_platform.adapters.persistence.config import load_db_config
+from learn_anything.course_platform.adapters.persistence.mappers.course import CourseMapper
+from learn_anything.course_platform.adapters.rmq.config import load_rmq_config
+from learn_anything.course_platform.adapters.rmq.tg_updates_retry import TG_UPDATES_DLQ, peek_dead_letters, \
+    replay_dead_letters, describe_dead_letter
 
 from learn_anything.api_gateway.main.tg_bot import main as api_gateway_entry_point
 from learn_anything.course_platform.main.consumer import main as consumer_entry_point
@@ -59,6 +69,59 @@ def command_start_handler(argv: list[str]) -> None:
             logger.info("API gateway was successfully stopped")
 
 
+def dlq_handler(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog='learn-anything dlq',
+        description='Telegram updates which failed to be processed too many times',
+    )
+    parser.add_argument('action', choices=('inspect', 'replay'))
+    parser.add_argument('--limit', type=int, default=None, help='max number of updates, inspect shows 10 by default')
+    args = parser.parse_args(argv)
+
+    asyncio.run(_handle_dlq(args.action, args.limit))
+
+
+async def _handle_dlq(action: str, limit: int | None) -> None:
+    rmq_cfg = load_rmq_config(os.getenv('COURSE_PLATFORM_CONFIG_PATH') or DEFAULT_COURSE_PLATFORM_CONFIG_PATH)
+
+    async with await aio_pika.connect_robust(rmq_cfg.uri) as connection:
+        channel = await connection.channel()
+        dlq = await channel.declare_queue(name=TG_UPDATES_DLQ, durable=True)
+
+        if action == 'inspect':
+            logger.info('%s updates in the dead letter queue', dlq.declaration_result.message_count)
+            for message in await peek_dead_letters(dlq, limit=limit or 10):
+                logger.info(describe_dead_letter(message))
+
+        elif action == 'replay':
+            replayed = await replay_dead_letters(channel, dlq, shards_number=rmq_cfg.tg_updates_shards, limit=limit)
+            logger.info('Replayed %s updates from the dead letter queue', replayed)
+
+
+def counters_handler(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog='learn-anything counters',
+        description='Denormalized counters, like the number of registrations for a course',
+    )
+    parser.add_argument('action', choices=('reconcile',))
+    parser.parse_args(argv)
+
+    asyncio.run(_reconcile_counters())
+
+
+async def _reconcile_counters() -> None:
+    db_cfg = load_db_config(os.getenv('COURSE_PLATFORM_CONFIG_PATH') or DEFAULT_COURSE_PLATFORM_CONFIG_PATH)
+    engine = create_async_engine(db_cfg.db_url)
+    try:
+        async with AsyncSession(engine) as session:
+            fixed = await CourseMapper(session).reconcile_total_registered()
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    logger.info('Fixed registrations counters of %s courses', fixed)
+
+
 async def _run_services() -> None:
     await asyncio.gather(
         api_gateway_entry_point(),
@@ -74,3 +137,9 @@ def main() -> None:
 
         case 'start':
             command_start_handler(sys.argv[2:])
+
+        case 'dlq':
+            dlq_handler(sys.argv[2:])
+
+        case 'counters':
+            counters_handler(sys.argv[2:])
@@ -6,7 +6,6 @@ import msgpack
 import pytest
 import pytest_asyncio
 from aio_pika.abc import AbstractChannel
-from aio_pika.abc import ExchangeType
 from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -14,6 +13,9 @@ from sqlalchemy.ext.asyncio import (
 
 import learn_anything.course_platform.adapters.persistence.tables  # noqa
 from learn_anything.course_platform.adapters.persistence.tables.user import users_table
+from learn_anything.course_platform.adapters.rmq.config import RMQConfig
+from learn_anything.course_platform.adapters.rmq.tg_updates import declare_tg_updates_topology, tg_updates_shard, \
+    tg_updates_shard_name
 from learn_anything.course_platform.domain.entities.user.enums import UserRole
 
 START_BOT_EVENT = {
@@ -89,6 +91,8 @@ START_BOT_EVENT = {
 }
 
 
+SHARDS_NUMBER = RMQConfig.tg_updates_shards
+
 USER = {'id': 818525681, 'fullname': 'Fimoz Fimozovich', 'username': 'kekeke23', 'role': UserRole.BOT_OWNER}
 
 
@@ -107,23 +111,17 @@ async def _prepare_db(db_session: AsyncSession):
 async def test_get_all_courses(rmq_channel: AbstractChannel):
     logging.info('Rmq channel: %s', rmq_channel)
 
-    queue_name = 'tg_updates'
-
-    exchange = await rmq_channel.declare_exchange(queue_name, ExchangeType.TOPIC, durable=True)
-    queue = await rmq_channel.declare_queue(name=queue_name, durable=True)
-    await queue.bind(
-        exchange,
-        queue_name,
-    )
+    exchange, _ = await declare_tg_updates_topology(rmq_channel, shards_number=SHARDS_NUMBER)
+    shard = tg_updates_shard(START_BOT_EVENT, shards_number=SHARDS_NUMBER)
     await exchange.publish(
         message=aio_pika.Message(
             body=msgpack.packb(START_BOT_EVENT),
         ),
-        routing_key=queue_name,
+        routing_key=tg_updates_shard_name(shard),
     )
 
     # giving consumer a time to process and ack message
     await asyncio.sleep(3)
 
-    after_pub_queue = await rmq_channel.get_queue(name=queue_name)
+    after_pub_queue = await rmq_channel.get_queue(name=tg_updates_shard_name(shard))
     assert after_pub_queue.declaration_result.message_count == 0
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from dishka import Provider, Scope, make_container, Container
@@ -10,6 +10,7 @@ import learn_anything.course_platform.adapters.persistence.tables  # noqa
 from learn_anything.course_platform.application.interactors.course.create_course import CreateCourseInteractor
 from learn_anything.course_platform.application.interactors.course.delete_course import DeleteCourseInteractor
 from learn_anything.course_platform.application.interactors.course.get_course import GetCourseInteractor
+from learn_anything.course_platform.application.interactors.course.get_many_courses import GetAllCoursesInteractor
 from learn_anything.course_platform.application.interactors.course.leave_course import LeaveCourseInteractor
 from learn_anything.course_platform.application.interactors.course.publish_course import (
     PublishCourseInteractor,
@@ -20,6 +21,9 @@ from learn_anything.course_platform.application.interactors.course.register_for_
 from learn_anything.course_platform.application.interactors.course.update_course import (
     UpdateCourseInteractor,
 )
+from learn_anything.course_platform.application.interactors.submission.create_submission import (
+    CreateCodeTaskSubmissionInteractor,
+)
 from learn_anything.course_platform.application.interactors.task.delete_task import DeleteTaskInteractor
 from learn_anything.course_platform.application.interactors.task.get_course_tasks import (
     GetCourseTasksInteractor,
@@ -30,10 +34,14 @@ from learn_anything.course_platform.application.ports.data.course_gateway import
     CourseGateway,
     RegistrationForCourseGateway,
 )
+from learn_anything.course_platform.application.ports.data.course_search import CourseSearch
 from learn_anything.course_platform.application.ports.data.file_manager import FileManager
 from learn_anything.course_platform.application.ports.data.submission_gateway import SubmissionGateway
 from learn_anything.course_platform.application.ports.data.task_gateway import TaskGateway
 from learn_anything.course_platform.application.ports.data.user_gateway import UserGateway
+from learn_anything.course_platform.application.ports.grading_cache import GradingCache
+from learn_anything.course_platform.application.ports.playground import PlaygroundFactory
+from learn_anything.course_platform.application.ports.rate_limiter import SubmissionRateLimiter
 
 
 @pytest.fixture(scope='function')
@@ -41,6 +49,11 @@ def course_gateway_mock():
     return AsyncMock()
 
 
+@pytest.fixture(scope='function')
+def course_search_mock():
+    return AsyncMock()
+
+
 @pytest.fixture(scope='function')
 def user_gateway_mock():
     return AsyncMock()
@@ -81,9 +94,36 @@ def submission_gateway_mock() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture(scope='function')
+def playground_mock() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture(scope='function')
+def playground_factory_mock(playground_mock: AsyncMock) -> MagicMock:
+    playground_factory = MagicMock()
+    playground_factory.create.return_value.__aenter__.return_value = playground_mock
+    return playground_factory
+
+
+@pytest.fixture(scope='function')
+def grading_cache_mock() -> AsyncMock:
+    grading_cache = AsyncMock()
+    grading_cache.get.return_value = None
+    return grading_cache
+
+
+@pytest.fixture(scope='function')
+def rate_limiter_mock() -> AsyncMock:
+    rate_limiter = AsyncMock()
+    rate_limiter.acquire.return_value = 0
+    return rate_limiter
+
+
 @pytest.fixture(scope="function")
 def ioc_container(
         course_gateway_mock: AsyncMock,
+        course_search_mock: AsyncMock,
         user_gateway_mock: AsyncMock,
         task_gateway_mock: AsyncMock,
         registration_for_course_gateway_mock: AsyncMock,
@@ -92,10 +132,14 @@ def ioc_container(
         commiter_mock: AsyncMock,
         file_manager_mock: AsyncMock,
         id_provider_mock: AsyncMock,
+        playground_factory_mock: MagicMock,
+        grading_cache_mock: AsyncMock,
+        rate_limiter_mock: AsyncMock,
 ) -> Container:
     provider = Provider()
 
     provider.provide(lambda: course_gateway_mock, scope=Scope.APP, provides=CourseGateway)
+    provider.provide(lambda: course_search_mock, scope=Scope.APP, provides=CourseSearch)
     provider.provide(lambda: user_gateway_mock, scope=Scope.APP, provides=UserGateway)
     provider.provide(lambda: task_gateway_mock, scope=Scope.APP, provides=TaskGateway)
     provider.provide(
@@ -108,9 +152,13 @@ def ioc_container(
     provider.provide(lambda: commiter_mock, scope=Scope.APP, provides=Commiter)
     provider.provide(lambda: file_manager_mock, scope=Scope.APP, provides=FileManager)
     provider.provide(lambda: id_provider_mock, scope=Scope.APP, provides=IdentityProvider)
+    provider.provide(lambda: playground_factory_mock, scope=Scope.APP, provides=PlaygroundFactory)
+    provider.provide(lambda: grading_cache_mock, scope=Scope.APP, provides=GradingCache)
+    provider.provide(lambda: rate_limiter_mock, scope=Scope.APP, provides=SubmissionRateLimiter)
 
     provider.provide(CreateCourseInteractor, scope=Scope.APP)
     provider.provide(GetCourseInteractor, scope=Scope.APP)
+    provider.provide(GetAllCoursesInteractor, scope=Scope.APP)
     provider.provide(DeleteCourseInteractor, scope=Scope.APP)
     provider.provide(RegisterForCourseInteractor, scope=Scope.APP)
     provider.provide(LeaveCourseInteractor, scope=Scope.APP)
@@ -118,6 +166,7 @@ def ioc_container(
     provider.provide(UpdateCourseInteractor, scope=Scope.APP)
     provider.provide(GetCourseTasksInteractor, scope=Scope.APP)
     provider.provide(DeleteTaskInteractor, scope=Scope.APP)
+    provider.provide(CreateCodeTaskSubmissionInteractor, scope=Scope.APP)
 
     container = make_container(provider)
     return container
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from learn_anything.course_platform.adapters.rmq.worker_pool import ConsumerWorkerPool
+
+
+class FakeQueue:
+    """Delivers the given messages and then waits for new ones forever, like a real queue iterator"""
+
+    def __init__(self, messages: list[MagicMock]) -> None:
+        self._messages: asyncio.Queue[MagicMock] = asyncio.Queue()
+        for message in messages:
+            self._messages.put_nowait(message)
+        self.closed = False
+
+    def iterator(self) -> 'FakeQueue':
+        return self
+
+    async def __aenter__(self) -> 'FakeQueue':
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        self.closed = True
+
+    def __aiter__(self) -> 'FakeQueue':
+        return self
+
+    async def __anext__(self) -> MagicMock:
+        return await self._messages.get()
+
+
+def _message() -> MagicMock:
+    message = MagicMock()
+    message.processed = False
+    message.reject = AsyncMock()
+    message.nack = AsyncMock()
+    return message
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    running, max_running, processed = 0, 0, []
+
+    async def handler(message: MagicMock) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        processed.append(message)
+
+    messages = [_message() for _ in range(10)]
+    pool = ConsumerWorkerPool(queue_name='test', handler=handler, concurrency=3)
+    run_task = asyncio.create_task(pool.run(FakeQueue(messages)))
+
+    await asyncio.sleep(0.2)
+    run_task.cancel()
+    await asyncio.gather(run_task, return_exceptions=True)
+
+    assert max_running == 3
+    assert sorted(map(id, processed)) == sorted(map(id, messages))
+
+
+@pytest.mark.asyncio
+async def test_received_messages_are_drained_on_shutdown():
+    started = asyncio.Event()
+    processed = []
+
+    async def handler(message: MagicMock) -> None:
+        started.set()
+        await asyncio.sleep(0.05)
+        processed.append(message)
+
+    messages = [_message() for _ in range(3)]
+    queue = FakeQueue(messages)
+    pool = ConsumerWorkerPool(queue_name='test', handler=handler, concurrency=1)
+    run_task = asyncio.create_task(pool.run(queue))
+
+    await started.wait()
+    run_task.cancel()
+    await asyncio.gather(run_task, return_exceptions=True)
+
+    assert queue.closed
+    # one message in progress and one in the local buffer, the last one is returned to the broker
+    assert processed == messages[:2]
+    messages[2].nack.assert_awaited_once_with(requeue=True)
+
+
+@pytest.mark.asyncio
+async def test_message_is_rejected_when_handler_fails():
+    handler = AsyncMock(side_effect=ValueError('boom'))
+    message = _message()
+    pool = ConsumerWorkerPool(queue_name='test', handler=handler, concurrency=1)
+    run_task = asyncio.create_task(pool.run(FakeQueue([message])))
+
+    await asyncio.sleep(0.05)
+    run_task.cancel()
+    await asyncio.gather(run_task, return_exceptions=True)
+
+    message.reject.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_several_queues_share_workers():
+    processed = []
+
+    async def handler(message: MagicMock) -> None:
+        processed.append(message)
+
+    first_messages, second_messages = [_message() for _ in range(3)], [_message() for _ in range(3)]
+    pool = ConsumerWorkerPool(queue_name='test', handler=handler, concurrency=2)
+    first_queue, second_queue = FakeQueue(first_messages), FakeQueue(second_messages)
+    run_task = asyncio.create_task(pool.run(first_queue, second_queue))
+
+    await asyncio.sleep(0.05)
+    run_task.cancel()
+    await asyncio.gather(run_task, return_exceptions=True)
+
+    assert sorted(map(id, processed)) == sorted(map(id, first_messages + second_messages))
+    assert first_queue.closed and second_queue.closed
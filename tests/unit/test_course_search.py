@@ -0,0 +1,10 @@
+from learn_anything.course_platform.adapters.persistence.course_search import _prefix_tsquery
+
+
+def test_every_word_is_searched_as_prefix():
+    assert _prefix_tsquery('Основы  Python-3') == 'основы:* & python:* & 3:*'
+
+
+def test_operators_of_tsquery_are_not_passed_through():
+    assert _prefix_tsquery("a & !b | (c:*)") == 'a:* & b:* & c:*'
+    assert _prefix_tsquery(" '&!| ") is None
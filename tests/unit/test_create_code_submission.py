@@ -0,0 +1,264 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from learn_anything.course_platform.application.interactors.submission.create_submission import (
+    CreateCodeTaskSubmissionInteractor,
+    CreateCodeTaskSubmissionInputData,
+)
+from learn_anything.course_platform.application.errors import SubmissionRateLimitExceededError
+from learn_anything.course_platform.application.ports.grading_cache import GradingResult
+from learn_anything.course_platform.application.ports.playground import StdErr, StdOut, CodeWithTestsResult, \
+    PlaygroundLane
+from learn_anything.course_platform.domain.entities.course.models import Course, CourseID
+from learn_anything.course_platform.domain.entities.task.enums import TaskType
+from learn_anything.course_platform.domain.entities.task.models import CodeTask, CodeTaskTest, TaskID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+
+ACTOR_ID = UserID(100)
+COURSE_ID = CourseID(1)
+TASK_ID = TaskID(1)
+NOW = datetime.now()
+
+
+@pytest.fixture
+def code_task() -> CodeTask:
+    return CodeTask(
+        id=TASK_ID,
+        type=TaskType.CODE,
+        topic=None,
+        title="T",
+        body="B",
+        course_id=COURSE_ID,
+        index_in_course=0,
+        created_at=NOW,
+        updated_at=NOW,
+        attempts_limit=None,
+        prepared_code="x = 1",
+        code_duration_timeout=3,
+        tests=[CodeTaskTest(code="assert stdout == '1'"), CodeTaskTest(code="assert x == 1")],
+    )
+
+
+@pytest.fixture(autouse=True)
+def setup_gateways(
+    id_provider_mock: AsyncMock,
+    course_gateway_mock: AsyncMock,
+    registration_for_course_gateway_mock: AsyncMock,
+    submission_gateway_mock: AsyncMock,
+    task_gateway_mock: AsyncMock,
+    code_task: CodeTask,
+):
+    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
+    task_gateway_mock.get_code_task_with_id.return_value = code_task
+    course_gateway_mock.with_id.return_value = Course(
+        id=COURSE_ID,
+        title="C",
+        description="D",
+        photo_id=None,
+        creator_id=UserID(1),
+        is_published=True,
+        registrations_limit=None,
+        total_registered=1,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    registration_for_course_gateway_mock.read.return_value = object()
+    submission_gateway_mock.get_user_submissions_number_for_task.return_value = 0
+
+
+@pytest.mark.asyncio
+async def test_all_tests_are_sent_to_playground_at_once(
+    ioc_container,
+    playground_mock: AsyncMock,
+    submission_gateway_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(
+        out=StdOut("1"),
+        err=StdErr(""),
+        tests=[(StdOut(""), StdErr("")), (StdOut(""), StdErr(""))],
+    )
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    result = await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(x)"))
+
+    assert result.failed_test is None
+    playground_mock.execute_tests.assert_awaited_once_with(
+        code="x = 1\nprint(x)",
+        tests=["assert stdout == '1'", "assert x == 1"],
+    )
+    playground_mock.execute_code.assert_not_awaited()
+    assert submission_gateway_mock.save_for_code_task.await_args.kwargs["submission"].is_correct
+
+
+@pytest.mark.asyncio
+async def test_failed_test_index_and_output_are_returned(
+    ioc_container,
+    playground_mock: AsyncMock,
+    submission_gateway_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(
+        out=StdOut("2"),
+        err=StdErr(""),
+        tests=[(StdOut(""), StdErr("AssertionError"))],
+    )
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    result = await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(2)"))
+
+    assert result.failed_test is not None
+    assert result.failed_test.failed_test_idx == 0
+    assert result.failed_test.failed_test_output == "Your Output:\n2\n\nTest Output:\nAssertionError"
+    assert not submission_gateway_mock.save_for_code_task.await_args.kwargs["submission"].is_correct
+
+
+@pytest.mark.asyncio
+async def test_submission_error_is_returned_without_test_index(
+    ioc_container,
+    playground_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(
+        out=StdOut(""),
+        err=StdErr("NameError: name 'y' is not defined"),
+        tests=[],
+    )
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    result = await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(y)"))
+
+    assert result.failed_test is not None
+    assert result.failed_test.failed_test_idx == -1
+    assert result.failed_test.failed_test_output == "Your Output:\nNameError: name 'y' is not defined"
+
+
+@pytest.mark.asyncio
+async def test_cached_grading_result_skips_playground(
+    ioc_container,
+    playground_factory_mock,
+    grading_cache_mock: AsyncMock,
+    submission_gateway_mock: AsyncMock,
+):
+    grading_cache_mock.get.return_value = GradingResult(output="ok", failed_test_idx=-1)
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    result = await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(x)"))
+
+    assert result.failed_test is None
+    playground_factory_mock.create.assert_not_called()
+    grading_cache_mock.set.assert_not_awaited()
+    submission_gateway_mock.save_for_code_task.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_grading_result_is_cached(
+    ioc_container,
+    playground_mock: AsyncMock,
+    grading_cache_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(
+        out=StdOut("2"),
+        err=StdErr(""),
+        tests=[(StdOut(""), StdErr("AssertionError"))],
+    )
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(2)"))
+
+    key = grading_cache_mock.get.await_args.args[0]
+    grading_cache_mock.set.assert_awaited_once_with(
+        key,
+        GradingResult(output="Your Output:\n2\n\nTest Output:\nAssertionError", failed_test_idx=0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_timed_out_grading_result_is_not_cached(
+    ioc_container,
+    playground_mock: AsyncMock,
+    grading_cache_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(
+        out=StdOut(""),
+        err=StdErr("TimeoutError: your code timed out after 3 seconds"),
+        tests=[],
+    )
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="while True: pass"))
+
+    grading_cache_mock.set.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_grading_cache_key_changes_with_task_tests(
+    ioc_container,
+    code_task: CodeTask,
+    grading_cache_mock: AsyncMock,
+):
+    grading_cache_mock.get.return_value = GradingResult(output="ok", failed_test_idx=-1)
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    input_data = CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(x)")
+
+    await interactor.execute(input_data)
+    await interactor.execute(input_data)
+    code_task.tests = [*code_task.tests, CodeTaskTest(code="assert x != 2")]
+    await interactor.execute(input_data)
+
+    first_key, second_key, third_key = (call.args[0] for call in grading_cache_mock.get.await_args_list)
+    assert first_key == second_key
+    assert first_key != third_key
+
+
+@pytest.mark.asyncio
+async def test_submission_over_rate_limit_is_rejected_before_playground(
+    ioc_container,
+    playground_factory_mock,
+    rate_limiter_mock: AsyncMock,
+    submission_gateway_mock: AsyncMock,
+):
+    rate_limiter_mock.acquire.return_value = 4.2
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    with pytest.raises(SubmissionRateLimitExceededError) as exc_info:
+        await interactor.execute(CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(x)"))
+
+    assert exc_info.value.message == "Too many submissions, try again in 5 seconds"
+    rate_limiter_mock.acquire.assert_awaited_once_with(user_id=ACTOR_ID, course_id=COURSE_ID)
+    playground_factory_mock.create.assert_not_called()
+    submission_gateway_mock.save_for_code_task.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ide_submissions_are_not_limited_twice(
+    ioc_container,
+    playground_mock: AsyncMock,
+    rate_limiter_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(out=StdOut("1"), err=StdErr(""), tests=[])
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    await interactor.execute(
+        CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(x)", lane=PlaygroundLane.INTERACTIVE)
+    )
+
+    rate_limiter_mock.acquire.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_task_snapshot_is_not_loaded_again(
+    ioc_container,
+    code_task: CodeTask,
+    playground_mock: AsyncMock,
+    task_gateway_mock: AsyncMock,
+):
+    playground_mock.execute_tests.return_value = CodeWithTestsResult(out=StdOut("1"), err=StdErr(""), tests=[])
+
+    interactor = ioc_container.get(CreateCodeTaskSubmissionInteractor)
+    await interactor.execute(
+        CreateCodeTaskSubmissionInputData(task_id=TASK_ID, submission="print(x)", task_snapshot=code_task)
+    )
+
+    task_gateway_mock.get_code_task_with_id.assert_not_awaited()
+    assert playground_mock.execute_tests.await_args.kwargs["tests"] == [test.code for test in code_task.tests]
@@ -7,10 +7,14 @@ from learn_anything.course_platform.application.input_data import Pagination
 from learn_anything.course_platform.application.interactors.task.get_course_tasks import (
     GetCourseTasksInteractor,
     GetCourseTasksInputData,
+    CodeTaskData,
+    CodeTaskTestData,
 )
+from learn_anything.course_platform.application.ports.data.task_gateway import TaskWithSubmissionsStats, \
+    TaskSubmissionsStats
 from learn_anything.course_platform.domain.entities.course.models import Course, CourseID
 from learn_anything.course_platform.domain.entities.task.enums import TaskType
-from learn_anything.course_platform.domain.entities.task.models import Task, TaskID
+from learn_anything.course_platform.domain.entities.task.models import Task, TaskID, CodeTask, CodeTaskTest
 from learn_anything.course_platform.domain.entities.user.models import UserID
 
 
@@ -20,16 +24,8 @@ TASK_ID = TaskID(1)
 NOW = datetime.now()
 
 
-@pytest.mark.asyncio
-async def test_get_course_tasks_theory_only(
-    ioc_container,
-    id_provider_mock: AsyncMock,
-    course_gateway_mock: AsyncMock,
-    task_gateway_mock: AsyncMock,
-):
-    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
-
-    course = Course(
+def _course() -> Course:
+    return Course(
         id=COURSE_ID,
         title="C",
         description="D",
@@ -41,7 +37,18 @@ async def test_get_course_tasks_theory_only(
         created_at=NOW,
         updated_at=NOW,
     )
-    course_gateway_mock.with_id.return_value = course
+
+
+@pytest.mark.asyncio
+async def test_get_course_tasks_theory_only(
+    ioc_container,
+    id_provider_mock: AsyncMock,
+    course_gateway_mock: AsyncMock,
+    task_gateway_mock: AsyncMock,
+):
+    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
+
+    course_gateway_mock.with_id.return_value = _course()
     course_gateway_mock.get_share_rules.return_value = []
 
     task = Task(
@@ -55,7 +62,11 @@ async def test_get_course_tasks_theory_only(
         created_at=NOW,
         updated_at=NOW,
     )
-    task_gateway_mock.with_course.return_value = ([task], 1)
+    task_gateway_mock.with_course_and_submissions_stats.return_value = (
+        [TaskWithSubmissionsStats(task=task, submissions_stats=TaskSubmissionsStats(0, 0, 0, False))],
+        1,
+        None,
+    )
 
     interactor = ioc_container.get(GetCourseTasksInteractor)
     result = await interactor.execute(
@@ -72,4 +83,63 @@ async def test_get_course_tasks_theory_only(
     assert result.tasks[0].body == "B1"
     assert result.tasks[0].type == TaskType.THEORY
 
-    task_gateway_mock.with_course.assert_awaited_once()
+    task_gateway_mock.with_course_and_submissions_stats.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_course_tasks_code_task_stats_come_with_page(
+    ioc_container,
+    id_provider_mock: AsyncMock,
+    course_gateway_mock: AsyncMock,
+    task_gateway_mock: AsyncMock,
+    submission_gateway_mock: AsyncMock,
+):
+    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
+    course_gateway_mock.with_id.return_value = _course()
+    course_gateway_mock.get_share_rules.return_value = []
+
+    task = CodeTask(
+        id=TASK_ID,
+        type=TaskType.CODE,
+        topic=None,
+        title="Sum",
+        body="Sum two numbers",
+        course_id=COURSE_ID,
+        index_in_course=0,
+        created_at=NOW,
+        updated_at=NOW,
+        attempts_limit=3,
+        prepared_code=None,
+        code_duration_timeout=5,
+        tests=[CodeTaskTest(code="assert f(1, 2) == 3")],
+    )
+    task_gateway_mock.with_course_and_submissions_stats.return_value = (
+        [TaskWithSubmissionsStats(task=task, submissions_stats=TaskSubmissionsStats(10, 4, 2, True))],
+        None,
+        'next-page-cursor',
+    )
+
+    interactor = ioc_container.get(GetCourseTasksInteractor)
+    result = await interactor.execute(
+        GetCourseTasksInputData(course_id=COURSE_ID, pagination=Pagination(limit=1, with_total=False))
+    )
+
+    assert result.total is None
+    assert result.next_cursor == 'next-page-cursor'
+
+    task_data = result.tasks[0]
+    assert isinstance(task_data, CodeTaskData)
+    assert task_data.total_submissions == 10
+    assert task_data.total_correct_submissions == 4
+    assert task_data.total_actor_submissions == 2
+    assert task_data.solved_by_actor
+    assert task_data.tests == [CodeTaskTestData(code="assert f(1, 2) == 3")]
+
+    task_gateway_mock.with_course_and_submissions_stats.assert_awaited_once_with(
+        course_id=COURSE_ID,
+        actor_id=ACTOR_ID,
+        pagination=Pagination(limit=1, with_total=False),
+        filters=None,
+    )
+    task_gateway_mock.get_code_task_with_id.assert_not_awaited()
+    submission_gateway_mock.with_id.assert_not_awaited()
@@ -0,0 +1,97 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from learn_anything.course_platform.application.input_data import Pagination
+from learn_anything.course_platform.application.interactors.course.get_many_courses import (
+    GetAllCoursesInteractor,
+    GetManyCoursesInputData,
+)
+from learn_anything.course_platform.application.ports.data.course_gateway import GetManyCoursesFilters, SortBy
+from learn_anything.course_platform.domain.entities.course.models import Course, CourseID, RegistrationForCourse
+from learn_anything.course_platform.domain.entities.user.enums import UserRole
+from learn_anything.course_platform.domain.entities.user.models import UserID, User
+
+
+ACTOR_ID = UserID(100)
+NOW = datetime.now()
+
+
+def _course(course_id: int, creator_id: int) -> Course:
+    return Course(
+        id=CourseID(course_id),
+        title=f"C{course_id}",
+        description="D",
+        photo_id=None,
+        creator_id=UserID(creator_id),
+        is_published=True,
+        registrations_limit=None,
+        total_registered=0,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+@pytest.mark.asyncio
+async def test_creators_and_registrations_are_read_once_for_page(
+    ioc_container,
+    id_provider_mock: AsyncMock,
+    course_gateway_mock: AsyncMock,
+    user_gateway_mock: AsyncMock,
+    registration_for_course_gateway_mock: AsyncMock,
+):
+    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
+    courses = [_course(1, creator_id=1), _course(2, creator_id=1), _course(3, creator_id=2)]
+    course_gateway_mock.all.return_value = (courses, 3, None)
+    user_gateway_mock.with_ids.return_value = [
+        User(id=UserID(1), fullname="Author", role=UserRole.MENTOR, username=None),
+    ]
+    registration_for_course_gateway_mock.read_many.return_value = [
+        RegistrationForCourse(user_id=ACTOR_ID, course_id=CourseID(2), created_at=NOW),
+    ]
+
+    interactor = ioc_container.get(GetAllCoursesInteractor)
+    result = await interactor.execute(
+        GetManyCoursesInputData(
+            pagination=Pagination(offset=0, limit=10),
+            filters=GetManyCoursesFilters(sort_by=SortBy.DATE),
+        )
+    )
+
+    assert [course.creator for course in result.courses] == ["Author", "Author", "undefined"]
+    assert [course.user_is_registered for course in result.courses] == [False, True, False]
+
+    user_gateway_mock.with_ids.assert_awaited_once()
+    assert sorted(user_gateway_mock.with_ids.await_args.args[0]) == [1, 2]
+    registration_for_course_gateway_mock.read_many.assert_awaited_once_with(
+        user_id=ACTOR_ID,
+        course_ids=[1, 2, 3],
+    )
+    user_gateway_mock.with_id.assert_not_awaited()
+    registration_for_course_gateway_mock.read.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_text_filters_are_served_by_search(
+    ioc_container,
+    id_provider_mock: AsyncMock,
+    course_gateway_mock: AsyncMock,
+    course_search_mock: AsyncMock,
+    user_gateway_mock: AsyncMock,
+    registration_for_course_gateway_mock: AsyncMock,
+):
+    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
+    course_search_mock.search.return_value = ([_course(1, creator_id=1)], None, 'next-page-cursor')
+    user_gateway_mock.with_ids.return_value = []
+    registration_for_course_gateway_mock.read_many.return_value = []
+    pagination = Pagination(limit=1, with_total=False)
+    filters = GetManyCoursesFilters(sort_by=SortBy.DATE, title="питон")
+
+    interactor = ioc_container.get(GetAllCoursesInteractor)
+    result = await interactor.execute(GetManyCoursesInputData(pagination=pagination, filters=filters))
+
+    assert [course.id for course in result.courses] == [1]
+    assert result.next_cursor == 'next-page-cursor'
+    course_search_mock.search.assert_awaited_once_with(pagination=pagination, filters=filters)
+    course_gateway_mock.all.assert_not_awaited()
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, AsyncGenerator
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from learn_anything.api_gateway.adapters.redis.ide_results import IdeResultListener
+
+
+class FakePubSub:
+    def __init__(self) -> None:
+        self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.psubscribe = AsyncMock()
+        self.aclose = AsyncMock()
+
+    async def listen(self) -> AsyncGenerator[dict[str, Any], None]:
+        while True:
+            yield await self.messages.get()
+
+    def publish(self, submission_id: str, data: str) -> None:
+        self.messages.put_nowait({
+            'type': 'pmessage',
+            'pattern': 'ide_result_events:*',
+            'channel': f'ide_result_events:{submission_id}',
+            'data': data,
+        })
+
+
+@pytest.fixture
+def pubsub() -> FakePubSub:
+    return FakePubSub()
+
+
+@pytest.fixture
+def redis_client(pubsub: FakePubSub) -> MagicMock:
+    redis_client = MagicMock()
+    redis_client.pubsub.return_value = pubsub
+    redis_client.get = AsyncMock(return_value=None)
+    return redis_client
+
+
+@pytest.fixture
+async def listener(redis_client: MagicMock) -> AsyncGenerator[IdeResultListener, None]:
+    listener = IdeResultListener(redis_client=redis_client)
+    await listener.start()
+    yield listener
+    await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_published_result_is_delivered_to_waiter(listener: IdeResultListener, pubsub: FakePubSub):
+    waiter = asyncio.create_task(listener.wait('sub-1', timeout=1))
+    await asyncio.sleep(0)
+    pubsub.publish('sub-2', '{"status": "failed"}')
+    pubsub.publish('sub-1', '{"status": "ok"}')
+
+    assert await waiter == '{"status": "ok"}'
+    pubsub.psubscribe.assert_awaited_once_with('ide_result_events:*')
+
+
+@pytest.mark.asyncio
+async def test_already_written_result_is_returned(listener: IdeResultListener, redis_client: MagicMock):
+    redis_client.get.return_value = '{"status": "ok"}'
+
+    assert await listener.wait('sub-1', timeout=1) == '{"status": "ok"}'
+    redis_client.get.assert_awaited_once_with('ide_result:sub-1')
+
+
+@pytest.mark.asyncio
+async def test_wait_timeout(listener: IdeResultListener):
+    assert await listener.wait('sub-1', timeout=0.01) is None
+    assert not listener._waiters
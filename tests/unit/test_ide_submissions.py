@@ -0,0 +1,83 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import msgpack
+import pytest
+
+from learn_anything.course_platform.adapters.rmq.ide_consumer import process_ide_submission
+from learn_anything.course_platform.adapters.rmq.ide_submissions import claim_ide_submission, \
+    ide_submission_dedup_key, code_task_snapshot, code_task_from_snapshot
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.task.enums import TaskType
+from learn_anything.course_platform.domain.entities.task.models import CodeTask, TaskID, CodeTaskTest
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+
+def test_same_code_of_same_task_has_same_dedup_key():
+    assert ide_submission_dedup_key(1, 2, 'print(1)') == ide_submission_dedup_key(1, 2, 'print(1)')
+    assert ide_submission_dedup_key(1, 2, 'print(1)') != ide_submission_dedup_key(1, 2, 'print(2)')
+    assert ide_submission_dedup_key(1, 2, 'print(1)') != ide_submission_dedup_key(3, 2, 'print(1)')
+
+
+def test_idempotency_key_is_scoped_by_user():
+    assert ide_submission_dedup_key(1, 2, 'a', idempotency_key='k') == ide_submission_dedup_key(1, 3, 'b', 'k')
+    assert ide_submission_dedup_key(1, 2, 'a', idempotency_key='k') != ide_submission_dedup_key(4, 2, 'a', 'k')
+
+
+@pytest.mark.asyncio
+async def test_duplicate_submission_gets_id_of_the_first_one():
+    redis_client = FakeRedis()
+
+    submission_id, is_new = await claim_ide_submission(redis_client, 'key')  # type: ignore[arg-type]
+    duplicate_id, duplicate_is_new = await claim_ide_submission(redis_client, 'key')  # type: ignore[arg-type]
+
+    assert is_new and not duplicate_is_new
+    assert duplicate_id == submission_id
+
+
+@pytest.mark.asyncio
+async def test_already_graded_submission_is_not_graded_again():
+    redis_client = AsyncMock()
+    redis_client.exists.return_value = 1
+    container = MagicMock()
+    msg = AsyncMock()
+    msg.body = msgpack.packb({'submission_id': 's', 'task_id': 1, 'user_id': 2, 'code': 'print(1)'})
+
+    await process_ide_submission(msg, redis_client=redis_client, container=container)
+
+    msg.ack.assert_awaited_once()
+    container.assert_not_called()
+    redis_client.pipeline.assert_not_called()
+
+
+def test_task_snapshot_survives_the_message():
+    task = CodeTask(
+        id=TaskID(1),
+        type=TaskType.CODE,
+        topic=None,
+        title='T',
+        body='B',
+        course_id=CourseID(2),
+        index_in_course=0,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 2, 3, 4, 5, 6),
+        attempts_limit=3,
+        prepared_code='x = 1',
+        code_duration_timeout=5,
+        tests=[CodeTaskTest(code='assert x == 1'), CodeTaskTest(code='assert stdout == ""')],
+    )
+
+    assert code_task_from_snapshot(msgpack.unpackb(msgpack.packb(code_task_snapshot(task)))) == task
@@ -54,7 +54,7 @@ async def test_leave_course_success(
     interactor = ioc_container.get(LeaveCourseInteractor)
     await interactor.execute(LeaveCourseInputData(course_id=COURSE_ID))
 
-    course_gateway_mock.save.assert_awaited_once()
+    course_gateway_mock.update_total_registered.assert_awaited_once_with(course_id=COURSE_ID, delta=-1)
     registration_for_course_gateway_mock.delete.assert_awaited_once_with(
         user_id=UserID(ACTOR_ID), course_id=COURSE_ID
     )
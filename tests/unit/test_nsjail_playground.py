@@ -0,0 +1,115 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from learn_anything.course_platform.adapters.playground.config import PlaygroundConfig, PlaygroundBackend
+from learn_anything.course_platform.adapters.playground.nsjail_playground import NsjailPlaygroundFactory
+from learn_anything.course_platform.application.ports.playground import CodeIsInvalidError
+
+# stands in for nsjail: enters the bind-mounted sandbox dir and runs the jailed command without any isolation
+FAKE_NSJAIL = f'''#!{sys.executable}
+import os, sys
+args = sys.argv[1:]
+os.chdir(next(arg for arg in args if arg.endswith(':/sandbox')).split(':')[0])
+command = args[args.index('--') + 1:]
+os.execv(command[0], command)
+'''
+
+
+@pytest.fixture
+def nsjail_path(tmp_path: Path) -> Path:
+    path = tmp_path / 'nsjail'
+    path.write_text(FAKE_NSJAIL)
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def factory(nsjail_path: Path) -> NsjailPlaygroundFactory:
+    return NsjailPlaygroundFactory(
+        config=PlaygroundConfig(nsjail_path=str(nsjail_path), sandbox_python_path=sys.executable),
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_code(factory: NsjailPlaygroundFactory):
+    async with factory.create(code_duration_timeout=5) as pl:
+        out, err = await pl.execute_code('print("hello")')
+
+    assert (out, err) == ('hello', '')
+
+
+@pytest.mark.asyncio
+async def test_execute_code_raises_on_error(factory: NsjailPlaygroundFactory):
+    async with factory.create(code_duration_timeout=5) as pl:
+        with pytest.raises(CodeIsInvalidError) as exc_info:
+            await pl.execute_code('raise ValueError("boom")', raise_exc_on_err=True)
+
+    assert 'ValueError: boom' in exc_info.value.err
+
+
+@pytest.mark.asyncio
+async def test_execute_code_timeout(factory: NsjailPlaygroundFactory):
+    async with factory.create(code_duration_timeout=1) as pl:
+        out, err = await pl.execute_code('print("started", flush=True)\nwhile True: pass')
+
+    assert out.strip() == 'started'
+    assert err == 'TimeoutError: your code timed out after 1 seconds'
+
+
+@pytest.mark.asyncio
+async def test_execute_tests(factory: NsjailPlaygroundFactory):
+    async with factory.create(code_duration_timeout=5) as pl:
+        result = await pl.execute_tests('print(2 + 2)', ['assert stdout == "4"', 'assert stdout == "5"'])
+
+    assert (result.out, result.err) == ('4', '')
+    assert result.tests[0][1] == ''
+    assert 'AssertionError' in result.tests[1][1]
+
+
+@pytest.mark.asyncio
+async def test_sandbox_dir_is_removed(factory: NsjailPlaygroundFactory):
+    async with factory.create(code_duration_timeout=5) as pl:
+        await pl.execute_code('open("file.txt", "w").write("data")')
+        workdir = pl._workdir
+
+    assert workdir is not None and not workdir.exists()
+
+
+@pytest.mark.asyncio
+async def test_slot_is_released_if_sandbox_setup_fails(nsjail_path: Path):
+    factory = NsjailPlaygroundFactory(
+        config=PlaygroundConfig(
+            backend=PlaygroundBackend.NSJAIL,
+            nsjail_path=str(nsjail_path),
+            sandbox_python_path=sys.executable,
+            sandbox_max_concurrency=1,
+        ),
+    )
+    with patch('tempfile.mkdtemp', side_effect=OSError('no space left on device')):
+        with pytest.raises(OSError):
+            async with factory.create(code_duration_timeout=5):
+                pass
+
+    # the only slot is taken forever if it was not released
+    async with asyncio.timeout(5), factory.create(code_duration_timeout=5) as pl:
+        out, _ = await pl.execute_code('print("hello")')
+
+    assert out == 'hello'
+
+
+def test_only_interpreter_dirs_of_host_are_mounted(factory: NsjailPlaygroundFactory):
+    pl = factory.create(code_duration_timeout=5)
+    pl._workdir = Path('/tmp/playground-1')
+    command = pl._nsjail_command(['main.py'], timeout=5)
+
+    mounts = [command[i + 1].split(':')[0] for i, arg in enumerate(command) if arg.startswith('--bindmount')]
+
+    assert '--chroot' not in command
+    assert '/' not in mounts
+    assert set(mounts) <= {'/usr', '/lib', '/lib64', '/bin', '/dev/null', '/dev/zero', '/dev/urandom', '/tmp/playground-1'}
+    assert command[command.index('--user') + 1] == '99999:65534'
+    assert command[command.index('--group') + 1] == '99999:65534'
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from learn_anything.course_platform.adapters.persistence.mappers.pagination import encode_cursor, decode_cursor, \
+    paginate, page_items
+from learn_anything.course_platform.adapters.persistence.tables.course import courses_table
+from learn_anything.course_platform.application.errors import InvalidPaginationCursorError
+from learn_anything.course_platform.application.input_data import Pagination
+
+BY_DATE = [(courses_table.c.created_at, True), (courses_table.c.id, True)]
+BY_POPULARITY = [(courses_table.c.total_registered, True), (courses_table.c.id, False)]
+
+
+def _sql(pagination: Pagination, sort_key) -> str:  # type: ignore[no-untyped-def]
+    stmt = paginate(select(courses_table.c.id), pagination, sort_key)
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_keeps_values_of_sort_key():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor([created_at, 7]), BY_DATE) == [created_at, 7]
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', encode_cursor([1]), encode_cursor(['yesterday', 1])])
+def test_broken_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidPaginationCursorError):
+        decode_cursor(cursor, BY_DATE)
+
+
+def test_page_after_cursor_is_selected_by_row_comparison():
+    sql = _sql(Pagination(cursor=encode_cursor([datetime(2024, 1, 1), 7]), offset=20, limit=10), BY_DATE)
+
+    assert '(courses.created_at, courses.id) < (' in sql
+    assert 'OFFSET' not in sql
+    assert 'ORDER BY courses.created_at DESC, courses.id DESC' in sql
+
+
+def test_mixed_directions_are_compared_column_by_column():
+    sql = _sql(Pagination(cursor=encode_cursor([3, 7]), limit=10), BY_POPULARITY)
+
+    assert 'courses.total_registered < ' in sql
+    assert 'courses.total_registered = ' in sql and 'courses.id > ' in sql
+
+
+def test_next_cursor_is_given_only_if_extra_item_was_fetched():
+    items = [SimpleNamespace(created_at=datetime(2024, 1, i), id=i) for i in range(3, 0, -1)]
+
+    page, next_cursor = page_items(items, Pagination(limit=2), BY_DATE)
+    assert page == items[:2]
+    assert decode_cursor(next_cursor, BY_DATE) == [datetime(2024, 1, 2), 2]  # type: ignore[arg-type]
+
+    assert page_items(items, Pagination(limit=3), BY_DATE) == (items, None)
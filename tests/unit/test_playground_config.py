@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+
+from learn_anything.course_platform.adapters.playground.config import (
+    PlaygroundBackend,
+    PlaygroundConfig,
+    load_playground_config,
+)
+
+
+def test_load_playground_config():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write("""
+[playground]
+pool_min_size = 2
+pool_max_size = 5
+vm_max_uses = 7
+""")
+        path = f.name
+    try:
+        cfg = load_playground_config(path)
+        assert cfg.pool_min_size == 2
+        assert cfg.pool_max_size == 5
+        assert cfg.vm_idle_timeout == 300
+        assert cfg.vm_max_uses == 7
+        assert cfg.backend == PlaygroundBackend.VM
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+def test_load_playground_config_without_section():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write("""
+[redis]
+port = 6379
+""")
+        path = f.name
+    try:
+        assert load_playground_config(path) == PlaygroundConfig()
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+def test_load_playground_config_with_nsjail_backend():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write("""
+[playground]
+backend = "nsjail"
+sandbox_memory_limit_mb = 128
+""")
+        path = f.name
+    try:
+        cfg = load_playground_config(path)
+        assert cfg.backend == PlaygroundBackend.NSJAIL
+        assert cfg.sandbox_memory_limit_mb == 128
+    finally:
+        Path(path).unlink(missing_ok=True)
@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from learn_anything.course_platform.adapters.playground.scheduler import PlaygroundScheduler, \
+    ScheduledPlaygroundFactory
+from learn_anything.course_platform.application.ports.playground import PlaygroundLane
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+WEIGHTS = {PlaygroundLane.AUTHORING: 4, PlaygroundLane.INTERACTIVE: 2, PlaygroundLane.GRADING: 1}
+
+
+async def _queue(
+        scheduler: PlaygroundScheduler,
+        order: list[str],
+        name: str,
+        lane: PlaygroundLane,
+        user_id: int = 1,
+        course_id: int = 1,
+) -> asyncio.Task[None]:
+    async def acquire() -> None:
+        await scheduler.acquire(lane, user_id=UserID(user_id), course_id=CourseID(course_id))
+        order.append(name)
+
+    task = asyncio.create_task(acquire())
+    await asyncio.sleep(0)
+    return task
+
+
+async def _release(scheduler: PlaygroundScheduler, times: int) -> None:
+    for _ in range(times):
+        scheduler.release()
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_free_slots_are_taken_right_away():
+    scheduler = PlaygroundScheduler(capacity=2, weights=WEIGHTS)
+
+    await asyncio.wait_for(scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None), 1)
+    await asyncio.wait_for(scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None), 1)
+
+
+@pytest.mark.asyncio
+async def test_authoring_does_not_wait_behind_grading_flood():
+    scheduler = PlaygroundScheduler(capacity=1, weights=WEIGHTS)
+    await scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None)
+    order: list[str] = []
+
+    for i in range(5):
+        await _queue(scheduler, order, f'grading{i}', PlaygroundLane.GRADING, user_id=i)
+    await _queue(scheduler, order, 'authoring', PlaygroundLane.AUTHORING)
+
+    await _release(scheduler, 1)
+    assert order == ['authoring']
+
+
+@pytest.mark.asyncio
+async def test_lanes_share_slots_by_weights():
+    scheduler = PlaygroundScheduler(capacity=1, weights=WEIGHTS)
+    await scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None)
+    order: list[str] = []
+
+    for i in range(4):
+        await _queue(scheduler, order, 'interactive', PlaygroundLane.INTERACTIVE, user_id=i)
+        await _queue(scheduler, order, 'grading', PlaygroundLane.GRADING, user_id=i)
+
+    await _release(scheduler, 6)
+    assert order == ['interactive', 'grading', 'interactive', 'interactive', 'grading', 'interactive']
+
+
+@pytest.mark.asyncio
+async def test_users_and_courses_take_turns():
+    scheduler = PlaygroundScheduler(capacity=1, weights=WEIGHTS)
+    await scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None)
+    order: list[str] = []
+
+    for i in range(3):
+        await _queue(scheduler, order, 'flooder', PlaygroundLane.GRADING, user_id=1, course_id=1)
+    await _queue(scheduler, order, 'same course', PlaygroundLane.GRADING, user_id=2, course_id=1)
+    await _queue(scheduler, order, 'other course', PlaygroundLane.GRADING, user_id=3, course_id=2)
+
+    await _release(scheduler, 5)
+    assert order == ['flooder', 'other course', 'same course', 'flooder', 'flooder']
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_line():
+    scheduler = PlaygroundScheduler(capacity=1, weights=WEIGHTS)
+    await scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None)
+    order: list[str] = []
+
+    cancelled = await _queue(scheduler, order, 'cancelled', PlaygroundLane.GRADING, user_id=1)
+    await _queue(scheduler, order, 'next', PlaygroundLane.GRADING, user_id=2)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+
+    await _release(scheduler, 1)
+    assert order == ['next']
+
+
+@pytest.mark.asyncio
+async def test_slot_is_passed_on_if_waiter_is_cancelled_after_getting_it():
+    scheduler = PlaygroundScheduler(capacity=1, weights=WEIGHTS)
+    await scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None)
+    order: list[str] = []
+
+    cancelled = await _queue(scheduler, order, 'cancelled', PlaygroundLane.GRADING, user_id=1)
+    await _queue(scheduler, order, 'next', PlaygroundLane.GRADING, user_id=2)
+    scheduler.release()
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert order == ['next']
+
+
+@pytest.mark.asyncio
+async def test_scheduled_playground_releases_slot_on_exit():
+    scheduler = PlaygroundScheduler(capacity=1, weights=WEIGHTS)
+    factory = ScheduledPlaygroundFactory(MagicMock(), scheduler)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            async with factory.create(code_duration_timeout=1, lane=PlaygroundLane.AUTHORING):
+                raise ValueError
+
+    await asyncio.wait_for(scheduler.acquire(PlaygroundLane.GRADING, user_id=None, course_id=None), 1)
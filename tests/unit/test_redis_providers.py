@@ -0,0 +1,25 @@
+import pytest
+
+from learn_anything.course_platform.adapters.metrics import REDIS_POOL_CONNECTIONS_IN_USE, \
+    REDIS_POOL_MAX_CONNECTIONS
+from learn_anything.course_platform.adapters.redis.config import RedisConfig
+from learn_anything.course_platform.adapters.redis.providers import get_redis_connection_pool, get_redis_client
+
+
+@pytest.mark.asyncio
+async def test_redis_clients_share_connection_pool():
+    pool_gen = get_redis_connection_pool(RedisConfig(max_connections=7))
+    pool = await anext(pool_gen)
+
+    first_client = await get_redis_client(pool)
+    second_client = await get_redis_client(pool)
+
+    assert first_client.connection_pool is second_client.connection_pool is pool
+    assert pool.max_connections == 7
+    assert REDIS_POOL_MAX_CONNECTIONS._value.get() == 7
+
+    # connections are opened lazily, on the first command
+    assert REDIS_POOL_CONNECTIONS_IN_USE.collect()[0].samples[0].value == 0
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(pool_gen)
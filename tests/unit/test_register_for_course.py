@@ -9,6 +9,7 @@ from learn_anything.course_platform.application.interactors.course.register_for_
 )
 from learn_anything.course_platform.domain.entities.course.errors import (
     CourseDoesNotExistError,
+    RegistrationsLimitExceededError,
     UserAlreadyRegisteredForCourseError,
 )
 from learn_anything.course_platform.domain.entities.course.models import Course, CourseID
@@ -48,7 +49,7 @@ async def test_register_for_course_success(
     interactor = ioc_container.get(RegisterForCourseInteractor)
     await interactor.execute(RegisterForCourseInputData(course_id=COURSE_ID))
 
-    course_gateway_mock.save.assert_awaited_once()
+    course_gateway_mock.update_total_registered.assert_awaited_once_with(course_id=COURSE_ID, delta=1)
     registration_for_course_gateway_mock.save.assert_awaited_once()
     commiter_mock.commit.assert_awaited_once()
 
@@ -130,3 +131,37 @@ async def test_register_for_course_already_registered_raises(
         await interactor.execute(RegisterForCourseInputData(course_id=COURSE_ID))
 
     assert exc_info.value.course_title == "Course"
+
+
+@pytest.mark.asyncio
+async def test_register_for_course_raises_if_last_place_was_taken_concurrently(
+    ioc_container,
+    id_provider_mock: AsyncMock,
+    course_gateway_mock: AsyncMock,
+    registration_for_course_gateway_mock: AsyncMock,
+    commiter_mock: AsyncMock,
+):
+    id_provider_mock.get_current_user_id.return_value = ACTOR_ID
+    course = Course(
+        id=COURSE_ID,
+        title="Course",
+        description="D",
+        photo_id=None,
+        creator_id=UserID(1),
+        is_published=True,
+        registrations_limit=None,
+        total_registered=0,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    course_gateway_mock.with_id.return_value = course
+    registration_for_course_gateway_mock.read.return_value = None
+    course_gateway_mock.update_total_registered.return_value = False
+
+    interactor = ioc_container.get(RegisterForCourseInteractor)
+
+    with pytest.raises(RegistrationsLimitExceededError):
+        await interactor.execute(RegisterForCourseInputData(course_id=COURSE_ID))
+
+    registration_for_course_gateway_mock.save.assert_not_awaited()
+    commiter_mock.commit.assert_not_awaited()
@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import learn_anything.course_platform.adapters.playground.sandbox_harness as sandbox_harness
+
+HARNESS_SOURCE = Path(sandbox_harness.__file__).read_text()
+
+
+def _run_harness(code: str, tests: list[str], timeout: float = 3) -> dict:
+    payload = json.dumps({'code': code, 'tests': tests, 'timeout': timeout})
+    ps = subprocess.run(
+        [sys.executable, '-'],
+        input=f'{HARNESS_SOURCE}\nmain({payload!r})\n',
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    return json.loads(ps.stdout)
+
+
+def test_harness_runs_submission_and_tests():
+    result = _run_harness(
+        'x = 2\nprint(x * 2)',
+        ["assert stdout == '4'", 'assert x == 2'],
+    )
+
+    assert result['submission'] == {'out': '4', 'err': ''}
+    assert result['tests'] == [{'out': '4', 'err': ''}, {'out': '4', 'err': ''}]
+
+
+def test_harness_stops_at_first_failed_test():
+    result = _run_harness(
+        'print(1)',
+        ['assert False, "boom"', 'pass'],
+    )
+
+    assert len(result['tests']) == 1
+    assert 'AssertionError: boom' in result['tests'][0]['err']
+    assert 'test_0.py' in result['tests'][0]['err']
+
+
+def test_harness_isolates_tests_from_each_other():
+    result = _run_harness(
+        'items = []',
+        ['items.append(1)', 'assert items == []'],
+    )
+
+    assert [test['err'] for test in result['tests']] == ['', '']
+
+
+def test_harness_reports_submission_error_without_running_tests():
+    result = _run_harness('raise ValueError("bad")', ['pass'])
+
+    assert 'ValueError: bad' in result['submission']['err']
+    assert 'File "main.py", line 1' in result['submission']['err']
+    assert result['tests'] == []
+
+
+def test_harness_times_out_submission():
+    result = _run_harness('print("started", flush=True)\nwhile True: pass', ['pass'], timeout=0.5)
+
+    assert result['submission']['out'].strip() == 'started'
+    assert result['submission']['err'] == 'TimeoutError: your code timed out after 0.5 seconds'
+    assert result['tests'] == []
@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from learn_anything.course_platform.adapters.redis.config import RateLimitConfig
+from learn_anything.course_platform.adapters.redis.rate_limiter import RedisSubmissionRateLimiter
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.user.models import UserID
+
+
+def _limiter(script: AsyncMock, config: RateLimitConfig) -> RedisSubmissionRateLimiter:
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+    return RedisSubmissionRateLimiter(redis_client=redis_client, config=config)
+
+
+@pytest.mark.asyncio
+async def test_user_and_course_buckets_are_checked_together():
+    script = AsyncMock(return_value='0')
+    limiter = _limiter(script, RateLimitConfig(
+        user_submissions_burst=5,
+        user_submissions_per_minute=6,
+        course_submissions_burst=100,
+        course_submissions_per_minute=120,
+    ))
+
+    assert await limiter.acquire(UserID(7), CourseID(3)) == 0
+    script.assert_awaited_once_with(
+        keys=['rate_limit:submissions:user:7', 'rate_limit:submissions:course:3'],
+        args=[5, 0.1, 100, 2],
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_returned_when_quota_is_exhausted():
+    limiter = _limiter(AsyncMock(return_value='9.5'), RateLimitConfig())
+
+    assert await limiter.acquire(UserID(7), CourseID(3)) == 9.5
+
+
+@pytest.mark.asyncio
+async def test_disabled_limits_are_not_checked():
+    script = AsyncMock(return_value='0')
+    limiter = _limiter(script, RateLimitConfig(user_submissions_per_minute=0, course_submissions_per_minute=0))
+
+    assert await limiter.acquire(UserID(7), CourseID(3)) == 0
+    script.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_allowed_when_redis_is_unavailable():
+    limiter = _limiter(AsyncMock(side_effect=ConnectionError()), RateLimitConfig())
+
+    assert await limiter.acquire(UserID(7), CourseID(3)) == 0
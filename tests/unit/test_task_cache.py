@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from learn_anything.course_platform.adapters.redis.config import TaskCacheConfig
+from learn_anything.course_platform.adapters.redis.task_cache import TaskCache, _dump_task
+from learn_anything.course_platform.domain.entities.course.models import CourseID
+from learn_anything.course_platform.domain.entities.task.enums import TaskType
+from learn_anything.course_platform.domain.entities.task.models import CodeTask, TaskID, CodeTaskTest, PollTask, \
+    PollTaskOption, PollTaskOptionID
+
+
+def _code_task() -> CodeTask:
+    return CodeTask(
+        id=TaskID(1),
+        type=TaskType.CODE,
+        topic=None,
+        title='sum',
+        body='sum two numbers',
+        course_id=CourseID(2),
+        index_in_course=0,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 2),
+        attempts_limit=3,
+        prepared_code=None,
+        code_duration_timeout=5,
+        tests=[CodeTaskTest(code='assert f(1, 2) == 3')],
+    )
+
+
+def _cache(script: AsyncMock | None = None) -> tuple[TaskCache, MagicMock]:
+    redis_client = MagicMock()
+    redis_client.hmget = AsyncMock()
+    redis_client.register_script.return_value = script or AsyncMock(return_value=1)
+    return TaskCache(redis_client=redis_client, config=TaskCacheConfig()), redis_client
+
+
+@pytest.mark.asyncio
+async def test_miss_returns_version_to_cache_task_with():
+    cache, redis_client = _cache()
+    redis_client.hmget.return_value = ['4', None]
+
+    assert await cache.get(TaskID(1)) == (None, '4')
+
+
+@pytest.mark.asyncio
+async def test_task_is_cached_in_process_after_it_is_set():
+    script = AsyncMock(return_value=1)
+    cache, redis_client = _cache(script)
+    task = _code_task()
+
+    await cache.set(task, '0')
+    cached_task, version = await cache.get(task.id)
+
+    assert script.await_args.kwargs['args'][0] == '0'
+    redis_client.hmget.assert_not_awaited()
+    assert (cached_task, version) == (task, '0')
+    assert cached_task is not task
+
+
+@pytest.mark.asyncio
+async def test_task_is_not_cached_if_version_changed_while_it_was_loaded():
+    cache, redis_client = _cache(AsyncMock(return_value=0))
+    redis_client.hmget.return_value = ['1', None]
+
+    await cache.set(_code_task(), '0')
+
+    assert await cache.get(TaskID(1)) == (None, '1')
+
+
+@pytest.mark.asyncio
+async def test_poll_task_is_read_from_redis():
+    cache, redis_client = _cache()
+    task = PollTask(
+        id=TaskID(3),
+        type=TaskType.POLL,
+        topic='basics',
+        title='poll',
+        body='choose',
+        course_id=CourseID(2),
+        index_in_course=1,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 2),
+        attempts_limit=None,
+        options=[PollTaskOption(id=PollTaskOptionID(5), content='yes', is_correct=True)],
+    )
+    redis_client.hmget.return_value = ['2', _dump_task(task)]
+
+    cached_task, version = await cache.get(task.id)
+
+    assert version == '2'
+    assert cached_task == task
+    assert cached_task.options[0].is_correct  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_task_is_not_cached_when_redis_is_unavailable():
+    script = AsyncMock()
+    cache, redis_client = _cache(script)
+    redis_client.hmget.side_effect = ConnectionError()
+
+    cached_task, version = await cache.get(TaskID(1))
+    await cache.set(_code_task(), version)
+
+    assert cached_task is None
+    script.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bumps_version_and_drops_local_copy():
+    cache, redis_client = _cache()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_client.pipeline.return_value.__aenter__.return_value = pipe
+    redis_client.hmget.return_value = ['1', None]
+    await cache.set(_code_task(), '0')
+
+    await cache.invalidate([TaskID(1)])
+
+    pipe.hincrby.assert_called_once_with('task_cache:1', 'version', 1)
+    pipe.publish.assert_called_once_with('task_cache_invalidations', '1')
+    assert await cache.get(TaskID(1)) == (None, '1')
+
+
+@pytest.mark.asyncio
+async def test_local_copy_is_dropped_before_background_invalidation_runs():
+    cache, redis_client = _cache()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_client.pipeline.return_value.__aenter__.return_value = pipe
+    redis_client.hmget.return_value = ['1', None]
+    await cache.set(_code_task(), '0')
+
+    cache.invalidate_soon([TaskID(1)])
+
+    assert await cache.get(TaskID(1)) == (None, '1')
+    await asyncio.sleep(0)
+    pipe.execute.assert_awaited_once()
@@ -0,0 +1,108 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import msgpack
+import pytest
+
+from learn_anything.course_platform.adapters.rmq.tg_updates_retry import TgUpdatesRetrier, TG_UPDATES_DLQ, \
+    RETRY_COUNT_HEADER, LAST_ERROR_HEADER, replay_dead_letters, peek_dead_letters, describe_dead_letter
+from learn_anything.course_platform.main.consumer import callback
+
+
+def _message(headers: dict[str, object] | None = None, body: bytes = b'') -> MagicMock:
+    message = MagicMock()
+    message.body = body or msgpack.packb(
+        {'update_id': 1, 'message': {'message_id': 1, 'date': 0, 'chat': {'id': 6, 'type': 'private'}}},
+    )
+    message.headers = headers or {}
+    message.routing_key = 'tg_updates.2'
+    message.correlation_id = 'corr'
+    message.ack = AsyncMock()
+    message.nack = AsyncMock()
+    return message
+
+
+@pytest.fixture
+def channel() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def retrier(channel: AsyncMock) -> TgUpdatesRetrier:
+    return TgUpdatesRetrier(channel=channel, retry_exchange=AsyncMock(), max_retries=2)
+
+
+@pytest.mark.asyncio
+async def test_failed_update_is_delayed_with_increased_retry_count(retrier: TgUpdatesRetrier):
+    await retrier.retry(_message({RETRY_COUNT_HEADER: 1}), ValueError('boom'))
+
+    publish = retrier._retry_exchange.publish  # type: ignore[attr-defined]
+    message = publish.await_args.args[0]
+    assert publish.await_args.kwargs['routing_key'] == 'tg_updates.2'
+    assert message.headers[RETRY_COUNT_HEADER] == 2
+    assert message.headers[LAST_ERROR_HEADER] == 'ValueError: boom'
+    assert message.correlation_id == 'corr'
+
+
+@pytest.mark.asyncio
+async def test_update_is_dead_lettered_after_max_retries(retrier: TgUpdatesRetrier, channel: AsyncMock):
+    await retrier.retry(_message({RETRY_COUNT_HEADER: 2}), ValueError('boom'))
+
+    retrier._retry_exchange.publish.assert_not_awaited()  # type: ignore[attr-defined]
+    assert channel.default_exchange.publish.await_args.kwargs['routing_key'] == TG_UPDATES_DLQ
+
+
+@pytest.mark.asyncio
+async def test_failed_update_is_acked_right_away(retrier: TgUpdatesRetrier):
+    dp = AsyncMock()
+    dp.feed_update.side_effect = ValueError('boom')
+    message = _message()
+
+    await callback(message, dp=dp, bot=MagicMock(), retrier=retrier)
+
+    dp.feed_update.assert_awaited_once()
+    retrier._retry_exchange.publish.assert_awaited_once()  # type: ignore[attr-defined]
+    message.ack.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_is_requeued_if_it_can_not_be_republished(retrier: TgUpdatesRetrier, channel: AsyncMock):
+    channel.default_exchange.publish.side_effect = ConnectionError()
+    message = _message(body=b'not msgpack')
+
+    await callback(message, dp=AsyncMock(), bot=MagicMock(), retrier=retrier)
+
+    message.ack.assert_not_awaited()
+    message.nack.assert_awaited_once_with(requeue=True)
+
+
+@pytest.mark.asyncio
+async def test_peek_leaves_messages_in_queue():
+    messages = [_message(), _message()]
+    dlq = AsyncMock()
+    dlq.get.side_effect = [*messages, None]
+
+    assert await peek_dead_letters(dlq, limit=10) == messages
+    for message in messages:
+        message.nack.assert_awaited_once_with(requeue=True)
+
+
+@pytest.mark.asyncio
+async def test_replay_publishes_updates_to_their_shards_without_retry_headers(channel: AsyncMock):
+    dlq = AsyncMock()
+    dlq.declare.return_value.message_count = 1
+    message = _message({RETRY_COUNT_HEADER: 5, LAST_ERROR_HEADER: 'err', 'other': 'kept'})
+    dlq.get.return_value = message
+
+    assert await replay_dead_letters(channel, dlq, shards_number=4) == 1
+
+    publish = channel.declare_exchange.return_value.publish
+    replayed = publish.await_args.args[0]
+    assert publish.await_args.kwargs['routing_key'] == 'tg_updates.2'
+    assert replayed.headers == {'other': 'kept'}
+    message.ack.assert_awaited_once()
+
+
+def test_dead_letter_error_is_decoded_for_inspection():
+    description = describe_dead_letter(_message({RETRY_COUNT_HEADER: 2, LAST_ERROR_HEADER: b'ValueError: boom'}))
+
+    assert description == 'update 1 (message), retries: 2, correlation id: corr, error: ValueError: boom'
@@ -0,0 +1,30 @@
+import pytest
+
+from learn_anything.course_platform.adapters.rmq.tg_updates import tg_updates_shard
+
+SHARDS_NUMBER = 8
+
+
+@pytest.mark.parametrize(
+    'update',
+    [
+        {'update_id': 1, 'message': {'message_id': 1, 'chat': {'id': 42}, 'from': {'id': 42}}},
+        {'update_id': 2, 'callback_query': {'id': '1', 'from': {'id': 42}, 'message': {'chat': {'id': 42}}}},
+        # callback query on an inaccessible message
+        {'update_id': 3, 'callback_query': {'id': '1', 'from_user': {'id': 42}, 'message': None}},
+        {'update_id': 4, 'inline_query': {'id': '1', 'from': {'id': 42}, 'query': ''}},
+        {'update_id': 5, 'message': None, 'edited_message': {'chat': {'id': 42}}},
+    ],
+)
+def test_updates_of_one_chat_get_into_one_shard(update):
+    assert tg_updates_shard(update, SHARDS_NUMBER) == 42 % SHARDS_NUMBER
+
+
+def test_group_chat_updates_are_sharded_by_chat():
+    update = {'update_id': 1, 'message': {'chat': {'id': -1001234567890}, 'from': {'id': 42}}}
+
+    assert tg_updates_shard(update, SHARDS_NUMBER) == 1001234567890 % SHARDS_NUMBER
+
+
+def test_update_without_chat_gets_into_first_shard():
+    assert tg_updates_shard({'update_id': 1, 'poll': {'id': '1'}}, SHARDS_NUMBER) == 0
@@ -0,0 +1,32 @@
+from aiogram import Bot
+from aiogram.types import Update
+
+from learn_anything.course_platform.adapters.rmq.tg_updates import pack_update, unpack_update, update_to_dict
+
+UPDATE = {
+    'update_id': 1,
+    'message': {
+        'message_id': 2,
+        'date': 1734435446,
+        'chat': {'id': 42, 'type': 'private', 'first_name': 'User'},
+        'from': {'id': 42, 'is_bot': False, 'first_name': 'User'},
+        'text': '/start',
+        'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}],
+    },
+}
+
+
+def test_update_is_dumped_in_bot_api_format():
+    update = Update.model_validate(UPDATE)
+
+    assert update_to_dict(update) == UPDATE
+
+
+def test_unpacked_update_is_mounted_to_bot():
+    bot = Bot(token='42:TEST')
+
+    update = unpack_update(pack_update(UPDATE), bot=bot)
+
+    assert update.bot is bot
+    assert update.message.bot is bot
+    assert update.message.from_user.id == 42
@@ -0,0 +1,96 @@
+import asyncio
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from learn_anything.course_platform.adapters.playground.unix_playground import UnixPlayground
+
+
+class FakeChannel:
+    """Mimics the parts of paramiko.Channel used by the playground, with a real fd for the event loop"""
+
+    def __init__(self) -> None:
+        self._read_fd, self._write_fd = os.pipe()
+        self._out = b''
+        self._err = b''
+        self.eof_received = False
+        self.closed = False
+        self.signals: list[str] = []
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def feed(self, out: bytes = b'', err: bytes = b'', eof: bool = False) -> None:
+        self._out += out
+        self._err += err
+        self.eof_received = self.eof_received or eof
+        os.write(self._write_fd, b'x')
+
+    def _clear_event(self) -> None:
+        if not self._out and not self._err and not self.eof_received:
+            os.read(self._read_fd, 1024)
+
+    def recv_ready(self) -> bool:
+        return bool(self._out)
+
+    def recv_stderr_ready(self) -> bool:
+        return bool(self._err)
+
+    def recv(self, size: int) -> bytes:
+        data, self._out = self._out[:size], self._out[size:]
+        self._clear_event()
+        return data
+
+    def recv_stderr(self, size: int) -> bytes:
+        data, self._err = self._err[:size], self._err[size:]
+        self._clear_event()
+        return data
+
+    def close(self) -> None:
+        self.closed = True
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+
+@pytest.fixture
+def channel() -> FakeChannel:
+    return FakeChannel()
+
+
+@pytest.fixture
+def playground(channel: FakeChannel) -> UnixPlayground:
+    pl = UnixPlayground(identifier=None, code_duration_timeout=1, vm_pool=MagicMock())
+    pl._open_channel = MagicMock(return_value=channel)  # type: ignore[method-assign]
+    pl._send_signal = MagicMock(side_effect=lambda ch, sig: ch.signals.append(sig.name))  # type: ignore[method-assign]
+    pl._signal_grace_period = 0.1
+    return pl
+
+
+@pytest.mark.asyncio
+async def test_execute_code_returns_as_soon_as_process_exits(playground: UnixPlayground, channel: FakeChannel):
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.01, channel.feed, b'hello', b'')
+    loop.call_later(0.02, channel.feed, b' world\n', b'', True)
+
+    start = loop.time()
+    out, err = await playground.execute_code('print("hello world")')
+
+    assert loop.time() - start < 0.3
+    assert (out, err) == ('hello world', '')
+    assert channel.signals == []
+    assert channel.closed
+
+
+@pytest.mark.asyncio
+async def test_execute_code_interrupts_process_after_timeout(playground: UnixPlayground, channel: FakeChannel):
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.01, channel.feed, b'started', b'')
+
+    start = loop.time()
+    out, err = await playground.execute_code('while True: pass')
+
+    assert 1 <= loop.time() - start < 1.5
+    assert out.strip() == 'started'
+    assert err == 'TimeoutError: your code timed out after 1 seconds'
+    assert channel.signals == ['SIGINT']
@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import msgpack
+import pytest
+
+from learn_anything.api_gateway.adapters.rmq.update_publisher import UpdatePublisher
+
+
+@pytest.fixture
+def channel() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_topology_is_declared_once(channel: AsyncMock):
+    publisher = UpdatePublisher(channel=channel, shards_number=4, max_unconfirmed=10)
+    await publisher.declare()
+
+    for update_id in range(3):
+        await publisher.publish({'update_id': update_id}, correlation_id='corr')
+
+    channel.declare_exchange.assert_awaited_once()
+    assert channel.declare_queue.await_count == 4
+    exchange = channel.declare_exchange.return_value
+    assert exchange.publish.await_count == 3
+    message = exchange.publish.await_args.kwargs['message']
+    assert msgpack.unpackb(message.body) == {'update_id': 2}
+    assert message.correlation_id == 'corr'
+
+
+@pytest.mark.asyncio
+async def test_updates_are_routed_to_shard_of_their_chat(channel: AsyncMock):
+    publisher = UpdatePublisher(channel=channel, shards_number=4, max_unconfirmed=10)
+    await publisher.declare()
+
+    await publisher.publish({'update_id': 1, 'message': {'chat': {'id': 6}, 'text': 'hi'}}, correlation_id=None)
+
+    exchange = channel.declare_exchange.return_value
+    assert exchange.publish.await_args.kwargs['routing_key'] == 'tg_updates.2'
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_messages_are_limited(channel: AsyncMock):
+    confirms: list[asyncio.Future[None]] = []
+
+    async def publish(**kwargs: object) -> None:
+        confirm = asyncio.get_running_loop().create_future()
+        confirms.append(confirm)
+        await confirm
+
+    channel.declare_exchange.return_value.publish = publish
+    publisher = UpdatePublisher(channel=channel, shards_number=4, max_unconfirmed=2)
+    await publisher.declare()
+
+    publishes = [asyncio.create_task(publisher.publish({'update_id': i}, correlation_id=None)) for i in range(3)]
+    await asyncio.sleep(0)
+    assert len(confirms) == 2
+
+    confirms[0].set_result(None)
+    await asyncio.sleep(0.01)
+    assert len(confirms) == 3
+
+    for confirm in confirms[1:]:
+        confirm.set_result(None)
+    await asyncio.gather(*publishes)
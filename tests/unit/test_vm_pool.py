@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncio
+
+import pytest
+
+from learn_anything.course_platform.adapters.playground.unix_playground import (
+    VirtualMachineFacade,
+    VirtualMachinePool,
+)
+
+
+def _vm(reset_result: bool = True, id_: str = 'vm') -> VirtualMachineFacade:
+    vm = VirtualMachineFacade(id_=id_, disk_image_path='/tmp/vm.qcow2', port=16998)
+    vm.reset = MagicMock(return_value=reset_result)  # type: ignore[method-assign]
+    vm._ssh_client = MagicMock()
+    return vm
+
+
+@pytest.mark.asyncio
+async def test_released_vm_is_reset_and_reused():
+    pool = VirtualMachinePool(min_size=1, vm_max_uses=3)
+    pool._recreate_vm = AsyncMock()  # type: ignore[method-assign]
+    vm = _vm()
+
+    await pool._recycle_vm(vm)
+
+    vm.reset.assert_called_once()
+    pool._recreate_vm.assert_not_awaited()
+    assert await pool.acquire() is vm
+
+
+@pytest.mark.asyncio
+async def test_released_vm_is_recreated_after_max_uses():
+    pool = VirtualMachinePool(min_size=1, vm_max_uses=2)
+    pool._recreate_vm = AsyncMock()  # type: ignore[method-assign]
+    vm = _vm()
+
+    await pool._recycle_vm(vm)
+    await pool.acquire()
+    await pool._recycle_vm(vm)
+
+    assert vm.reset.call_count == 1
+    pool._recreate_vm.assert_awaited_once_with(vm)
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_vm_is_recreated():
+    pool = VirtualMachinePool(min_size=1, vm_max_uses=10)
+    pool._recreate_vm = AsyncMock()  # type: ignore[method-assign]
+    vm = _vm(reset_result=False)
+
+    await pool._recycle_vm(vm)
+
+    pool._recreate_vm.assert_awaited_once_with(vm)
+    assert pool._queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_pool_grows_for_waiters_up_to_max_size():
+    pool = VirtualMachinePool(min_size=0, max_size=2)
+    boot_started = asyncio.Event()
+    boot_finished = asyncio.Event()
+
+    async def boot_vm() -> VirtualMachineFacade:
+        boot_started.set()
+        await boot_finished.wait()
+        return _vm(id_=str(pool._size))
+
+    pool._boot_vm = boot_vm  # type: ignore[method-assign]
+
+    waiters = [asyncio.create_task(pool.acquire()) for _ in range(3)]
+    await boot_started.wait()
+
+    assert pool._size == 2
+    assert pool._booting == 2
+    assert pool._waiters == 3
+
+    boot_finished.set()
+    done, pending = await asyncio.wait(waiters, timeout=0.1)
+    assert len(done) == 2
+    assert len(pending) == 1
+    pending.pop().cancel()
+
+
+@pytest.mark.asyncio
+async def test_pool_shrinks_idle_vms_down_to_min_size():
+    pool = VirtualMachinePool(min_size=1, max_size=3, vm_idle_timeout=60)
+    vms = [_vm(id_=str(i)) for i in range(3)]
+    for vm in vms:
+        pool._size += 1
+        pool._put(vm)
+        pool._idle_since[vm.id] -= 120
+
+    expired = pool._take_expired_idle_vms()
+
+    assert expired == vms[:2]
+    assert pool._size == 1
+    assert await pool.acquire() is vms[2]
+
+
+@pytest.mark.asyncio
+async def test_vm_with_dead_ssh_connection_is_reconnected_on_acquire():
+    pool = VirtualMachinePool(min_size=1)
+    vm = _vm()
+    vm._ssh_client.get_transport.return_value.is_active.return_value = False
+    vm.connect = MagicMock()  # type: ignore[method-assign]
+    pool._size += 1
+    pool._put(vm)
+
+    assert await pool.acquire() is vm
+    vm.connect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_vm_which_failed_to_reconnect_is_recreated():
+    pool = VirtualMachinePool(min_size=2)
+    pool._recreate_vm = AsyncMock()  # type: ignore[method-assign]
+    broken_vm, vm = _vm(id_='broken'), _vm()
+    broken_vm._ssh_client.get_transport.return_value = None
+    broken_vm.connect = MagicMock(side_effect=OSError)  # type: ignore[method-assign]
+    for v in (broken_vm, vm):
+        pool._size += 1
+        pool._put(v)
+
+    assert await pool.acquire() is vm
+    await asyncio.gather(*pool._background_tasks)
+    pool._recreate_vm.assert_awaited_once_with(broken_vm)